@@ -3,8 +3,11 @@ import sys
 import json
 import os
 import argparse
-from scripts.odoo_client import OdooClient
+from datetime import datetime
+from functools import cached_property
 from pathlib import Path
+from mcp.odoo.scripts.odoo_client import OdooClient
+from mcp.stdio_server import StdioJSONRPCServer
 
 # Paths to Vault folders
 VAULT_PATH = Path("AI_Employee_Vault")
@@ -12,9 +15,33 @@ PENDING_APPROVAL = VAULT_PATH / "Pending_Approval"
 APPROVED = VAULT_PATH / "Approved"
 REJECTED = VAULT_PATH / "Rejected"
 
+TOOLS = [
+    {"name": "create_draft_invoice", "description": "Create a draft customer invoice in Odoo.",
+     "inputSchema": {"type": "object", "properties": {"partner_id": {"type": "integer"}, "invoice_line_ids": {"type": "array"}},
+                     "required": ["partner_id", "invoice_line_ids"]}},
+    {"name": "create_draft_invoices", "description": "Create many draft invoices in one Odoo call.",
+     "inputSchema": {"type": "object", "properties": {"invoices": {"type": "array"}}, "required": ["invoices"]}},
+    {"name": "post_invoice", "description": "Request approval to post (validate) an invoice.",
+     "inputSchema": {"type": "object", "properties": {"invoice_id": {"type": "integer"}}, "required": ["invoice_id"]}},
+    {"name": "post_invoices", "description": "Request approval to post a batch of invoices.",
+     "inputSchema": {"type": "object", "properties": {"invoice_ids": {"type": "array", "items": {"type": "integer"}}},
+                     "required": ["invoice_ids"]}},
+    {"name": "record_payment", "description": "Request approval to record a payment against an invoice.",
+     "inputSchema": {"type": "object", "properties": {"invoice_id": {"type": "integer"}, "amount": {"type": "number"}},
+                     "required": ["invoice_id", "amount"]}},
+    {"name": "record_payments", "description": "Request approval to record a batch of payments.",
+     "inputSchema": {"type": "object", "properties": {"payments": {"type": "array"}}, "required": ["payments"]}},
+    {"name": "fetch_revenue_summary", "description": "Total posted revenue between two dates.",
+     "inputSchema": {"type": "object", "properties": {"date_from": {"type": "string"}, "date_to": {"type": "string"}}}},
+    {"name": "fetch_overdue_invoices", "description": "Posted invoices that are unpaid past their due date.",
+     "inputSchema": {"type": "object", "properties": {}}},
+]
+
 class OdooMCPServer:
-    def __init__(self):
-        self.client = OdooClient()
+    @cached_property
+    def client(self) -> OdooClient:
+        """Built on first RPC; approval-only tools never open a session."""
+        return OdooClient()
 
     def handle_tool_call(self, name: str, params: dict):
         """MCP style tool handling."""
@@ -24,17 +51,30 @@ class OdooMCPServer:
                 invoice_line_ids = params.get("invoice_line_ids")
                 return self.client.create_draft_invoice(partner_id, invoice_line_ids)
 
+            elif name == "create_draft_invoices":
+                # Month-end batches: one `create` RPC for the whole list
+                return self.client.create_draft_invoices(params.get("invoices", []))
+
             elif name == "post_invoice":
                 # Create approval request file instead of direct action
                 invoice_id = params.get("invoice_id")
                 return self._request_approval("post_invoice", {"invoice_id": invoice_id})
 
+            elif name == "post_invoices":
+                # One approval covers the whole batch
+                invoice_ids = params.get("invoice_ids", [])
+                return self._request_approval("post_invoices", {"invoice_ids": invoice_ids})
+
             elif name == "record_payment":
                 # Create approval request file instead of direct action
                 invoice_id = params.get("invoice_id")
                 amount = params.get("amount")
                 return self._request_approval("record_payment", {"invoice_id": invoice_id, "amount": amount})
 
+            elif name == "record_payments":
+                payments = params.get("payments", [])
+                return self._request_approval("record_payments", {"payments": payments})
+
             elif name == "fetch_revenue_summary":
                 date_from = params.get("date_from", "2026-01-01")
                 date_to = params.get("date_to", "2026-12-31")
@@ -51,7 +91,8 @@ class OdooMCPServer:
     def _request_approval(self, action: str, details: dict):
         """Creates a markdown file in Pending_Approval for human-in-the-loop."""
         PENDING_APPROVAL.mkdir(parents=True, exist_ok=True)
-        timestamp = os.popen('date /t').read().strip().replace('/', '') # Simple win32 timestamp
+        # Microseconds keep concurrent requests in server mode from colliding
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         filename = f"APPROVAL_{action}_{timestamp}.md"
         file_path = PENDING_APPROVAL / filename
         
@@ -78,12 +119,26 @@ The AI Employee is requesting permission to perform the following action in Odoo
         
         return {"status": "approval_required", "file": str(file_path), "message": "Action requires human approval."}
 
+def serve():
+    """Persistent stdio JSON-RPC mode: one authenticated client and HTTP pool for all calls."""
+    server = OdooMCPServer()
+    StdioJSONRPCServer(
+        "odoo", "1.0.0", TOOLS, server.handle_tool_call,
+        max_concurrency=int(os.getenv("MCP_MAX_CONCURRENCY", "8")),
+        extra_metrics=lambda: {"cache": server.client.cache.stats()}
+    ).run()
+
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("tool_name", help="The name of the tool to call")
-    parser.add_argument("params", help="JSON string of parameters")
+    parser.add_argument("tool_name", nargs="?", help="The name of the tool to call (omit to serve)")
+    parser.add_argument("params", nargs="?", default="{}", help="JSON string of parameters")
+    parser.add_argument("--serve", action="store_true", help="Run as a long-lived stdio JSON-RPC server")
     args = parser.parse_args()
 
+    if args.serve or not args.tool_name:
+        serve()
+        return
+
     server = OdooMCPServer()
     params = json.loads(args.params)
     result = server.handle_tool_call(args.tool_name, params)
@@ -0,0 +1,257 @@
+# mcp/odoo/scripts/ledger_mirror.py
+import os
+import time
+import sqlite3
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime, date
+from typing import Any, Dict, List, Optional, Tuple
+
+VAULT_PATH = Path("AI_Employee_Vault")
+LEDGER_DB = VAULT_PATH / "Accounting" / "odoo_ledger.db"
+
+MOVE_FIELDS = [
+    'name', 'move_type', 'state', 'payment_state', 'partner_id', 'invoice_date',
+    'invoice_date_due', 'amount_total', 'amount_residual', 'write_date'
+]
+PAYMENT_FIELDS = ['name', 'payment_type', 'state', 'partner_id', 'date', 'amount', 'write_date']
+MOVE_TYPES = ['out_invoice', 'out_refund', 'in_invoice', 'in_refund']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS moves (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    move_type TEXT,
+    state TEXT,
+    payment_state TEXT,
+    partner_id INTEGER,
+    partner_name TEXT,
+    invoice_date TEXT,
+    invoice_date_due TEXT,
+    amount_total REAL,
+    amount_residual REAL,
+    write_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_moves_revenue ON moves (move_type, state, invoice_date);
+CREATE INDEX IF NOT EXISTS idx_moves_due ON moves (invoice_date_due);
+CREATE TABLE IF NOT EXISTS payments (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    payment_type TEXT,
+    state TEXT,
+    partner_id INTEGER,
+    partner_name TEXT,
+    date TEXT,
+    amount REAL,
+    write_date TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_payments_date ON payments (date);
+CREATE TABLE IF NOT EXISTS sync_state (
+    model TEXT PRIMARY KEY,
+    cursor TEXT,
+    last_run TEXT,
+    cursor_id INTEGER
+);
+"""
+
+
+def _partner(value) -> tuple:
+    """Odoo returns many2one fields as [id, display_name] or False."""
+    if isinstance(value, (list, tuple)) and value:
+        return value[0], value[1] if len(value) > 1 else None
+    return None, None
+
+
+def _text(value) -> Optional[str]:
+    # Odoo sends False for empty fields
+    return value if value not in (False, None) else None
+
+
+class LedgerMirror:
+    """
+    Local SQLite mirror of Odoo invoices and payments.
+    Reporting reads (revenue, overdue, cash flow) are answered here so they never wait on the ERP.
+    """
+
+    def __init__(self, db_path: Path = LEDGER_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            # WAL lets the briefing read while the sync job writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(sync_state)")}
+            if "cursor_id" not in columns:
+                # Mirrors created before the keyset cursor; their rows resume from (cursor, 0)
+                conn.execute("ALTER TABLE sync_state ADD COLUMN cursor_id INTEGER")
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # --- Sync bookkeeping ---
+
+    def get_cursor(self, model: str) -> Optional[Tuple[str, int]]:
+        """The (write_date, id) of the last record mirrored for `model`, or None before the first sync."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT cursor, cursor_id FROM sync_state WHERE model = ?", (model,)).fetchone()
+        if not row or not row["cursor"]:
+            return None
+        return row["cursor"], row["cursor_id"] or 0
+
+    def set_cursor(self, model: str, cursor: Optional[Tuple[str, int]]):
+        write_date, record_id = cursor if cursor else (None, None)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO sync_state (model, cursor, cursor_id, last_run) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(model) DO UPDATE SET cursor = excluded.cursor, cursor_id = excluded.cursor_id, "
+                "last_run = excluded.last_run",
+                (model, write_date, record_id, datetime.now().isoformat())
+            )
+
+    def last_synced(self) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT MIN(last_run) AS last_run FROM sync_state").fetchone()
+        return row["last_run"] if row else None
+
+    def has_data(self) -> bool:
+        return self.last_synced() is not None
+
+    def upsert_moves(self, rows: List[Dict[str, Any]]):
+        values = []
+        for r in rows:
+            partner_id, partner_name = _partner(r.get('partner_id'))
+            values.append((
+                r['id'], _text(r.get('name')), r.get('move_type'), r.get('state'), _text(r.get('payment_state')),
+                partner_id, partner_name, _text(r.get('invoice_date')), _text(r.get('invoice_date_due')),
+                r.get('amount_total') or 0.0, r.get('amount_residual') or 0.0, r.get('write_date')
+            ))
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO moves VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", values)
+
+    def upsert_payments(self, rows: List[Dict[str, Any]]):
+        values = []
+        for r in rows:
+            partner_id, partner_name = _partner(r.get('partner_id'))
+            values.append((
+                r['id'], _text(r.get('name')), r.get('payment_type'), r.get('state'),
+                partner_id, partner_name, _text(r.get('date')), r.get('amount') or 0.0, r.get('write_date')
+            ))
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO payments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", values)
+
+    # --- Reporting ---
+
+    def revenue_summary(self, date_from: str, date_to: str) -> Dict[str, Any]:
+        """Same shape as OdooClient.fetch_revenue_summary, served locally."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COALESCE(SUM(amount_total), 0) AS total, COUNT(*) AS count FROM moves "
+                "WHERE move_type = 'out_invoice' AND state = 'posted' AND invoice_date BETWEEN ? AND ?",
+                (date_from, date_to)
+            ).fetchone()
+        return {"total_revenue": row["total"], "count": row["count"], "currency": "USD"}
+
+    def overdue_invoices(self, today: Optional[str] = None) -> List[Dict[str, Any]]:
+        today = today or os.getenv("CURRENT_DATE", date.today().isoformat())
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT name, partner_name, amount_total, amount_residual, invoice_date_due FROM moves "
+                "WHERE move_type = 'out_invoice' AND state = 'posted' AND payment_state != 'paid' "
+                "AND invoice_date_due < ? ORDER BY invoice_date_due",
+                (today,)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def cash_flow(self, date_from: str, date_to: str) -> Dict[str, Any]:
+        """Inbound vs outbound payments that left draft between two dates."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT "
+                "COALESCE(SUM(CASE WHEN payment_type = 'inbound' THEN amount END), 0) AS inbound, "
+                "COALESCE(SUM(CASE WHEN payment_type = 'outbound' THEN amount END), 0) AS outbound, "
+                "COUNT(*) AS count FROM payments "
+                "WHERE state NOT IN ('draft', 'cancel', 'canceled') AND date BETWEEN ? AND ?",
+                (date_from, date_to)
+            ).fetchone()
+        return {
+            "inbound": row["inbound"],
+            "outbound": row["outbound"],
+            "net": row["inbound"] - row["outbound"],
+            "count": row["count"],
+        }
+
+
+class LedgerSync:
+    """
+    Background job that mirrors Odoo `account.move` and `account.payment` incrementally.
+    Records are paged by keyset on `(write_date, id)` rather than by offset: a record
+    edited mid-pass moves to the end of the order instead of shifting later pages, so
+    none are skipped. The cursor is saved after every page, so an interrupted pass
+    resumes where it stopped.
+    """
+
+    def __init__(self, mirror: LedgerMirror = None, client=None, page_size: int = 500):
+        if client is None:
+            from .odoo_client import OdooClient
+            client = OdooClient()
+        self.client = client
+        self.mirror = mirror or LedgerMirror()
+        self.page_size = page_size
+        self.logger = logging.getLogger("LedgerSync")
+
+    def _sync_model(self, model: str, base_domain: List[Any], fields: List[str], upsert) -> int:
+        cursor = self.mirror.get_cursor(model)
+        synced = 0
+        while True:
+            domain = list(base_domain)
+            if cursor:
+                # (write_date, id) > cursor
+                last_write, last_id = cursor
+                domain += ['|', ('write_date', '>', last_write),
+                           '&', ('write_date', '=', last_write), ('id', '>', last_id)]
+            rows = self.client.execute_kw(
+                model, 'search_read', domain,
+                fields=fields, limit=self.page_size, order='write_date asc, id asc'
+            )
+            if not rows:
+                break
+            upsert(rows)
+            synced += len(rows)
+            cursor = (rows[-1]['write_date'], rows[-1]['id'])
+            self.mirror.set_cursor(model, cursor)
+            if len(rows) < self.page_size:
+                break
+
+        if not synced:
+            self.mirror.set_cursor(model, cursor)  # Still records the run for last_synced()
+        return synced
+
+    def sync_once(self) -> Dict[str, int]:
+        moves = self._sync_model(
+            'account.move', [('move_type', 'in', MOVE_TYPES)], MOVE_FIELDS, self.mirror.upsert_moves
+        )
+        payments = self._sync_model('account.payment', [], PAYMENT_FIELDS, self.mirror.upsert_payments)
+        self.logger.info(f"Ledger sync: {moves} moves, {payments} payments updated")
+        return {"moves": moves, "payments": payments}
+
+    def run(self, interval: int = 300):
+        self.logger.info(f"Ledger sync started (interval: {interval}s)")
+        while True:
+            try:
+                self.sync_once()
+            except Exception as e:
+                self.logger.error(f"Ledger sync failed: {e}")
+            time.sleep(interval)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    LedgerSync().run(interval=int(os.getenv("LEDGER_SYNC_INTERVAL", "300")))
@@ -0,0 +1,116 @@
+# mcp/odoo/scripts/odoo_cache.py
+import json
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Writes to these models change what reads on the mapped models return
+# (posting a payment reconciles invoices and updates their payment_state).
+INVALIDATES = {
+    "account.move": ("account.move",),
+    "account.payment": ("account.payment", "account.move"),
+}
+
+
+class _Entry:
+    def __init__(self, records: Dict[int, Dict[str, Any]], last_sync: Optional[str]):
+        self.records = records
+        self.last_sync = last_sync
+        self.fetched_at = time.monotonic()
+        self.stale = False
+
+
+class OdooReadCache:
+    """
+    Read-through cache for Odoo `search_read` results.
+
+    Entries are keyed by (model, domain, fields) and served from memory for `ttl` seconds.
+    Once an entry expires, or a write on the same client marks it stale, it is refreshed
+    incrementally: only records with `write_date >= last_sync` are fetched and merged.
+    Every `max_age` seconds an entry is rebuilt from scratch so deleted records drop out.
+    """
+
+    def __init__(self, ttl: float = 300, max_age: float = 3600):
+        self.ttl = ttl
+        self.max_age = max_age
+        self.entries: Dict[Tuple[str, str, Tuple[str, ...]], _Entry] = {}
+        self.created_at: Dict[Tuple[str, str, Tuple[str, ...]], float] = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger("OdooReadCache")
+
+    @staticmethod
+    def make_key(model: str, domain: List[Any], fields: List[str]) -> Tuple[str, str, Tuple[str, ...]]:
+        return (model, json.dumps(domain, default=str), tuple(sorted(fields)))
+
+    def search_read(self, model: str, domain: List[Any], fields: List[str],
+                    fetch: Callable[[List[Any], List[str]], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Returns records for the query, calling `fetch(domain, fields)` only when needed.
+        `fetch` must accept an Odoo domain and field list and return `search_read` rows.
+        """
+        key = self.make_key(model, domain, fields)
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and not entry.stale and now - entry.fetched_at < self.ttl:
+                self.hits += 1
+                return list(entry.records.values())
+            self.misses += 1
+
+        query_fields = list(dict.fromkeys(list(fields) + ["id", "write_date"]))
+        if entry and entry.last_sync and now - self.created_at.get(key, 0) < self.max_age:
+            records = self._refresh(entry, domain, query_fields, fetch)
+        else:
+            rows = fetch(domain, query_fields)
+            records = {row["id"]: row for row in rows}
+            with self.lock:
+                self.created_at[key] = now
+
+        last_sync = max((r.get("write_date") or "" for r in records.values()), default="") or None
+        with self.lock:
+            self.entries[key] = _Entry(records, last_sync)
+        return list(records.values())
+
+    def _refresh(self, entry: _Entry, domain: List[Any], fields: List[str],
+                 fetch: Callable[[List[Any], List[str]], List[Dict[str, Any]]]) -> Dict[int, Dict[str, Any]]:
+        """Merges rows written since the last sync; drops cached rows that left the domain."""
+        since = ("write_date", ">=", entry.last_sync)
+        changed = fetch(list(domain) + [since], fields)
+        records = dict(entry.records)
+        for row in changed:
+            records[row["id"]] = row
+
+        changed_ids = {row["id"] for row in changed}
+        unchanged_ids = [rid for rid in entry.records if rid not in changed_ids]
+        if unchanged_ids:
+            # Cached rows written since last sync that the domain no longer matches
+            for row in fetch([("id", "in", unchanged_ids), since], ["id"]):
+                records.pop(row["id"], None)
+
+        self.logger.debug(f"Incremental refresh merged {len(changed)} changed records")
+        return records
+
+    def invalidate(self, model: str):
+        """Marks every entry affected by a write on `model` as stale."""
+        affected = INVALIDATES.get(model, (model,))
+        with self.lock:
+            for key, entry in self.entries.items():
+                if key[0] in affected:
+                    entry.stale = True
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.created_at.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
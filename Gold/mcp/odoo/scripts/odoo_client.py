@@ -1,13 +1,48 @@
 # mcp/odoo/scripts/odoo_client.py
-import requests
 import json
 import os
 import logging
+import threading
 from typing import Any, Dict, List, Optional
 from dotenv import load_dotenv
+from .odoo_cache import OdooReadCache
+from scripts.utils.circuit_breaker import breaker_for
+from scripts.utils.lazy import lazy_module
+from scripts.utils.tracing import span
+from scripts.utils.metrics import counter, histogram
+
+requests = lazy_module("requests")  # Loaded on first use; one-shot CLIs that never call out skip it
 
 load_dotenv()
 
+# ORM methods that change records; reads cached for the same model are invalidated after them
+WRITE_METHODS = {"create", "write", "unlink", "action_post", "button_draft", "button_cancel"}
+
+RPC_SECONDS = histogram("odoo_rpc_seconds", "Odoo JSON-RPC round trips", ["method"])
+RPC_ERRORS = counter("odoo_rpc_errors_total", "Odoo JSON-RPC calls that failed (transport or RPC error)", ["method"])
+
+# Odoo exceptions raised by the data of particular records, not by the server or the session
+RECORD_ERRORS = {"odoo.exceptions.UserError", "odoo.exceptions.ValidationError", "odoo.exceptions.MissingError"}
+
+
+class OdooRPCError(Exception):
+    """An error payload returned by a reachable Odoo server."""
+
+    def __init__(self, error: Any):
+        super().__init__(f"Odoo RPC Error: {error}")
+        self.error = error
+
+    @property
+    def name(self) -> Optional[str]:
+        """Qualified Odoo exception name, e.g. 'odoo.exceptions.ValidationError'."""
+        data = self.error.get("data") if isinstance(self.error, dict) else None
+        return data.get("name") if isinstance(data, dict) else None
+
+    def is_record_error(self) -> bool:
+        """True when Odoo rejected the records themselves, so retrying them unchanged cannot succeed."""
+        return self.name in RECORD_ERRORS
+
+
 class OdooClient:
     def __init__(self):
         self.url = os.getenv("ODOO_URL", "http://localhost:8069")
@@ -16,6 +51,21 @@ class OdooClient:
         self.password = os.getenv("ODOO_PASSWORD")
         self.dry_run = os.getenv("DRY_RUN", "true").lower() == "true"
         self.uid = None
+        self.auth_lock = threading.Lock()
+
+        # Keep-alive connection pool reused across calls (shared by server worker threads)
+        pool_size = int(os.getenv("ODOO_POOL_SIZE", "10"))
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.cache = OdooReadCache(
+            ttl=float(os.getenv("ODOO_CACHE_TTL", "300")),
+            max_age=float(os.getenv("ODOO_CACHE_MAX_AGE", "3600"))
+        )
+        
+        # Only transport failures trip the breaker; RPC errors mean Odoo is up
+        self.breaker = breaker_for("odoo", trip_on=(requests.exceptions.RequestException,))
         
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger("OdooClient")
@@ -27,34 +77,44 @@ class OdooClient:
             "params": params,
             "id": 1,
         }
+        rpc_method = params.get("method", method)
         try:
-            response = requests.post(f"{self.url}/jsonrpc", json=data, timeout=10)
-            response.raise_for_status()
-            result = response.json()
+            with self.breaker, span("rpc", connector="odoo", method=rpc_method, model=params.get("model")), \
+                    RPC_SECONDS.time(method=rpc_method):
+                response = self.session.post(f"{self.url}/jsonrpc", json=data, timeout=10)
+                response.raise_for_status()
+                result = response.json()
             if "error" in result:
-                raise Exception(f"Odoo RPC Error: {result['error']}")
+                RPC_ERRORS.inc(method=rpc_method)
+                raise OdooRPCError(result['error'])
             return result.get("result")
         except requests.exceptions.RequestException as e:
+            RPC_ERRORS.inc(method=rpc_method)
             self.logger.error(f"HTTP Request failed: {e}")
             raise
 
     def authenticate(self):
         if self.uid:
             return self.uid
-        self.logger.info(f"Authenticating with Odoo at {self.url}...")
-        self.uid = self._json_rpc(self.url, "common/login", {
-            "db": self.db,
-            "login": self.username,
-            "password": self.password
-        })
-        if not self.uid:
-            raise Exception("Authentication failed: Invalid credentials or database name.")
-        self.logger.info(f"Authenticated with UID: {self.uid}")
+        with self.auth_lock:
+            # Concurrent first calls share a single login
+            if self.uid:
+                return self.uid
+            self.logger.info(f"Authenticating with Odoo at {self.url}...")
+            uid = self._json_rpc(self.url, "common/login", {
+                "db": self.db,
+                "login": self.username,
+                "password": self.password
+            })
+            if not uid:
+                raise Exception("Authentication failed: Invalid credentials or database name.")
+            self.uid = uid
+            self.logger.info(f"Authenticated with UID: {self.uid}")
         return self.uid
 
     def execute_kw(self, model: str, method: str, *args, **kwargs) -> Any:
         uid = self.authenticate()
-        return self._json_rpc(self.url, "object/execute_kw", {
+        result = self._json_rpc(self.url, "object/execute_kw", {
             "db": self.db,
             "uid": uid,
             "password": self.password,
@@ -63,18 +123,40 @@ class OdooClient:
             "args": args,
             "kwargs": kwargs
         })
+        if method in WRITE_METHODS:
+            self.cache.invalidate(model)
+        return result
 
-    def create_draft_invoice(self, partner_id: int, invoice_line_ids: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Creates a draft invoice (account.move) in Odoo."""
-        self.logger.info(f"Creating draft invoice for partner {partner_id}")
-        
-        invoice_vals = {
+    def cached_search_read(self, model: str, domain: List[Any], fields: List[str]) -> List[Dict[str, Any]]:
+        """`search_read` served through the TTL + write-invalidation cache."""
+        return self.cache.search_read(
+            model, domain, fields,
+            lambda d, f: self.execute_kw(model, 'search_read', d, f)
+        )
+
+    def _invoice_vals(self, partner_id: int, invoice_line_ids: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
             'move_type': 'out_invoice',
             'partner_id': partner_id,
             'invoice_date': os.getenv("CURRENT_DATE", "2026-02-21"),
             'invoice_line_ids': [(0, 0, line) for line in invoice_line_ids]
         }
 
+    def _payment_vals(self, amount: float, journal_id: int) -> Dict[str, Any]:
+        return {
+            'amount': amount,
+            'payment_type': 'inbound',
+            'partner_type': 'customer',
+            'journal_id': journal_id,
+            'payment_method_line_id': 1, # Manual
+        }
+
+    def create_draft_invoice(self, partner_id: int, invoice_line_ids: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Creates a draft invoice (account.move) in Odoo."""
+        self.logger.info(f"Creating draft invoice for partner {partner_id}")
+        
+        invoice_vals = self._invoice_vals(partner_id, invoice_line_ids)
+
         if self.dry_run:
             self.logger.info("[DRY RUN] Skipping invoice creation.")
             return {"status": "dry_run", "data": invoice_vals}
@@ -82,6 +164,24 @@ class OdooClient:
         invoice_id = self.execute_kw('account.move', 'create', invoice_vals)
         return {"status": "success", "invoice_id": invoice_id}
 
+    def create_draft_invoices(self, invoices: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Creates many draft invoices with a single `create` call.
+        Each item needs `partner_id` and `invoice_line_ids`; IDs come back in input order.
+        """
+        if not invoices:
+            return {"status": "success", "invoice_ids": []}
+        self.logger.info(f"Creating {len(invoices)} draft invoices in one batch")
+
+        vals_list = [self._invoice_vals(inv['partner_id'], inv['invoice_line_ids']) for inv in invoices]
+
+        if self.dry_run:
+            self.logger.info(f"[DRY RUN] Skipping creation of {len(vals_list)} invoices.")
+            return {"status": "dry_run", "data": vals_list}
+
+        invoice_ids = self.execute_kw('account.move', 'create', vals_list)
+        return {"status": "success", "invoice_ids": invoice_ids}
+
     def post_invoice(self, invoice_id: int) -> Dict[str, Any]:
         """Posts (validates) a draft invoice. Requires human approval logic outside this client."""
         self.logger.info(f"Posting invoice {invoice_id}")
@@ -93,6 +193,19 @@ class OdooClient:
         self.execute_kw('account.move', 'action_post', [invoice_id])
         return {"status": "success", "invoice_id": invoice_id}
 
+    def post_invoices(self, invoice_ids: List[int]) -> Dict[str, Any]:
+        """Posts many draft invoices with one `action_post` over the ID list."""
+        if not invoice_ids:
+            return {"status": "success", "invoice_ids": []}
+        self.logger.info(f"Posting {len(invoice_ids)} invoices in one batch")
+
+        if self.dry_run:
+            self.logger.info(f"[DRY RUN] Skipping posting of invoices {invoice_ids}.")
+            return {"status": "dry_run", "invoice_ids": invoice_ids}
+
+        self.execute_kw('account.move', 'action_post', list(invoice_ids))
+        return {"status": "success", "invoice_ids": invoice_ids}
+
     def record_payment(self, invoice_id: int, amount: float, journal_id: int) -> Dict[str, Any]:
         """Records a payment against an invoice."""
         self.logger.info(f"Recording payment of {amount} for invoice {invoice_id}")
@@ -102,18 +215,39 @@ class OdooClient:
             return {"status": "dry_run", "invoice_id": invoice_id, "amount": amount}
 
         # Create payment
-        payment_vals = {
-            'amount': amount,
-            'payment_type': 'inbound',
-            'partner_type': 'customer',
-            'journal_id': journal_id,
-            'payment_method_line_id': 1, # Manual
-        }
+        payment_vals = self._payment_vals(amount, journal_id)
         payment_id = self.execute_kw('account.payment', 'create', payment_vals)
         self.execute_kw('account.payment', 'action_post', [payment_id])
         
         return {"status": "success", "payment_id": payment_id}
 
+    def record_payments(self, payments: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Records many payments in two RPCs: one multi-record `create`, one `action_post`.
+        Each item needs `invoice_id`, `amount` and `journal_id`.
+        """
+        if not payments:
+            return {"status": "success", "payment_ids": []}
+        self.logger.info(f"Recording {len(payments)} payments in one batch")
+
+        if self.dry_run:
+            self.logger.info(f"[DRY RUN] Skipping recording of {len(payments)} payments.")
+            return {"status": "dry_run", "payments": payments}
+
+        vals_list = [self._payment_vals(p['amount'], p['journal_id']) for p in payments]
+        payment_ids = self.execute_kw('account.payment', 'create', vals_list)
+        try:
+            self.execute_kw('account.payment', 'action_post', list(payment_ids))
+        except Exception:
+            # Keep the batch all-or-nothing, so retrying it (or its approvals one by one) creates no duplicates
+            try:
+                self.execute_kw('account.payment', 'unlink', list(payment_ids))
+            except Exception as e:
+                self.logger.error(f"Could not remove draft payments {payment_ids}: {e}")
+            raise
+
+        return {"status": "success", "payment_ids": payment_ids}
+
     def fetch_revenue_summary(self, date_from: str, date_to: str) -> Dict[str, Any]:
         """Fetches total revenue between two dates."""
         domain = [
@@ -122,7 +256,7 @@ class OdooClient:
             ('invoice_date', '>=', date_from),
             ('invoice_date', '<=', date_to)
         ]
-        invoices = self.execute_kw('account.move', 'search_read', domain, ['amount_total', 'currency_id'])
+        invoices = self.cached_search_read('account.move', domain, ['amount_total', 'currency_id'])
         total = sum(inv['amount_total'] for inv in invoices)
         return {"total_revenue": total, "count": len(invoices), "currency": "USD"}
 
@@ -136,4 +270,4 @@ class OdooClient:
             ('invoice_date_due', '<', today)
         ]
         fields = ['name', 'partner_id', 'amount_total', 'amount_residual', 'invoice_date_due']
-        return self.execute_kw('account.move', 'search_read', domain, fields)
+        return self.cached_search_read('account.move', domain, fields)
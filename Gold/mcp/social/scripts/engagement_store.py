@@ -0,0 +1,179 @@
+# mcp/social/scripts/engagement_store.py
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+VAULT_PATH = Path("AI_Employee_Vault")
+ENGAGEMENT_DB = VAULT_PATH / "Accounting" / "social_engagement.db"
+AUDIT_VIEW = VAULT_PATH / "Accounting" / "Social_Engagement_Audit.md"
+
+METRICS = ["reach", "likes", "shares", "impressions"]
+# Platform-specific names folded into the common metric set
+ALIASES = {"retweets": "shares"}
+
+RESOLUTIONS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+# 1970-01-05 was a Monday; weekly buckets start on Mondays (UTC)
+WEEK_OFFSET = 4 * 86400
+
+_rollup_cols = ", ".join(f"{m}_sum REAL, {m}_n INTEGER, {m}_last REAL" for m in METRICS)
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS samples (
+    platform TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    {", ".join(f"{m} REAL" for m in METRICS)},
+    PRIMARY KEY (platform, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    samples INTEGER NOT NULL,
+    {_rollup_cols},
+    PRIMARY KEY (resolution, platform, bucket)
+) WITHOUT ROWID;
+"""
+
+_ROLLUP_UPSERT = (
+    f"INSERT INTO rollups (resolution, platform, bucket, samples, "
+    f"{', '.join(f'{m}_sum, {m}_n, {m}_last' for m in METRICS)}) "
+    f"VALUES (?, ?, ?, 1, {', '.join('?, ?, ?' for _ in METRICS)}) "
+    f"ON CONFLICT(resolution, platform, bucket) DO UPDATE SET samples = samples + 1, "
+    + ", ".join(
+        f"{m}_sum = COALESCE({m}_sum, 0) + COALESCE(excluded.{m}_sum, 0), "
+        f"{m}_n = {m}_n + excluded.{m}_n, "
+        f"{m}_last = COALESCE(excluded.{m}_last, {m}_last)"
+        for m in METRICS
+    )
+)
+
+
+def bucket_start(ts: int, resolution: str) -> int:
+    width = RESOLUTIONS[resolution]
+    offset = WEEK_OFFSET if resolution == "week" else 0
+    return ts - ((ts - offset) % width)
+
+
+class EngagementStore:
+    """
+    Per-platform engagement time series in SQLite.
+
+    Raw samples are clustered by (platform, ts) so range scans are index-only, and
+    hourly/daily/weekly rollups are maintained on write, so trend queries never touch
+    raw rows. `Social_Engagement_Audit.md` is rendered from here on demand.
+    """
+
+    def __init__(self, db_path: Path = ENGAGEMENT_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _normalize(data: Dict[str, Any]) -> Dict[str, Optional[float]]:
+        values = {m: None for m in METRICS}
+        for key, value in data.items():
+            metric = ALIASES.get(key, key)
+            if metric in values and isinstance(value, (int, float)):
+                values[metric] = float(value)
+        return values
+
+    def append(self, stats: Dict[str, Dict[str, Any]], ts: Optional[int] = None):
+        """Records one snapshot ({platform: {metric: value}}) and updates every rollup."""
+        ts = int(ts if ts is not None else time.time())
+        with self._connect() as conn:
+            for platform, data in stats.items():
+                values = self._normalize(data)
+                cur = conn.execute(
+                    f"INSERT OR IGNORE INTO samples (platform, ts, {', '.join(METRICS)}) "
+                    f"VALUES (?, ?, {', '.join('?' for _ in METRICS)})",
+                    [platform, ts] + [values[m] for m in METRICS]
+                )
+                if cur.rowcount == 0:
+                    continue  # Same platform/second already recorded; keep rollups exact
+                rollup_values = []
+                for m in METRICS:
+                    v = values[m]
+                    rollup_values += [v, 0 if v is None else 1, v]
+                for resolution in RESOLUTIONS:
+                    conn.execute(_ROLLUP_UPSERT, [resolution, platform, bucket_start(ts, resolution)] + rollup_values)
+
+    def query(self, platform: Optional[str] = None, start: Optional[int] = None, end: Optional[int] = None,
+              resolution: str = "raw") -> List[Dict[str, Any]]:
+        """
+        Returns points in [start, end) ordered by time.
+        `resolution` is "raw" or one of hour/day/week; rollup points carry the average
+        of each metric plus its last observed value (`<metric>_last`).
+        """
+        start = start if start is not None else 0
+        end = end if end is not None else 2 ** 62
+        platform_clause = "AND platform = ?" if platform else ""
+        params: List[Any] = [start, end] + ([platform] if platform else [])
+
+        with self._connect() as conn:
+            if resolution == "raw":
+                rows = conn.execute(
+                    f"SELECT platform, ts, {', '.join(METRICS)} FROM samples "
+                    f"WHERE ts >= ? AND ts < ? {platform_clause} ORDER BY ts, platform",
+                    params
+                ).fetchall()
+                return [dict(r) for r in rows]
+
+            if resolution not in RESOLUTIONS:
+                raise ValueError(f"Unknown resolution: {resolution}")
+            rows = conn.execute(
+                f"SELECT * FROM rollups WHERE resolution = ? AND bucket >= ? AND bucket < ? {platform_clause} "
+                f"ORDER BY bucket, platform",
+                [resolution, bucket_start(start, resolution)] + params[1:]
+            ).fetchall()
+
+        points = []
+        for r in rows:
+            point = {"platform": r["platform"], "ts": r["bucket"], "samples": r["samples"]}
+            for m in METRICS:
+                point[m] = round(r[f"{m}_sum"] / r[f"{m}_n"], 2) if r[f"{m}_n"] else None
+                point[f"{m}_last"] = r[f"{m}_last"]
+            points.append(point)
+        return points
+
+    def render_markdown(self, path: Path = AUDIT_VIEW, since: Optional[int] = None) -> Path:
+        """Writes the audit table view (raw samples since `since`, default last 30 days)."""
+        since = since if since is not None else int(time.time()) - 30 * 86400
+        lines = [
+            "# Social Media Engagement Audit",
+            "",
+            "| Timestamp | Platform | Reach | Likes/Engagement |",
+            "|---|---|---|---|",
+        ]
+        for point in self.query(start=since):
+            when = datetime.fromtimestamp(point["ts"]).strftime("%Y-%m-%d %H:%M:%S")
+            reach = point["reach"] if point["reach"] is not None else point["impressions"]
+            lines.append(
+                f"| {when} | {point['platform'].capitalize()} | {self._fmt(reach)} | {self._fmt(point['likes'])} |"
+            )
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tmp_path.replace(path)
+        return path
+
+    @staticmethod
+    def _fmt(value: Optional[float]) -> str:
+        if value is None:
+            return "n/a"
+        return str(int(value)) if float(value).is_integer() else f"{value:.2f}"
@@ -1,8 +1,11 @@
 # mcp/social/scripts/meta_client.py
-import requests
 import os
 import json
 import logging
+from scripts.utils.circuit_breaker import breaker_for
+from scripts.utils.lazy import lazy_module
+
+requests = lazy_module("requests")  # Loaded on first use; one-shot CLIs that never call out skip it
 
 class MetaClient:
     def __init__(self):
@@ -10,6 +13,8 @@ class MetaClient:
         self.ig_token = os.getenv("INSTAGRAM_ACCESS_TOKEN")
         self.dry_run = os.getenv("DRY_RUN", "true").lower() == "true"
         self.logger = logging.getLogger("MetaClient")
+        # Facebook and Instagram share the Graph API, so they share one breaker
+        self.breaker = breaker_for("meta", trip_on=(requests.exceptions.RequestException,))
 
     def post_to_facebook(self, message: str) -> dict:
         self.logger.info(f"Posting to Facebook: {message[:30]}...")
@@ -17,19 +22,22 @@ class MetaClient:
             return {"status": "dry_run", "platform": "facebook", "message": message}
         
         # Real API call (simulated for hackathon)
-        # response = requests.post(f"https://graph.facebook.com/v19.0/me/feed", params={"message": message, "access_token": self.fb_token})
-        return {"status": "success", "platform": "facebook", "post_id": "fb_123456789"}
+        with self.breaker:
+            # response = requests.post(f"https://graph.facebook.com/v19.0/me/feed", params={"message": message, "access_token": self.fb_token})
+            return {"status": "success", "platform": "facebook", "post_id": "fb_123456789"}
 
     def post_to_instagram(self, image_url: str, caption: str) -> dict:
         self.logger.info(f"Posting to Instagram: {caption[:30]}...")
         if self.dry_run:
             return {"status": "dry_run", "platform": "instagram", "caption": caption}
         
-        return {"status": "success", "platform": "instagram", "post_id": "ig_123456789"}
+        with self.breaker:
+            return {"status": "success", "platform": "instagram", "post_id": "ig_123456789"}
 
     def fetch_engagement(self) -> dict:
         # Returns mock engagement stats
-        return {
-            "facebook": {"likes": 125, "shares": 12, "reach": 1500},
-            "instagram": {"likes": 450, "comments": 25, "reach": 2200}
-        }
+        with self.breaker:
+            return {
+                "facebook": {"likes": 125, "shares": 12, "reach": 1500},
+                "instagram": {"likes": 450, "comments": 25, "reach": 2200}
+            }
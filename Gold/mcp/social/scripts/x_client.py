@@ -1,14 +1,18 @@
 # mcp/social/scripts/x_client.py
-import requests
 import os
 import json
 import logging
+from scripts.utils.circuit_breaker import breaker_for
+from scripts.utils.lazy import lazy_module
+
+requests = lazy_module("requests")  # Loaded on first use; one-shot CLIs that never call out skip it
 
 class XClient:
     def __init__(self):
         self.twitter_token = os.getenv("TWITTER_BEARER_TOKEN")
         self.dry_run = os.getenv("DRY_RUN", "true").lower() == "true"
         self.logger = logging.getLogger("XClient")
+        self.breaker = breaker_for("x", trip_on=(requests.exceptions.RequestException,))
 
     def post_tweet(self, text: str) -> dict:
         self.logger.info(f"Posting tweet: {text[:30]}...")
@@ -16,11 +20,13 @@ class XClient:
             return {"status": "dry_run", "platform": "twitter", "text": text}
         
         # Real API call (simulated for hackathon)
-        # response = requests.post(f"https://api.twitter.com/2/tweets", params={"text": text}, headers={"Authorization": f"Bearer {self.twitter_token}"})
-        return {"status": "success", "platform": "twitter", "tweet_id": "tweet_123456789"}
+        with self.breaker:
+            # response = requests.post(f"https://api.twitter.com/2/tweets", params={"text": text}, headers={"Authorization": f"Bearer {self.twitter_token}"})
+            return {"status": "success", "platform": "twitter", "tweet_id": "tweet_123456789"}
 
     def fetch_engagement(self) -> dict:
         # Returns mock engagement stats
-        return {
-            "twitter": {"likes": 55, "retweets": 8, "impressions": 850}
-        }
+        with self.breaker:
+            return {
+                "twitter": {"likes": 55, "retweets": 8, "impressions": 850}
+            }
@@ -1,58 +1,147 @@
 # mcp/social/social_mcp.py
-import sys
 import json
 import os
+import time
+import asyncio
 import argparse
 from pathlib import Path
 from datetime import datetime
-from scripts.meta_client import MetaClient
-from scripts.x_client import XClient
+from functools import cached_property
+from mcp.social.scripts.meta_client import MetaClient
+from mcp.social.scripts.x_client import XClient
+from mcp.social.scripts.engagement_store import EngagementStore
+from mcp.stdio_server import StdioJSONRPCServer
 
 VAULT_PATH = Path("AI_Employee_Vault")
 PENDING_APPROVAL = VAULT_PATH / "Pending_Approval"
 ACCOUNTING = VAULT_PATH / "Accounting"
 
+TOOLS = [
+    {"name": "draft_facebook_post", "description": "Request approval for a Facebook post.",
+     "inputSchema": {"type": "object", "properties": {"content": {"type": "string"}}, "required": ["content"]}},
+    {"name": "draft_instagram_post", "description": "Request approval for an Instagram post.",
+     "inputSchema": {"type": "object", "properties": {"content": {"type": "string"}, "image_url": {"type": "string"}},
+                     "required": ["content"]}},
+    {"name": "draft_twitter_post", "description": "Request approval for a post on X.",
+     "inputSchema": {"type": "object", "properties": {"content": {"type": "string"}}, "required": ["content"]}},
+    {"name": "fetch_social_engagement", "description": "Engagement stats for all platforms, logged to Accounting.",
+     "inputSchema": {"type": "object", "properties": {}}},
+    {"name": "generate_social_summary", "description": "Markdown summary of recent social performance.",
+     "inputSchema": {"type": "object", "properties": {}}},
+    {"name": "query_engagement", "description": "Engagement time series for a date range (raw/hour/day/week).",
+     "inputSchema": {"type": "object", "properties": {
+         "platform": {"type": "string"}, "date_from": {"type": "string"}, "date_to": {"type": "string"},
+         "resolution": {"type": "string", "enum": ["raw", "hour", "day", "week"]}}}},
+    {"name": "render_engagement_audit", "description": "Regenerate Accounting/Social_Engagement_Audit.md.",
+     "inputSchema": {"type": "object", "properties": {}}},
+]
+
+
+class EngagementCache:
+    """
+    Holds the latest cross-platform engagement snapshot for `ttl` seconds.
+    Concurrent callers inside the window share one in-flight fetch.
+    """
+
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self.snapshot = None
+        self.fetched_at = 0.0
+        self.inflight = None
+
+    async def get(self, fetch):
+        if self.snapshot is not None and time.monotonic() - self.fetched_at < self.ttl:
+            return self.snapshot
+        if self.inflight is None:
+            self.inflight = asyncio.ensure_future(fetch())
+        inflight = self.inflight
+        try:
+            snapshot = await asyncio.shield(inflight)
+        finally:
+            if self.inflight is inflight and inflight.done():
+                self.inflight = None
+        self.snapshot, self.fetched_at = snapshot, time.monotonic()
+        return snapshot
+
+
 class SocialMCPServer:
     def __init__(self):
-        self.meta_client = MetaClient()
-        self.x_client = XClient()
-
-    def handle_tool_call(self, name: str, params: dict):
+        self.engagement = EngagementCache(ttl=float(os.getenv("SOCIAL_ENGAGEMENT_TTL", "300")))
+        self.series = EngagementStore()
+
+    # Clients (and the HTTP stack behind them) are only built for tools that call out;
+    # drafting a post just writes an approval file
+
+    @cached_property
+    def meta_client(self) -> MetaClient:
+        return MetaClient()
+
+    @cached_property
+    def x_client(self) -> XClient:
+        return XClient()
+
+    async def _fetch_engagement(self) -> dict:
+        """
+        Fetches Meta and X stats concurrently (the clients are blocking, so each gets a thread).
+        Only fresh fetches are logged to Accounting; snapshots served from the cache are not.
+        """
+        meta_stats, x_stats = await asyncio.gather(
+            asyncio.to_thread(self.meta_client.fetch_engagement),
+            asyncio.to_thread(self.x_client.fetch_engagement)
+        )
+        stats = {**meta_stats, **x_stats}
+        await asyncio.to_thread(self._log_to_accounting, stats)
+        return stats
+
+    async def handle_tool_call_async(self, name: str, params: dict):
         """MCP Tool Handler for Social Media."""
         try:
             if name == "draft_facebook_post":
                 return self._request_approval("post_facebook", params)
-            
+
             elif name == "draft_instagram_post":
                 return self._request_approval("post_instagram", params)
-            
+
             elif name == "draft_twitter_post":
                 return self._request_approval("post_twitter", params)
-            
+
             elif name == "fetch_social_engagement":
-                meta_stats = self.meta_client.fetch_engagement()
-                x_stats = self.x_client.fetch_engagement()
-                all_stats = {**meta_stats, **x_stats}
-                self._log_to_accounting(all_stats)
-                return all_stats
+                return await self.engagement.get(self._fetch_engagement)
 
             elif name == "generate_social_summary":
-                stats = {**self.meta_client.fetch_engagement(), **self.x_client.fetch_engagement()}
+                stats = await self.engagement.get(self._fetch_engagement)
                 summary = self._create_summary_markdown(stats)
                 return {"status": "success", "summary": summary}
-            
+
+            elif name == "query_engagement":
+                return await asyncio.to_thread(
+                    self.series.query,
+                    params.get("platform"),
+                    self._to_epoch(params.get("date_from")),
+                    self._to_epoch(params.get("date_to")),
+                    params.get("resolution", "day")
+                )
+
+            elif name == "render_engagement_audit":
+                path = await asyncio.to_thread(self.series.render_markdown)
+                return {"status": "success", "file": str(path)}
+
             else:
                 return {"error": f"Unknown tool: {name}"}
         except Exception as e:
             return {"error": str(e)}
 
+    def handle_tool_call(self, name: str, params: dict):
+        """Synchronous entry point for the one-shot CLI."""
+        return asyncio.run(self.handle_tool_call_async(name, params))
+
     def _request_approval(self, action: str, params: dict):
         """Creates an approval request for a social media post."""
         PENDING_APPROVAL.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         filename = f"APPROVAL_{action}_{timestamp}.md"
         file_path = PENDING_APPROVAL / filename
-        
+
         content = f"""---
 action: {action}
 details: {json.dumps(params)}
@@ -71,53 +160,48 @@ status: pending
 """
         with open(file_path, "w", encoding="utf-8") as f:
             f.write(content)
-        
+
         return {"status": "approval_required", "file": str(file_path), "message": "Social media post requires human approval."}
 
     def _log_to_accounting(self, stats: dict):
-        """Logs social media reach/engagement to the Accounting/Engagement_Log.md."""
-        ACCOUNTING.mkdir(parents=True, exist_ok=True)
-        log_file = ACCOUNTING / "Social_Engagement_Audit.md"
-        
-        today = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        if not log_file.exists():
-            with open(log_file, "w", encoding="utf-8") as f:
-                f.write("# Social Media Engagement Audit
-
-| Timestamp | Platform | Reach | Likes/Engagement |
-|---|---|---|---|
-")
-        
-        with open(log_file, "a", encoding="utf-8") as f:
-            for platform, data in stats.items():
-                reach = data.get("reach", data.get("impressions", "n/a"))
-                likes = data.get("likes", "n/a")
-                f.write(f"| {today} | {platform.capitalize()} | {reach} | {likes} |
-")
+        """Records social media reach/engagement in the Accounting time-series store."""
+        self.series.append(stats)
+
+    @staticmethod
+    def _to_epoch(value):
+        if not value:
+            return None
+        return int(datetime.fromisoformat(value).timestamp())
 
     def _create_summary_markdown(self, stats: dict) -> str:
         """Generates a markdown summary of recent social performance."""
-        summary = f"# Weekly Social Media Engagement Summary
-
-Generated: {datetime.now().strftime('%Y-%m-%d')}
-
-"
+        summary = f"# Weekly Social Media Engagement Summary\n\nGenerated: {datetime.now().strftime('%Y-%m-%d')}\n\n"
         for platform, data in stats.items():
-            summary += f"### {platform.capitalize()}
-"
+            summary += f"### {platform.capitalize()}\n"
             for k, v in data.items():
-                summary += f"- **{k.replace('_', ' ').capitalize()}**: {v}
-"
-            summary += "
-"
+                summary += f"- **{k.replace('_', ' ').capitalize()}**: {v}\n"
+            summary += "\n"
         return summary
 
+def serve():
+    """Persistent stdio JSON-RPC mode: clients and the engagement snapshot stay warm between calls."""
+    server = SocialMCPServer()
+    StdioJSONRPCServer(
+        "social_media", "1.0.0", TOOLS, server.handle_tool_call_async,
+        max_concurrency=int(os.getenv("MCP_MAX_CONCURRENCY", "8"))
+    ).run()
+
 def main():
     parser = argparse.ArgumentParser()
-    parser.add_argument("tool_name", help="Tool to call")
-    parser.add_argument("params", help="JSON string of params")
+    parser.add_argument("tool_name", nargs="?", help="Tool to call (omit to serve)")
+    parser.add_argument("params", nargs="?", default="{}", help="JSON string of params")
+    parser.add_argument("--serve", action="store_true", help="Run as a long-lived stdio JSON-RPC server")
     args = parser.parse_args()
 
+    if args.serve or not args.tool_name:
+        serve()
+        return
+
     server = SocialMCPServer()
     params = json.loads(args.params)
     result = server.handle_tool_call(args.tool_name, params)
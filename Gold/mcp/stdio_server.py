@@ -0,0 +1,176 @@
+# mcp/stdio_server.py
+import sys
+import json
+import time
+import asyncio
+import inspect
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+PROTOCOL_VERSION = "2024-11-05"
+
+
+class MethodNotFound(Exception):
+    pass
+
+
+class ToolMetrics:
+    """Per-tool call counts, error counts and latency percentiles over a sliding window."""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self.tools: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def record(self, name: str, seconds: float, ok: bool):
+        with self.lock:
+            stats = self.tools.setdefault(name, {
+                "calls": 0, "errors": 0, "total_s": 0.0, "max_s": 0.0, "samples": deque(maxlen=self.window)
+            })
+            stats["calls"] += 1
+            stats["errors"] += 0 if ok else 1
+            stats["total_s"] += seconds
+            stats["max_s"] = max(stats["max_s"], seconds)
+            stats["samples"].append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            result = {}
+            for name, stats in self.tools.items():
+                samples = sorted(stats["samples"])
+                result[name] = {
+                    "calls": stats["calls"],
+                    "errors": stats["errors"],
+                    "avg_ms": round(stats["total_s"] / stats["calls"] * 1000, 2),
+                    "p50_ms": round(self._percentile(samples, 0.50) * 1000, 2),
+                    "p95_ms": round(self._percentile(samples, 0.95) * 1000, 2),
+                    "max_ms": round(stats["max_s"] * 1000, 2),
+                }
+            return result
+
+    @staticmethod
+    def _percentile(samples: List[float], q: float) -> float:
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+class StdioJSONRPCServer:
+    """
+    Long-running MCP server speaking newline-delimited JSON-RPC 2.0 over stdin/stdout.
+
+    Requests are dispatched concurrently (up to `max_concurrency` in flight). Synchronous
+    handlers run in worker threads; coroutine handlers run on the event loop. Besides the
+    MCP methods (`initialize`, `tools/list`, `tools/call`, `ping`) the server answers
+    `metrics/get` with per-tool latency statistics.
+    """
+
+    def __init__(self, name: str, version: str, tools: List[Dict[str, Any]],
+                 handler: Callable[[str, dict], Any], max_concurrency: int = 8,
+                 extra_metrics: Optional[Callable[[], Dict[str, Any]]] = None):
+        self.name = name
+        self.version = version
+        self.tools = tools
+        self.handler = handler
+        self.max_concurrency = max_concurrency
+        self.extra_metrics = extra_metrics
+        self.metrics = ToolMetrics()
+        self.logger = logging.getLogger(name)
+        self.running = True
+
+    def run(self):
+        asyncio.run(self.serve())
+
+    async def serve(self, reader=None, writer=None):
+        reader = reader or sys.stdin
+        self.writer = writer or sys.stdout
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        loop = asyncio.get_running_loop()
+        pending = set()
+
+        self.logger.info(f"{self.name} serving on stdio (max concurrency: {self.max_concurrency})")
+        while self.running:
+            line = await loop.run_in_executor(None, reader.readline)
+            if not line:
+                break  # stdin closed by the client
+            line = line.strip()
+            if not line:
+                continue
+            task = asyncio.create_task(self._handle_line(line))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _handle_line(self, line: str):
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as e:
+            self._write({"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": f"Parse error: {e}"}})
+            return
+
+        msg_id = message.get("id")
+        try:
+            result = await self._dispatch(message.get("method"), message.get("params") or {})
+        except MethodNotFound as e:
+            if msg_id is not None:
+                self._write({"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32601, "message": str(e)}})
+            return
+        except Exception as e:
+            self.logger.error(f"Request {message.get('method')} failed: {e}")
+            if msg_id is not None:
+                self._write({"jsonrpc": "2.0", "id": msg_id, "error": {"code": -32603, "message": str(e)}})
+            return
+
+        # Notifications (no id) never get a response
+        if msg_id is not None:
+            self._write({"jsonrpc": "2.0", "id": msg_id, "result": result})
+
+    async def _dispatch(self, method: str, params: dict) -> Any:
+        if method == "initialize":
+            return {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": self.name, "version": self.version},
+            }
+        if method == "ping" or (method or "").startswith("notifications/"):
+            return {}
+        if method == "tools/list":
+            return {"tools": self.tools}
+        if method == "tools/call":
+            return await self._call_tool(params.get("name"), params.get("arguments") or {})
+        if method == "metrics/get":
+            metrics = {"tools": self.metrics.snapshot()}
+            if self.extra_metrics:
+                metrics.update(self.extra_metrics())
+            return metrics
+        if method == "shutdown":
+            self.running = False
+            return {}
+        raise MethodNotFound(f"Method not found: {method}")
+
+    async def _call_tool(self, name: str, arguments: dict) -> Dict[str, Any]:
+        async with self.semaphore:
+            start = time.perf_counter()
+            is_error = True  # Until the handler returns: a raised exception counts as a failed call
+            try:
+                if inspect.iscoroutinefunction(self.handler):
+                    result = await self.handler(name, arguments)
+                else:
+                    result = await asyncio.to_thread(self.handler, name, arguments)
+                is_error = isinstance(result, dict) and "error" in result
+            finally:
+                self.metrics.record(name, time.perf_counter() - start, not is_error)
+
+        return {
+            "content": [{"type": "text", "text": json.dumps(result, default=str)}],
+            "isError": is_error,
+        }
+
+    def _write(self, message: Dict[str, Any]):
+        # Only called from the event loop thread, so writes never interleave
+        self.writer.write(json.dumps(message, default=str) + "\n")
+        self.writer.flush()
@@ -1,9 +1,16 @@
 # scripts/__init__.py
-from .audit_logger import AuditLogger
-from .retry_handler import with_retry
-from .base_watcher import BaseWatcher
-from .gmail_watcher import GmailWatcher
-from .whatsapp_watcher import WhatsAppWatcher
-from .finance_watcher import FinanceWatcher
-from .watchdog import Watchdog
-from .orchestrator import Orchestrator
+# Exports resolve on first access so `python -m scripts.<module>` only imports what it uses
+from .utils.lazy import lazy_attrs
+
+_EXPORTS = {
+    "AuditLogger": ".audit_logger",
+    "with_retry": ".retry_handler",
+    "BaseWatcher": ".base_watcher",
+    "GmailWatcher": ".gmail_watcher",
+    "WhatsAppWatcher": ".whatsapp_watcher",
+    "FinanceWatcher": ".finance_watcher",
+    "Watchdog": ".watchdog",
+    "Orchestrator": ".orchestrator",
+}
+__all__ = list(_EXPORTS)
+__getattr__ = lazy_attrs(__name__, _EXPORTS)
@@ -0,0 +1,314 @@
+# scripts/action_queue.py
+import os
+import json
+import time
+import socket
+import hashlib
+import inspect
+import logging
+import sqlite3
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .failure_store import FAILURE_DB, get_failure_store
+from .retry_scheduler import RetryPolicy
+from .utils.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger("ActionQueue")
+
+# pending -> running -> done | pending (retry) | dead; banking actions start out held
+STATUSES = ("pending", "held", "running", "done", "dead")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS actions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    target TEXT NOT NULL,
+    args TEXT NOT NULL,
+    kwargs TEXT NOT NULL,
+    fingerprint TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    next_attempt_at REAL NOT NULL,
+    claimed_by TEXT,
+    claimed_at REAL,
+    last_error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_actions_due ON actions (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS idx_actions_fingerprint ON actions (fingerprint, status);
+"""
+
+
+def target_name(func: Callable) -> str:
+    return f"{func.__module__}:{func.__qualname__}"
+
+
+def resolve_target(target: str) -> Callable:
+    """Imports `module:qualname` and returns the undecorated function."""
+    module_name, qualname = target.split(":", 1)
+    obj = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    # Replay owns retries, so skip decorators like with_backoff that sleep and re-report
+    return inspect.unwrap(obj)
+
+
+def idempotency_key(target: str, args_json: str, kwargs_json: str) -> str:
+    return hashlib.sha256(f"{target}\n{args_json}\n{kwargs_json}".encode("utf-8")).hexdigest()
+
+
+class ActionQueue:
+    """
+    Durable queue of failed calls, stored next to the failure index.
+
+    Each entry is a module-level function (`module:qualname`) plus JSON args/kwargs.
+    The idempotency key is a hash of all three, so the same failed call is queued (and
+    replayed) once however many times it fails. Calls that cannot be serialized are
+    not queued; they stay documented in the failure report only.
+    """
+
+    def __init__(self, db_path: Path = FAILURE_DB, max_attempts: int = None, policy: RetryPolicy = None):
+        self.db_path = Path(db_path)
+        self.max_attempts = max_attempts or int(os.getenv("REPLAY_MAX_ATTEMPTS", "5"))
+        self.policy = policy or RetryPolicy(base_delay=30.0, max_delay=3600.0)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, func: Callable, args: tuple = None, kwargs: dict = None,
+                fingerprint: str = None) -> Optional[int]:
+        """
+        Queues a failed call for replay. Returns the entry id, or None if it cannot be replayed.
+        A call already queued keeps its entry; one that is done or dead is failing again and reopens.
+        """
+        target = target_name(func)
+        if "<locals>" in target:
+            return None
+        try:
+            args_json = json.dumps(list(args or ()), sort_keys=True)
+            kwargs_json = json.dumps(kwargs or {}, sort_keys=True)
+        except (TypeError, ValueError):
+            logger.debug(f"Not queueing {target}: arguments are not JSON-serializable")
+            return None
+
+        # Lazy import: error_manager imports this module
+        from .error_manager import ErrorManager
+        status = "held" if ErrorManager.is_banking_function(target) else "pending"
+        key = idempotency_key(target, args_json, kwargs_json)
+        now_iso = datetime.now().isoformat()
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO actions (idempotency_key, target, args, kwargs, fingerprint, status, max_attempts, "
+                "next_attempt_at, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(idempotency_key) DO UPDATE SET status = excluded.status, attempts = 0, "
+                "fingerprint = excluded.fingerprint, next_attempt_at = excluded.next_attempt_at, "
+                "claimed_by = NULL, last_error = NULL, updated_at = excluded.updated_at "
+                "WHERE actions.status IN ('done', 'dead')",
+                (key, target, args_json, kwargs_json, fingerprint, status, self.max_attempts,
+                 time.time() + self.policy.delay(1), now_iso, now_iso)
+            )
+            row = conn.execute("SELECT id, status FROM actions WHERE idempotency_key = ?", (key,)).fetchone()
+
+        if status == "held" and row["status"] == "held":
+            logger.warning(f"Safety: banking action {target} held for manual release (queue id {row['id']})")
+        return row["id"]
+
+    def claim(self, worker_id: str, limit: int, lease: float = 600.0) -> List[Dict[str, Any]]:
+        """
+        Atomically moves up to `limit` due entries to running for this worker.
+        Entries left running by a crashed worker become due again after `lease` seconds.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute(
+                "UPDATE actions SET status = 'running', claimed_by = ?, claimed_at = ?, updated_at = ? "
+                "WHERE id IN (SELECT id FROM actions WHERE (status = 'pending' AND next_attempt_at <= ?) "
+                "OR (status = 'running' AND claimed_at < ?) ORDER BY next_attempt_at LIMIT ?) "
+                "RETURNING *",
+                (worker_id, now, datetime.now().isoformat(), now, now - lease, limit)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def complete(self, action_id: int):
+        self._update(action_id, "done", last_error=None)
+
+    def fail(self, action: Dict[str, Any], error: Exception, count_attempt: bool = True,
+             delay: float = None) -> str:
+        """Schedules the next attempt, or marks the entry dead once its attempts are used up."""
+        attempts = action["attempts"] + (1 if count_attempt else 0)
+        if attempts >= action["max_attempts"]:
+            status, next_at = "dead", action["next_attempt_at"]
+        else:
+            status = "pending"
+            next_at = time.time() + (delay if delay is not None else self.policy.delay(attempts + 1))
+        self._update(action["id"], status, attempts=attempts, next_attempt_at=next_at, last_error=str(error)[:1000])
+        return status
+
+    def release(self, action_id: int = None, all_held: bool = False) -> int:
+        """Releases held (or dead) entries back to pending so the worker replays them."""
+        now_iso = datetime.now().isoformat()
+        with self._connect() as conn:
+            if all_held:
+                cur = conn.execute(
+                    "UPDATE actions SET status = 'pending', next_attempt_at = ?, updated_at = ? WHERE status = 'held'",
+                    (time.time(), now_iso)
+                )
+            else:
+                cur = conn.execute(
+                    "UPDATE actions SET status = 'pending', attempts = 0, next_attempt_at = ?, updated_at = ? "
+                    "WHERE id = ? AND status IN ('held', 'dead')",
+                    (time.time(), now_iso, action_id)
+                )
+        return cur.rowcount
+
+    def _update(self, action_id: int, status: str, **fields):
+        fields["status"] = status
+        fields["updated_at"] = datetime.now().isoformat()
+        fields["claimed_by"] = None
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE actions SET {assignments} WHERE id = ?", list(fields.values()) + [action_id])
+
+    def open_count(self, fingerprint: str) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) AS n FROM actions WHERE fingerprint = ? AND status != 'done'", (fingerprint,)
+            ).fetchone()
+        return row["n"]
+
+    def list(self, status: str = None, limit: int = 200) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    "SELECT * FROM actions WHERE status = ? ORDER BY id DESC LIMIT ?", (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM actions ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(r) for r in rows]
+
+    def stats(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM actions GROUP BY status").fetchall()
+        return {r["status"]: r["n"] for r in rows}
+
+
+class ReplayWorker:
+    """
+    Drains due queue entries with at most `concurrency` calls in flight.
+    When every queued call for a failure fingerprint has succeeded, the
+    fingerprint is marked resolved in the Failed Actions Queue.
+    """
+
+    def __init__(self, queue: ActionQueue = None, concurrency: int = None, batch_size: int = 100):
+        self.queue = queue or get_action_queue()
+        self.concurrency = concurrency or int(os.getenv("REPLAY_CONCURRENCY", "4"))
+        self.batch_size = batch_size
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+    def drain(self, max_batches: int = None) -> Dict[str, int]:
+        """Replays everything currently due. Returns counts by outcome."""
+        totals = {"done": 0, "pending": 0, "dead": 0}
+        batches = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="replay") as pool:
+            while max_batches is None or batches < max_batches:
+                actions = self.queue.claim(self.worker_id, self.batch_size)
+                if not actions:
+                    break
+                batches += 1
+                for outcome in pool.map(self._replay, actions):
+                    totals[outcome] += 1
+                self._settle({a["fingerprint"] for a in actions if a["fingerprint"]})
+
+        if batches:
+            logger.info(f"Replay: {totals['done']} done, {totals['pending']} rescheduled, {totals['dead']} dead")
+        return totals
+
+    def _replay(self, action: Dict[str, Any]) -> str:
+        try:
+            func = resolve_target(action["target"])
+            func(*json.loads(action["args"]), **json.loads(action["kwargs"]))
+        except CircuitOpenError as e:
+            # Not the call's fault; wait for the circuit without using up an attempt
+            return self.queue.fail(action, e, count_attempt=False, delay=max(e.retry_in, 1.0))
+        except Exception as e:
+            status = self.queue.fail(action, e)
+            if status == "dead":
+                logger.error(f"Replay of {action['target']} (queue id {action['id']}) gave up: {e}")
+            return status
+        self.queue.complete(action["id"])
+        return "done"
+
+    def _settle(self, fingerprints):
+        store = get_failure_store()
+        for fp in fingerprints:
+            if self.queue.open_count(fp) == 0:
+                store.set_status(fp, "resolved", "Replayed automatically")
+        if fingerprints:
+            store.render_queue(force=True)
+
+
+_queue: Optional[ActionQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_action_queue() -> ActionQueue:
+    """Process-wide queue, opened on first use."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ActionQueue()
+        return _queue
+
+
+def main():
+    """CLI: list / stats / release / replay."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Failed action replay queue")
+    sub = parser.add_subparsers(dest="command", required=True)
+    list_cmd = sub.add_parser("list")
+    list_cmd.add_argument("--status", choices=STATUSES)
+    sub.add_parser("stats")
+    release_cmd = sub.add_parser("release", help="Release held (banking) or dead entries for replay")
+    release_cmd.add_argument("id", nargs="?", type=int)
+    release_cmd.add_argument("--all-held", action="store_true")
+    replay_cmd = sub.add_parser("replay", help="Drain everything currently due")
+    replay_cmd.add_argument("--concurrency", type=int)
+    args = parser.parse_args()
+
+    queue = get_action_queue()
+    if args.command == "list":
+        for a in queue.list(status=args.status):
+            print(f"{a['id']:>6}  {a['status']:<7} {a['attempts']}/{a['max_attempts']}  {a['target']}  {a['last_error'] or ''}")
+    elif args.command == "stats":
+        print(json.dumps(queue.stats(), indent=2))
+    elif args.command == "release":
+        if args.id is None and not args.all_held:
+            parser.error("release needs an id or --all-held")
+        print(f"Released {queue.release(args.id, all_held=args.all_held)} entries")
+    elif args.command == "replay":
+        logging.basicConfig(level=logging.INFO)
+        print(json.dumps(ReplayWorker(queue, concurrency=args.concurrency).drain(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
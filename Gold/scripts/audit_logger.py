@@ -5,11 +5,14 @@ import os
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
+from .utils.tracing import current_trace_ids
+from .utils.metrics import histogram
 
 load_dotenv()
 
 LOG_DIR = Path("AI_Employee_Vault/Logs")
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+WRITE_SECONDS = histogram("audit_write_seconds", "Time to append one audit entry", ["logger"])
 
 class AuditLogger:
     def __init__(self, name):
@@ -18,9 +21,10 @@ class AuditLogger:
         
         # Create a file handler for JSON logs
         today = datetime.now().strftime("%Y-%m-%d")
+        LOG_DIR.mkdir(parents=True, exist_ok=True)
         log_file = LOG_DIR / f"{today}_audit.jsonl"
         
-        handler = logging.FileHandler(log_file)
+        handler = logging.FileHandler(log_file, delay=True)  # Opened on the first entry
         formatter = logging.Formatter('%(message)s')
         handler.setFormatter(formatter)
         self.logger.addHandler(handler)
@@ -39,11 +43,18 @@ class AuditLogger:
             "status": status,
             "details": details or {}
         }
-        self.logger.info(json.dumps(entry))
+        trace_ids = current_trace_ids()
+        if trace_ids:
+            entry["trace_id"] = trace_ids[0] if len(trace_ids) == 1 else list(trace_ids)
+        with WRITE_SECONDS.time(logger="action"):
+            self.logger.info(json.dumps(entry))
 
     def info(self, message):
         self.logger.info(json.dumps({"level": "INFO", "message": message, "timestamp": datetime.now().isoformat()}))
 
+    def warning(self, message):
+        self.logger.warning(json.dumps({"level": "WARNING", "message": message, "timestamp": datetime.now().isoformat()}))
+
     def error(self, message, exc_info=None):
         self.logger.error(json.dumps({"level": "ERROR", "message": message, "timestamp": datetime.now().isoformat()}), exc_info=exc_info)
 
@@ -2,23 +2,33 @@
 import logging
 import os
 import time
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
 
+from .utils.event_bus import publish
+from .utils.tracing import new_trace_id, record_span
+from .utils.metrics import counter, histogram
+
 # Assuming all these are located relative to the script execution or absolute
 VAULT_PATH = Path("AI_Employee_Vault")
 NEEDS_ACTION_PATH = VAULT_PATH / "Needs_Action"
 LOGS_PATH = VAULT_PATH / "Logs"
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+POLL_SECONDS = histogram("watcher_poll_seconds", "Time spent checking a source for updates", ["watcher"])
+UPDATES = counter("watcher_updates_total", "Updates found by watchers", ["watcher"])
+ERRORS = counter("watcher_errors_total", "Failed polls and updates that could not be processed", ["watcher"])
 
 class BaseWatcher(ABC):
     def __init__(self, check_interval: int = 60, dry_run: bool = False):
         self.check_interval = check_interval
         self.dry_run = dry_run
         self.logger = logging.getLogger(self.__class__.__name__)
+        self._poll_started = None  # Start of the current poll; the "watch" span of each task begins here
+        self.stop_event = threading.Event()
         
         # Ensure directories exist
         NEEDS_ACTION_PATH.mkdir(parents=True, exist_ok=True)
@@ -35,25 +45,37 @@ class BaseWatcher(ABC):
         pass
 
     def run(self):
+        # Logging is configured by the running watcher, not at import
+        logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
         self.logger.info(f"Starting {self.__class__.__name__} (Interval: {self.check_interval}s, Dry Run: {self.dry_run})")
-        while True:
+        watcher = self.__class__.__name__
+        while not self.stop_event.is_set():
             try:
-                updates = self.check_for_updates()
+                self._poll_started = time.time()
+                with POLL_SECONDS.time(watcher=watcher):
+                    updates = self.check_for_updates()
                 if updates:
                     self.logger.info(f"Found {len(updates)} updates.")
+                    UPDATES.inc(len(updates), watcher=watcher)
                     for update in updates:
                         try:
                             file_path = self.process_update(update)
                             if file_path:
                                 self.logger.info(f"Created task file: {file_path}")
                         except Exception as e:
+                            ERRORS.inc(watcher=watcher)
                             self.logger.error(f"Error processing update: {e}", exc_info=True)
                 else:
                     self.logger.debug("No updates found.")
             except Exception as e:
+                ERRORS.inc(watcher=watcher)
                 self.logger.error(f"Watcher loop error: {e}", exc_info=True)
             
-            time.sleep(self.check_interval)
+            self.stop_event.wait(self.check_interval)
+
+    def stop(self):
+        """Ends `run()` after the current poll (for watchers run on a thread, e.g. by the pipeline benchmark)."""
+        self.stop_event.set()
 
     def create_task_file(self, title: str, content: str, priority: str = "Medium", tags: list = None) -> Path:
         """Helper to create a standardized markdown task file."""
@@ -63,6 +85,7 @@ class BaseWatcher(ABC):
         file_path = NEEDS_ACTION_PATH / filename
 
         tag_str = " ".join([f"#{t}" for t in (tags or [])])
+        trace_id = new_trace_id()
         
         file_content = f"""---
 title: {title}
@@ -71,6 +94,7 @@ priority: {priority}
 status: To Do
 tags: {tag_str}
 source: {self.__class__.__name__}
+trace_id: {trace_id}
 ---
 
 # {title}
@@ -86,5 +110,8 @@ Generated by {self.__class__.__name__}
         
         with open(file_path, "w", encoding="utf-8") as f:
             f.write(file_content)
+        record_span("watch", trace_id, self._poll_started or time.time(), source=self.__class__.__name__, task=filename)
+        publish("task", {"task": filename, "from": None, "to": "Needs_Action", "agent": self.__class__.__name__,
+                         "trace_id": trace_id})
         
         return file_path
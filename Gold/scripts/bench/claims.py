@@ -0,0 +1,140 @@
+# scripts/bench/claims.py
+"""
+Task claiming under contention.
+
+Starts `--agents` processes that all race to claim the same `--tasks` files from
+a scratch Needs_Action folder, the way several processors share one vault, and
+reports claims per second, the share of claim attempts lost to another agent and
+whether every task ended up with exactly one owner.
+
+    python -m scripts.bench.claims --agents 8 --tasks 2000
+    python -m scripts.bench.claims --agents 8 --tasks 2000 --partitioned   # consistent-hash shares
+    python -m scripts.bench.claims --legacy          # old check-then-move claim, for comparison
+"""
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing as mp
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict
+
+from scripts.task_lease import TaskLeaser
+from scripts.partitioning import Partitioner
+
+
+def legacy_claim(task_path: str, in_progress: str, agent: str):
+    """The processor's previous claim: look in every agent folder, then shutil.move."""
+    name = os.path.basename(task_path)
+    for agent_dir in glob.glob(os.path.join(in_progress, "*")):
+        if os.path.exists(os.path.join(agent_dir, name)):
+            return None
+    dest = os.path.join(in_progress, agent, name)
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    try:
+        shutil.move(task_path, dest)
+    except (FileNotFoundError, OSError):
+        return None
+    return dest
+
+
+def agent_worker(agent: str, needs_action: str, in_progress: str, legacy: bool, partitioned: bool,
+                 start, results):
+    leaser = None if legacy else TaskLeaser(needs_action, in_progress, agent)
+    partitioner = Partitioner(in_progress, agent) if partitioned else None
+    claimed, lost = [], 0
+    start.wait()
+    began = time.perf_counter()
+    # Keep scanning like the processor does until the backlog is gone (stolen work shows up on later passes)
+    while True:
+        tasks = glob.glob(os.path.join(needs_action, "*.md"))
+        if not tasks:
+            break
+        tasks = partitioner.assign(tasks) if partitioner else sorted(tasks)
+        for task in tasks:
+            dest = legacy_claim(task, in_progress, agent) if legacy else leaser.claim(task)
+            if dest:
+                claimed.append(os.path.basename(task))
+                # Processing is out of scope; release right away like a finished task
+                if leaser:
+                    leaser.release(dest)
+            else:
+                lost += 1
+    results.put({"agent": agent, "claimed": claimed, "lost": lost, "seconds": time.perf_counter() - began})
+
+
+def run_benchmark(agents: int, tasks: int, legacy: bool = False, partitioned: bool = False) -> Dict[str, Any]:
+    root = Path(tempfile.mkdtemp(prefix="claims-bench-"))
+    try:
+        needs_action, in_progress = root / "Needs_Action", root / "In_Progress"
+        needs_action.mkdir()
+        in_progress.mkdir()
+        for i in range(tasks):
+            (needs_action / f"TASK_{i:06d}.md").write_text(f"# Task {i}\n", encoding="utf-8")
+
+        names = [f"Agent_{n}" for n in range(agents)]
+        if partitioned:
+            # Every agent is on the ring before the race starts
+            for name in names:
+                Partitioner(in_progress, name).beat()
+        start, results = mp.Event(), mp.Queue()
+        procs = [
+            mp.Process(target=agent_worker,
+                       args=(name, str(needs_action), str(in_progress), legacy, partitioned, start, results))
+            for name in names
+        ]
+        for p in procs:
+            p.start()
+        began = time.perf_counter()
+        start.set()
+        per_agent = [results.get() for _ in procs]
+        elapsed = time.perf_counter() - began
+        for p in procs:
+            p.join()
+
+        owners = Counter(name for r in per_agent for name in r["claimed"])
+        on_disk = Counter(p.name for p in in_progress.glob("*/*.md"))
+        attempts = sum(len(r["claimed"]) + r["lost"] for r in per_agent)
+        lost = sum(r["lost"] for r in per_agent)
+        return {
+            "mode": ("legacy" if legacy else "lease") + ("+partitioned" if partitioned else ""),
+            "agents": agents,
+            "tasks": tasks,
+            "seconds": round(elapsed, 3),
+            "claims_per_sec": round(sum(owners.values()) / elapsed, 1) if elapsed else None,
+            "conflict_rate": round(lost / attempts, 4) if attempts else 0.0,
+            "double_claims": sum(1 for c in owners.values() if c > 1),
+            "unclaimed": tasks - len(owners),
+            "files_in_progress": sum(on_disk.values()),
+            "left_in_needs_action": len(list(needs_action.glob("*.md"))),
+            "exactly_once": len(owners) == tasks and all(c == 1 for c in owners.values()),
+            "per_agent": {r["agent"]: len(r["claimed"]) for r in per_agent},
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent task claiming.")
+    parser.add_argument("--agents", type=int, default=4)
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--legacy", action="store_true", help="Use the old check-then-move claim")
+    parser.add_argument("--partitioned", action="store_true", help="Each agent only claims its consistent-hash share")
+    parser.add_argument("--output", help="Also write the JSON report here")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.agents, args.tasks, args.legacy, args.partitioned)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["exactly_once"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,492 @@
+# scripts/bench/pipeline.py
+"""
+End-to-end pipeline throughput benchmark.
+
+Generates synthetic emails, bank CSV rows and WhatsApp chats at fixed rates into
+a scratch vault and runs the real pipeline against them in one process:
+
+    watchers (Gmail over a fake IMAP server, FinanceWatcher on the CSV, WhatsApp
+    on a fake Web page) -> ReasoningEngine -> auto-approver -> Odoo / social
+    approval handlers (a fake Odoo JSON-RPC server; Meta/X run non-dry)
+
+Each synthetic item carries a `BENCH-nnnnnn` ID through titles, plans and
+approval files, so its progress is timed per stage from the task events on the
+event bus and the files reaching Done. The report (JSON) has throughput,
+p50/p95/p99 per stage and end to end, and peak RSS.
+
+    python -m scripts.bench.pipeline --duration 30 --email-rate 2 --bank-rate 1 --whatsapp-rate 1
+    python -m scripts.bench.pipeline --json --output Logs/pipeline_bench.json
+"""
+import os
+import re
+import sys
+import csv
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import threading
+import contextlib
+from email.message import EmailMessage
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BENCH_ID = re.compile(r"BENCH-(\d{6})")
+VAULT_FOLDERS = ["Inbox", "Needs_Action", "In_Progress", "Plans", "Pending_Approval", "Approved", "Done",
+                 "Accounting", "Logs", "Alerts"]
+STAGES = ["watch", "plan", "approve", "execute", "total"]
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024, 1)
+
+
+# --- stand-ins for the outside world ---------------------------------
+
+class FakeOdoo(ThreadingHTTPServer):
+    """Minimal Odoo JSON-RPC endpoint: login, create, action_post, search_read."""
+    daemon_threads = True
+
+    def __init__(self, latency_ms: float = 0):
+        super().__init__(("127.0.0.1", 0), FakeOdooHandler)
+        self.latency = latency_ms / 1000
+        self.calls: Dict[str, int] = {}
+        self.next_id = 1
+        self.lock = threading.Lock()
+
+    def rpc(self, method: str, params: Dict[str, Any]) -> Any:
+        time.sleep(self.latency)
+        if method == "common/login":
+            return 1
+        name = params.get("method")
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            if name == "create":
+                vals = params["args"][0]
+                count = len(vals) if isinstance(vals, list) else 1
+                ids = list(range(self.next_id, self.next_id + count))
+                self.next_id += count
+                return ids if isinstance(vals, list) else ids[0]
+        if name == "search_read":
+            return []
+        return True
+
+
+class FakeOdooHandler(BaseHTTPRequestHandler):
+    server: FakeOdoo
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        body = json.dumps({"jsonrpc": "2.0", "id": request.get("id"),
+                           "result": self.server.rpc(request["method"], request["params"])}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeMailbox:
+    """Shared unread mailbox behind `FakeIMAP` (installed as imaplib.IMAP4_SSL)."""
+
+    def __init__(self):
+        self.unseen: Dict[bytes, bytes] = {}
+        self.next_id = 1
+        self.lock = threading.Lock()
+
+    def deliver(self, subject: str, body: str, sender: str = "client@example.com"):
+        msg = EmailMessage()
+        msg["Subject"], msg["From"] = subject, sender
+        msg.set_content(body)
+        with self.lock:
+            self.unseen[str(self.next_id).encode()] = msg.as_bytes()
+            self.next_id += 1
+
+    def imap(self, mailbox: "FakeMailbox" = None):
+        box = self
+
+        class FakeIMAP:
+            def __init__(self, host, *args, **kwargs):
+                pass
+
+            def login(self, user, password):
+                return "OK", [b"Logged in"]
+
+            def select(self, folder="INBOX"):
+                return "OK", [str(len(box.unseen)).encode()]
+
+            def search(self, charset, criterion):
+                with box.lock:
+                    return "OK", [b" ".join(box.unseen)]
+
+            def fetch(self, msg_id, parts):
+                with box.lock:
+                    raw = box.unseen.pop(msg_id)  # Fetching marks it seen
+                return "OK", [(msg_id + b" (RFC822)", raw), b")"]
+
+            def logout(self):
+                return "BYE", []
+
+        return FakeIMAP
+
+
+class FakeWhatsAppPage:
+    """Stands in for the Playwright page: unread chats show up once, then count as read."""
+
+    class _Node:
+        def __init__(self, text=None, children=None):
+            self.text, self.children = text, children or {}
+
+        def text_content(self):
+            return self.text
+
+        def query_selector(self, selector):
+            return self.children["title" if "title" in selector else "count"]
+
+    def __init__(self):
+        self.unread: List[Any] = []
+        self.lock = threading.Lock()
+
+    def add_chat(self, name: str, count: int = 1):
+        node = self._Node(children={"title": self._Node(name), "count": self._Node(str(count))})
+        with self.lock:
+            self.unread.append(node)
+
+    def query_selector_all(self, selector):
+        with self.lock:
+            chats, self.unread = self.unread, []
+        return chats
+
+
+# --- the benchmark ---------------------------------------------------
+
+class PipelineBenchmark:
+    def __init__(self, duration: float = 20, email_rate: float = 1, bank_rate: float = 1, whatsapp_rate: float = 1,
+                 poll: float = 0.25, odoo_latency_ms: float = 5, drain_timeout: float = 30):
+        self.duration = duration
+        self.rates = {"email": email_rate, "bank": bank_rate, "whatsapp": whatsapp_rate}
+        self.poll = poll
+        self.odoo_latency_ms = odoo_latency_ms
+        self.drain_timeout = drain_timeout
+        self.items: Dict[str, Dict[str, Any]] = {}   # bench id -> kind + stage timestamps
+        self.lock = threading.Lock()
+        self.stop = threading.Event()
+        self.counter = 0
+
+    # generators
+
+    def _new_item(self, kind: str) -> str:
+        with self.lock:
+            self.counter += 1
+            bench_id = f"BENCH-{self.counter:06d}"
+            self.items[bench_id] = {"kind": kind, "generated": time.time()}
+        return bench_id
+
+    def _mark(self, text: str, stage: str, when: float = None):
+        when = when or time.time()
+        with self.lock:
+            for bench_id in {f"BENCH-{n}" for n in BENCH_ID.findall(text)}:
+                item = self.items.get(bench_id)
+                if item is not None and stage not in item:
+                    item[stage] = when
+
+    def _generate(self, kind: str, emit):
+        rate = self.rates[kind]
+        if rate <= 0:
+            return
+        interval = 1.0 / rate
+        next_at = time.time()
+        while not self.stop.is_set() and time.time() < self.started + self.duration:
+            emit(self._new_item(kind))
+            next_at += interval
+            self.stop.wait(max(0.0, next_at - time.time()))
+
+    def _emit_email(self, bench_id: str):
+        self.mailbox.deliver(f"Invoice request {bench_id}", f"Hi, please send the invoice for $1500 ({bench_id}).")
+
+    def _emit_bank(self, bench_id: str):
+        with open(self.transactions, "a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow([time.strftime("%Y-%m-%d"), f"Late fee {bench_id}", "35.00", "Pending"])
+
+    def _emit_whatsapp(self, bench_id: str):
+        self.whatsapp_page.add_chat(f"Client invoice {bench_id}")
+
+    # pipeline stages that the orchestrator / a human would otherwise drive
+
+    def _loop(self, fn, name: str):
+        while not self.stop.is_set():
+            try:
+                fn()
+            except Exception as e:
+                self.errors.append(f"{name}: {e}")
+            self.stop.wait(self.poll)
+
+    def _auto_approve(self):
+        """Turns each new plan into approved Odoo (and, for chats, X) actions, like an operator would."""
+        plans_dir, approved = Path("AI_Employee_Vault/Plans"), Path("AI_Employee_Vault/Approved")
+        from scripts.utils.tracing import read_trace_ids
+        for plan in sorted(plans_dir.glob("PLAN_*.md")):
+            text = plan.read_text(encoding="utf-8")
+            ids = sorted(set(BENCH_ID.findall(text)))
+            trace_ids = read_trace_ids(text)
+            plan.unlink()
+            if not ids:
+                continue
+            tag = f"{ids[0]}_{len(ids)}"
+            details = {"invoice_ids": [int(n) for n in ids], "bench_ids": [f"BENCH-{n}" for n in ids]}
+            files = {approved / f"APPROVAL_post_invoices_{tag}.md": ("post_invoices", details)}
+            chats = [f"BENCH-{n}" for n in ids if self.items.get(f"BENCH-{n}", {}).get("kind") == "whatsapp"]
+            if chats:
+                files[approved / f"APPROVAL_post_twitter_{tag}.md"] = (
+                    "post_twitter", {"content": f"Invoices sent to {len(chats)} clients", "bench_ids": chats})
+            traces = f"trace_ids: [{', '.join(trace_ids)}]\n" if trace_ids else ""
+            for path, (action, payload) in files.items():
+                path.write_text(f"---\naction: {action}\ndetails: '{json.dumps(payload)}'\n{traces}---\n"
+                                f"{' '.join(payload['bench_ids'])}\n", encoding="utf-8")
+            self._mark(" ".join(f"BENCH-{n}" for n in ids), "approved")
+            self.pending_approvals.update({p.name: payload["bench_ids"] for p, (_, payload) in files.items()})
+
+    def _collect_done(self):
+        done = Path("AI_Employee_Vault/Done")
+        for name in list(self.pending_approvals):
+            if (done / name).exists():
+                ids = self.pending_approvals.pop(name)
+                with self.lock:
+                    # An item is executed once every approval it is part of has reached Done
+                    still_open = {i for ids_ in self.pending_approvals.values() for i in ids_}
+                    for bench_id in ids:
+                        if bench_id not in still_open:
+                            self.items[bench_id].setdefault("executed", time.time())
+
+    def _watch_events(self):
+        sub = self.bus.subscribe(["task"])
+        while not self.stop.is_set():
+            event = sub.get(timeout=0.5)
+            if not event:
+                continue
+            data = event["data"]
+            stage = {"Needs_Action": "watched", "In_Progress": "planned"}.get(data.get("to"))
+            if stage:
+                self._mark(data.get("task", ""), stage, event["ts"])
+        sub.close()
+
+    # setup / run
+
+    def _setup(self, root: Path):
+        os.chdir(root)
+        for folder in VAULT_FOLDERS:
+            (root / "AI_Employee_Vault" / folder).mkdir(parents=True, exist_ok=True)
+        self.transactions = root / "AI_Employee_Vault" / "Accounting" / "Bank_Transactions.csv"
+
+        self.odoo = FakeOdoo(self.odoo_latency_ms)
+        threading.Thread(target=self.odoo.serve_forever, daemon=True).start()
+        os.environ.update({
+            "ODOO_URL": f"http://127.0.0.1:{self.odoo.server_address[1]}", "ODOO_DB": "bench",
+            "ODOO_USER": "bench", "ODOO_PASSWORD": "bench", "DRY_RUN": "false",
+        })
+
+        # Host the event bus here so the pipeline's task events arrive in-process
+        from scripts.utils.event_bus import get_event_bus
+        self.bus = get_event_bus()
+        self.bus.listen(0)
+
+        import imaplib
+        self.mailbox = FakeMailbox()
+        imaplib.IMAP4_SSL = self.mailbox.imap()
+        self.whatsapp_page = FakeWhatsAppPage()
+
+    def _start_pipeline(self) -> List[threading.Thread]:
+        from scripts.gmail_watcher import GmailWatcher
+        from scripts.finance_watcher import FinanceWatcher
+        from scripts.whatsapp_watcher import WhatsAppWatcher
+        from scripts.reasoning.reasoning_engine import ReasoningEngine
+        from scripts.odoo_approval_handler import OdooApprovalHandler
+        from scripts.social_approval_handler import SocialApprovalHandler
+
+        whatsapp = WhatsAppWatcher(check_interval=self.poll)
+        whatsapp.page = self.whatsapp_page
+        watchers = [GmailWatcher(check_interval=self.poll), FinanceWatcher(check_interval=self.poll), whatsapp]
+        self.watchers = watchers
+        engine, odoo, social = ReasoningEngine(), OdooApprovalHandler(), SocialApprovalHandler()
+
+        def execute():
+            odoo.scan_approved()
+            social.scan_approved()
+
+        targets = [(w.run, type(w).__name__) for w in watchers] + [
+            (lambda: self._loop(engine.process, "reasoning"), "reasoning"),
+            (lambda: self._loop(self._auto_approve, "approver"), "approver"),
+            (lambda: self._loop(execute, "execution"), "execution"),
+            (lambda: self._loop(self._collect_done, "collector"), "collector"),
+            (self._watch_events, "events"),
+        ]
+        threads = [threading.Thread(target=fn, name=f"bench-{name}", daemon=True) for fn, name in targets]
+        for t in threads:
+            t.start()
+        return threads
+
+    def _teardown(self, threads: List[threading.Thread]):
+        """
+        Stops and joins every pipeline thread, then writes what the process still buffers.
+        Runs while the scratch vault is the cwd: the vault paths of the watchers and of the
+        tracer / dashboard / metrics flushers are relative, and would otherwise land in the
+        caller's vault (at exit, if not before).
+        """
+        self.stop.set()
+        for watcher in getattr(self, "watchers", []):
+            watcher.stop()
+        while threads:
+            t = threads.pop()
+            t.join(timeout=30)
+            if t.is_alive():
+                self.errors.append(f"{t.name} did not stop")
+
+        from scripts.dashboard import get_dashboard
+        from scripts.utils import metrics
+        from scripts.utils.tracing import get_tracer
+        get_tracer().flush()
+        get_dashboard().flush()
+        metrics.flush()
+
+        if getattr(self, "bus", None):
+            self.bus.close()
+        if getattr(self, "odoo", None) and not self.odoo_stopped:
+            self.odoo.shutdown()
+            self.odoo_stopped = True
+
+    def run(self) -> Dict[str, Any]:
+        cwd = os.getcwd()
+        root = Path(tempfile.mkdtemp(prefix="pipeline-bench-"))
+        self.errors: List[str] = []
+        self.pending_approvals: Dict[str, List[str]] = {}
+        threads: List[threading.Thread] = []
+        self.odoo_stopped = False
+        try:
+            self._setup(root)
+            threads += self._start_pipeline()
+            self.started = time.time()
+            generators = [
+                threading.Thread(target=self._generate, args=("email", self._emit_email), daemon=True),
+                threading.Thread(target=self._generate, args=("bank", self._emit_bank), daemon=True),
+                threading.Thread(target=self._generate, args=("whatsapp", self._emit_whatsapp), daemon=True),
+            ]
+            threads += generators
+            for g in generators:
+                g.start()
+            for g in generators:
+                g.join()
+            generated_until = time.time()
+
+            # Let the backlog drain
+            deadline = generated_until + self.drain_timeout
+            while time.time() < deadline and not all("executed" in i for i in self.items.values()):
+                time.sleep(0.1)
+            finished = time.time()
+            self._teardown(threads)
+
+            # Where the time went, from the pipeline's own spans (see scripts.utils.tracing)
+            from scripts.utils.tracing import breakdown, load_traces
+            self.trace_breakdown = breakdown(load_traces())
+            return self.report(finished - self.started)
+        finally:
+            self._teardown(threads)  # No-op after a completed run; stops a failed one
+            os.chdir(cwd)
+            shutil.rmtree(root, ignore_errors=True)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        with self.lock:
+            items = [dict(i) for i in self.items.values()]
+        stage_bounds = {
+            "watch": ("generated", "watched"), "plan": ("watched", "planned"),
+            "approve": ("planned", "approved"), "execute": ("approved", "executed"),
+            "total": ("generated", "executed"),
+        }
+        latency = {}
+        for stage, (start, end) in stage_bounds.items():
+            samples = [i[end] - i[start] for i in items if start in i and end in i]
+            latency[stage] = {
+                "count": len(samples),
+                **{f"p{int(q * 100)}_ms": round(percentile(samples, q) * 1000, 1) if samples else None
+                   for q in (0.5, 0.95, 0.99)},
+            }
+        completed = sum(1 for i in items if "executed" in i)
+        by_kind = {}
+        for i in items:
+            kind = by_kind.setdefault(i["kind"], {"generated": 0, "completed": 0})
+            kind["generated"] += 1
+            kind["completed"] += "executed" in i
+        return {
+            "config": {"duration_s": self.duration, "rates_per_s": self.rates, "poll_s": self.poll,
+                       "odoo_latency_ms": self.odoo_latency_ms},
+            "elapsed_s": round(elapsed, 2),
+            "generated": len(items),
+            "completed": completed,
+            "throughput_per_s": round(completed / elapsed, 2) if elapsed else None,
+            "by_source": by_kind,
+            "stage_latency": latency,
+            "critical_path": getattr(self, "trace_breakdown", {}),
+            "odoo_rpc_calls": dict(self.odoo.calls),
+            "peak_rss_mb": peak_rss_mb(),
+            "errors": self.errors[:20],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pipeline throughput benchmark.")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds of synthetic load")
+    parser.add_argument("--email-rate", type=float, default=1, help="Emails per second")
+    parser.add_argument("--bank-rate", type=float, default=1, help="Bank CSV rows per second")
+    parser.add_argument("--whatsapp-rate", type=float, default=1, help="WhatsApp chats per second")
+    parser.add_argument("--poll", type=float, default=0.25, help="Watcher / engine / handler poll interval")
+    parser.add_argument("--odoo-latency-ms", type=float, default=5, help="Added latency of the fake Odoo")
+    parser.add_argument("--drain-timeout", type=float, default=30, help="Max seconds to wait for the backlog")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report only")
+    parser.add_argument("--output", help="Also write the JSON report here")
+    parser.add_argument("--verbose", action="store_true", help="Show the pipeline's own logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr,
+                        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    bench = PipelineBenchmark(args.duration, args.email_rate, args.bank_rate, args.whatsapp_rate,
+                              args.poll, args.odoo_latency_ms, args.drain_timeout)
+    # Handlers print progress; keep stdout for the report
+    with contextlib.redirect_stdout(sys.stderr):
+        report = bench.run()
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{report['completed']}/{report['generated']} items in {report['elapsed_s']}s "
+              f"({report['throughput_per_s']}/s), peak RSS {report['peak_rss_mb']} MB")
+        print(f"{'stage':<10} {'n':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for stage in STAGES:
+            s = report["stage_latency"][stage]
+            print(f"{stage:<10} {s['count']:>6} {s['p50_ms'] or '-':>9} {s['p95_ms'] or '-':>9} {s['p99_ms'] or '-':>9}")
+        for error in report["errors"]:
+            print(f"error: {error}")
+    sys.exit(0 if report["completed"] == report["generated"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# scripts/bench/startup.py
+"""
+Import-time budget for the entry points.
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for each
+entry point and reports the module's own import cost (its package chain plus
+everything it pulls in), the slowest dependencies and which heavy libraries got
+loaded. Exits non-zero when an entry point is over budget or has regressed
+against a saved baseline.
+
+    python -m scripts.bench.startup                     # table, 200 ms budget
+    python -m scripts.bench.startup --json --output Logs/startup.json
+    python -m scripts.bench.startup --baseline Logs/startup.json --tolerance 0.2
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[2]
+
+ENTRY_POINTS = {
+    "orchestrator": "scripts.orchestrator",
+    "watchdog": "scripts.watchdog",
+    "gmail_watcher": "scripts.gmail_watcher",
+    "whatsapp_watcher": "scripts.whatsapp_watcher",
+    "finance_watcher": "scripts.finance_watcher",
+    "odoo_approval_handler": "scripts.odoo_approval_handler",
+    "social_approval_handler": "scripts.social_approval_handler",
+    "failure_store": "scripts.failure_store",
+    "action_queue": "scripts.action_queue",
+    "quarantine_store": "scripts.quarantine_store",
+    "odoo_mcp": "mcp.odoo.mcp_server",
+    "social_mcp": "mcp.social.social_mcp",
+    "ledger_mirror": "mcp.odoo.scripts.ledger_mirror",
+}
+
+# Libraries an entry point should only load once it actually needs them
+HEAVY_MODULES = ["requests", "playwright", "googleapiclient", "google_auth_oauthlib", "yaml", "psutil", "schedule"]
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """`import time: self | cumulative | name` lines -> [{name, depth, self_us, cumulative_us}]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Header line
+        raw_name = parts[2].rstrip()
+        name = raw_name.lstrip()
+        rows.append({
+            "name": name,
+            "depth": (len(raw_name) - len(name) - 1) // 2,
+            "self_us": int(parts[0]),
+            "cumulative_us": int(parts[1]),
+        })
+    return rows
+
+
+def measure(module: str) -> Dict[str, Any]:
+    """One cold import of `module` in a child interpreter."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(ROOT), os.getenv("PYTHONPATH")]))}
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=ROOT, env=env
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    rows = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        errors = [l for l in proc.stderr.splitlines() if not l.startswith("import time:")]
+        return {"error": errors[-1] if errors else f"exit {proc.returncode}", "wall_ms": round(wall_ms, 1)}
+
+    # The statement imports the package chain (`scripts`, `scripts.orchestrator`) at depth 0;
+    # everything the module pulls in is nested under those entries
+    chain = {".".join(module.split(".")[:i]) for i in range(1, module.count(".") + 2)}
+    import_us = sum(r["cumulative_us"] for r in rows if r["depth"] == 0 and r["name"] in chain)
+    loaded = {r["name"] for r in rows}
+    return {
+        "import_ms": round(import_us / 1000, 1),
+        "wall_ms": round(wall_ms, 1),
+        "modules": len(rows),
+        "heavy": sorted(m for m in HEAVY_MODULES if m in loaded),
+        "slowest": [
+            {"name": r["name"], "self_ms": round(r["self_us"] / 1000, 1)}
+            for r in sorted(rows, key=lambda r: r["self_us"], reverse=True)[:5]
+        ],
+    }
+
+
+def run_benchmark(entry_points: Dict[str, str], runs: int = 3, budget_ms: float = 200.0,
+                  baseline: Optional[Dict[str, Any]] = None, tolerance: float = 0.2) -> Dict[str, Any]:
+    """Median of `runs` cold imports per entry point, checked against the budget and baseline."""
+    results = {}
+    for name, module in entry_points.items():
+        samples = [measure(module) for _ in range(runs)]
+        failed = [s for s in samples if "error" in s]
+        if failed:
+            results[name] = {"module": module, "status": "error", "error": failed[0]["error"]}
+            continue
+        median = statistics.median(s["import_ms"] for s in samples)
+        result = {
+            "module": module,
+            "import_ms": median,
+            "wall_ms": statistics.median(s["wall_ms"] for s in samples),
+            "modules": samples[0]["modules"],
+            "heavy": samples[0]["heavy"],
+            "slowest": samples[0]["slowest"],
+            "status": "ok",
+        }
+        if median > budget_ms:
+            result["status"] = "over_budget"
+        previous = (baseline or {}).get("entry_points", {}).get(name, {}).get("import_ms")
+        if previous:
+            result["baseline_ms"] = previous
+            if median > previous * (1 + tolerance):
+                result["status"] = "regressed"
+        results[name] = result
+    return {
+        "python": sys.version.split()[0],
+        "budget_ms": budget_ms,
+        "runs": runs,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "entry_points": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Entry point import-time budget")
+    parser.add_argument("entry", nargs="*", help=f"Entry points to measure (default: all of {', '.join(ENTRY_POINTS)})")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=float(os.getenv("STARTUP_BUDGET_MS", "200")),
+                        help="Per entry point import budget in ms (STARTUP_BUDGET_MS)")
+    parser.add_argument("--baseline", help="Earlier --json output to check for regressions against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown vs. baseline (0.2 = 20%%)")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report instead of a table")
+    parser.add_argument("--output", help="Also write the JSON report here")
+    args = parser.parse_args()
+
+    unknown = [e for e in args.entry if e not in ENTRY_POINTS]
+    if unknown:
+        parser.error(f"Unknown entry points: {', '.join(unknown)}")
+    entry_points = {e: ENTRY_POINTS[e] for e in args.entry} if args.entry else ENTRY_POINTS
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")) if args.baseline else None
+
+    report = run_benchmark(entry_points, args.runs, args.budget, baseline, args.tolerance)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'entry point':<24} {'import ms':>10} {'wall ms':>9}  status       heavy / slowest")
+        for name, r in report["entry_points"].items():
+            if r["status"] == "error":
+                print(f"{name:<24} {'-':>10} {'-':>9}  error        {r['error']}")
+                continue
+            slowest = ", ".join(f"{s['name']} {s['self_ms']}" for s in r["slowest"][:3])
+            heavy = ",".join(r["heavy"]) or "-"
+            print(f"{name:<24} {r['import_ms']:>10} {r['wall_ms']:>9}  {r['status']:<12} {heavy} / {slowest}")
+
+    failing = [n for n, r in report["entry_points"].items() if r["status"] != "ok"]
+    sys.exit(1 if failing else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ import datetime
 import json
 from pathlib import Path
 from collections import defaultdict
+from mcp.odoo.scripts.ledger_mirror import LedgerMirror, LEDGER_DB
 
 # --- Configuration & Paths ---
 VAULT_PATH = Path("AI_Employee_Vault")
@@ -46,6 +47,7 @@ class CEOBriefingGenerator:
         self.transactions = []
         self.completed_tasks = []
         self.logs = []
+        self.ledger = None
         self.today = datetime.date.today()
         self.briefing_date = self.today.strftime("%Y-%m-%d")
 
@@ -90,6 +92,22 @@ class CEOBriefingGenerator:
                     except ValueError:
                         continue
 
+    def load_ledger_metrics(self):
+        """Reads revenue, overdue and cash-flow metrics from the local Odoo mirror (never the ERP)."""
+        if not LEDGER_DB.exists():
+            return
+        mirror = LedgerMirror()
+        if not mirror.has_data():
+            return
+        month_start = self.today.replace(day=1).isoformat()
+        today = self.today.isoformat()
+        self.ledger = {
+            'revenue': mirror.revenue_summary(month_start, today),
+            'overdue': mirror.overdue_invoices(today),
+            'cash_flow': mirror.cash_flow(month_start, today),
+            'synced_at': mirror.last_synced()
+        }
+
     def load_logs(self):
         """Loads recent logs for activity analysis."""
         cutoff = self.today - datetime.timedelta(days=30)
@@ -157,13 +175,33 @@ class CEOBriefingGenerator:
                 duplicates[item['category']].append(item['tool'])
         return {k: v for k, v in duplicates.items() if len(v) > 1}
 
+    def _render_ledger_section(self) -> str:
+        if not self.ledger:
+            return ""
+        cash = self.ledger['cash_flow']
+        overdue = self.ledger['overdue']
+        section = f"""### Receivables & Cash Flow (Odoo, synced {self.ledger['synced_at'][:16]})
+- **Cash In MTD**: ${cash['inbound']:,.2f}
+- **Cash Out MTD**: ${cash['outbound']:,.2f}
+- **Net Cash Flow**: ${cash['net']:,.2f}
+- **Overdue Invoices**: {len(overdue)} (${sum(inv['amount_residual'] for inv in overdue):,.2f} outstanding)
+"""
+        if overdue:
+            section += "\n| Invoice | Client | Due | Outstanding |\n|---------|--------|-----|-------------|\n"
+            for inv in overdue[:10]:
+                section += f"| {inv['name']} | {inv['partner_name'] or 'n/a'} | {inv['invoice_date_due']} | ${inv['amount_residual']:,.2f} |\n"
+        return section
+
     def generate_report(self):
         self.load_business_goals()
         self.load_accounting_data()
         self.load_logs()
+        self.load_ledger_metrics()
         
         # --- Metrics ---
         total_revenue = sum(t['amount'] for t in self.transactions if t['amount'] > 0)
+        if self.ledger:
+            total_revenue = self.ledger['revenue']['total_revenue']
         total_expenses = sum(abs(t['amount']) for t in self.transactions if t['amount'] < 0)
         
         target = self.goals.get('revenue_target', 10000.0) 
@@ -188,6 +226,7 @@ tags: #briefing #ceo
 - **Expenses MTD**: ${total_expenses:,.2f}
 - **Net Income**: ${total_revenue - total_expenses:,.2f}
 
+{self._render_ledger_section()}
 ## 2. Subscription Audit
 ### Active Subscriptions
 | Tool | Category | Cost | Usage Alert | Cost Alert |
@@ -0,0 +1,185 @@
+# scripts/dashboard.py
+"""
+Bounded, debounced renderer for `Dashboard.md`.
+
+The dashboard used to be an append-only log, so it grew forever and Obsidian
+re-rendered the whole file on every line. It is now a small page rewritten
+atomically from a ring buffer of the last `DASHBOARD_MAX_UPDATES` updates plus
+live KPIs: queue depth per vault folder, open failures from the failure store
+and revenue month-to-date from the Odoo ledger mirror. Bursts of updates are
+coalesced into at most one write per `DASHBOARD_MIN_INTERVAL` seconds, and a
+render whose content did not change is not written at all.
+"""
+import os
+import re
+import atexit
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .utils.event_bus import publish
+
+VAULT_PATH = Path("AI_Employee_Vault")
+DASHBOARD = VAULT_PATH / "Dashboard.md"
+MAX_UPDATES = int(os.getenv("DASHBOARD_MAX_UPDATES", "50"))
+MIN_INTERVAL = float(os.getenv("DASHBOARD_MIN_INTERVAL", "5"))
+
+# Folders whose depth is shown; Done is left out, it only ever grows
+QUEUE_FOLDERS = ["Inbox", "Needs_Action", "In_Progress", "Plans", "Pending_Approval", "Approved", "Quarantine"]
+
+UPDATE_LINE = re.compile(r"^- \[(?P<time>[^\]]+)\] (?P<summary>.*)$")
+
+logger = logging.getLogger("Dashboard")
+
+
+def count_tasks(folder: Path) -> int:
+    """Markdown files in `folder` and its direct subfolders (In_Progress keeps one per agent)."""
+    total = 0
+    try:
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith(".md"):
+                    total += 1
+                elif entry.is_dir() and not entry.name.startswith("."):
+                    with os.scandir(entry.path) as sub:
+                        total += sum(1 for e in sub if e.is_file() and e.name.endswith(".md"))
+    except FileNotFoundError:
+        pass
+    return total
+
+
+class DashboardRenderer:
+    def __init__(self, path: Path = DASHBOARD, vault: Path = VAULT_PATH, max_updates: int = MAX_UPDATES,
+                 min_interval: float = MIN_INTERVAL):
+        self.path = Path(path)
+        self.vault = Path(vault)
+        self.min_interval = min_interval
+        self.updates = deque(maxlen=max_updates)
+        self.counters: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+        self.rendered_at = 0.0
+        self.last_body = None
+        self.dirty = False
+        self.timer: Optional[threading.Timer] = None
+        self._seed_updates()
+
+    def _seed_updates(self):
+        # Keep the updates of the previous run (including an old unbounded dashboard's last lines)
+        if not self.path.exists():
+            return
+        for line in self.path.read_text(encoding="utf-8").splitlines():
+            match = UPDATE_LINE.match(line)
+            if match:
+                self.updates.append((match["time"], match["summary"]))
+
+    # --- inputs ------------------------------------------------------
+
+    def add_update(self, summary: str):
+        with self.lock:
+            self.updates.append((datetime.now().strftime("%Y-%m-%d %H:%M"), summary.replace("\n", " ")))
+        publish("dashboard", {"summary": summary})
+        self.request_render()
+
+    def set_counter(self, name: str, value: Any):
+        """Extra KPI kept in memory by the caller (e.g. 'Emails sent today')."""
+        with self.lock:
+            self.counters[name] = value
+        self.request_render()
+
+    def incr(self, name: str, delta: int = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + delta
+        self.request_render()
+
+    # --- rendering ---------------------------------------------------
+
+    def request_render(self):
+        """Renders now if the last write is old enough, otherwise once the interval has passed."""
+        with self.lock:
+            self.dirty = True
+            wait = self.rendered_at + self.min_interval - datetime.now().timestamp()
+            if wait > 0:
+                if self.timer is None:
+                    self.timer = threading.Timer(wait, self.flush)
+                    self.timer.daemon = True
+                    self.timer.start()
+                return
+        self.flush()
+
+    def flush(self) -> bool:
+        """Writes pending changes right away. Returns True if the file was rewritten."""
+        with self.lock:
+            self.timer = None
+            if not self.dirty:
+                return False
+            self.dirty = False
+            self.rendered_at = datetime.now().timestamp()
+            updates = list(self.updates)
+            counters = dict(self.counters)
+
+        body = self.render_body(self.kpis(), counters, updates)
+        if body == self.last_body:
+            return False
+        self.last_body = body
+        content = f"# Executive Dashboard\n\n_Updated {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}_\n\n{body}"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        return True
+
+    def kpis(self) -> Dict[str, Any]:
+        kpis = {f"queue.{name}": count_tasks(self.vault / name) for name in QUEUE_FOLDERS}
+        try:
+            from .failure_store import get_failure_store, FAILURE_DB
+            if FAILURE_DB.exists():
+                counts = get_failure_store().counts()
+                kpis["failures.open"] = counts.get("failed", 0) + counts.get("retrying", 0)
+        except Exception as e:
+            logger.debug(f"Failure counts unavailable: {e}")
+        try:
+            from mcp.odoo.scripts.ledger_mirror import LedgerMirror, LEDGER_DB
+            if LEDGER_DB.exists():
+                today = datetime.now().date()
+                summary = LedgerMirror().revenue_summary(today.replace(day=1).isoformat(), today.isoformat())
+                kpis["revenue.mtd"] = summary["total_revenue"]
+                kpis["revenue.currency"] = summary.get("currency", "USD")
+        except Exception as e:
+            logger.debug(f"Revenue unavailable: {e}")
+        return kpis
+
+    @staticmethod
+    def render_body(kpis: Dict[str, Any], counters: Dict[str, Any], updates: List[tuple]) -> str:
+        lines = ["## KPIs", "", "| Metric | Value |", "|---|---|"]
+        lines.append(f"| Approvals pending | {kpis.get('queue.Pending_Approval', 0)} |")
+        if "failures.open" in kpis:
+            lines.append(f"| Open failures | {kpis['failures.open']} |")
+        if "revenue.mtd" in kpis:
+            lines.append(f"| Revenue MTD | {kpis['revenue.mtd']:,.2f} {kpis['revenue.currency']} |")
+        for name, value in sorted(counters.items()):
+            lines.append(f"| {name} | {value} |")
+
+        lines += ["", "## Queue Depths", "", "| Folder | Tasks |", "|---|---|"]
+        for name in QUEUE_FOLDERS:
+            lines.append(f"| {name.replace('_', ' ')} | {kpis.get(f'queue.{name}', 0)} |")
+
+        lines += ["", "## Recent Updates", ""]
+        lines += [f"- [{when}] {summary}" for when, summary in updates] or ["_No updates yet._"]
+        return "\n".join(lines) + "\n"
+
+
+_dashboard: Optional[DashboardRenderer] = None
+_dashboard_lock = threading.Lock()
+
+
+def get_dashboard() -> DashboardRenderer:
+    """Process-wide renderer, created on first use; pending updates are written at exit."""
+    global _dashboard
+    with _dashboard_lock:
+        if _dashboard is None:
+            _dashboard = DashboardRenderer()
+            atexit.register(_dashboard.flush)
+        return _dashboard
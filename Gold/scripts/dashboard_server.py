@@ -0,0 +1,273 @@
+# scripts/dashboard_server.py
+"""
+Local live dashboard: pipeline state as JSON plus a server-sent event stream.
+
+    GET /             minimal page that renders /api/state and follows /events
+    GET /api/state    queue depths, per-stage latency, watcher health, recent audit entries
+    GET /events       SSE stream of bus events (task, audit, process, health, queues, ...)
+    GET /metrics      Prometheus text format, merged across processes (see utils/metrics.py)
+
+The orchestrator starts it on `DASHBOARD_PORT` (127.0.0.1 only; 0 turns it off)
+and hosts the event bus, so watchers and handlers in other processes publish to
+it directly. Browsers never touch the vault: queue depths are recounted here
+every `DASHBOARD_QUEUE_REFRESH` seconds and pushed only when they change.
+
+    python -m scripts.dashboard_server --port 8765
+"""
+import os
+import json
+import time
+import logging
+import threading
+import statistics
+from collections import OrderedDict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+from .dashboard import QUEUE_FOLDERS, count_tasks
+from .utils.event_bus import EventBus, get_event_bus, EVENT_BUS_PORT
+from .utils import metrics
+
+VAULT_PATH = Path("AI_Employee_Vault")
+TELEMETRY_FILE = VAULT_PATH / "Logs" / "process_telemetry.json"
+DASHBOARD_HOST = os.getenv("DASHBOARD_HOST", "127.0.0.1")
+DASHBOARD_PORT = int(os.getenv("DASHBOARD_PORT", "8765"))
+QUEUE_REFRESH = float(os.getenv("DASHBOARD_QUEUE_REFRESH", "2"))
+SSE_KEEPALIVE = 15
+LATENCY_SAMPLES = 500
+TRACKED_TASKS = 10000
+
+logger = logging.getLogger("DashboardServer")
+
+PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>AI Employee - Live</title>
+<style>body{font-family:sans-serif;margin:2em}pre{background:#f4f4f4;padding:1em}#log{height:20em;overflow:auto}</style>
+</head><body>
+<h1>AI Employee - Live Pipeline</h1>
+<h2>State</h2><pre id="state">loading...</pre>
+<h2>Events</h2><pre id="log"></pre>
+<script>
+const state = document.getElementById("state"), log = document.getElementById("log");
+const refresh = () => fetch("/api/state").then(r => r.json()).then(s => state.textContent = JSON.stringify(s, null, 2));
+refresh();
+const es = new EventSource("/events");
+es.onmessage = e => {
+  const ev = JSON.parse(e.data);
+  log.textContent = `[${new Date(ev.ts * 1000).toLocaleTimeString()}] ${ev.topic} ${JSON.stringify(ev.data)}\\n` + log.textContent.slice(0, 20000);
+  refresh();
+};
+</script></body></html>
+"""
+
+
+class PipelineState:
+    """Live view of the pipeline built from bus events (plus a periodic queue recount)."""
+
+    def __init__(self, bus: EventBus, vault: Path = VAULT_PATH, telemetry: Callable[[], Dict[str, Any]] = None,
+                 recent_audit: int = 50):
+        self.bus = bus
+        self.vault = Path(vault)
+        self.telemetry = telemetry
+        self.queues: Dict[str, int] = {}
+        self.entered: "OrderedDict[str, tuple]" = OrderedDict()  # task -> (stage, entered_at)
+        self.latency: Dict[str, deque] = {}
+        self.audit = deque(maxlen=recent_audit)
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self.sub = bus.subscribe(["task", "audit"])
+
+    def start(self):
+        threading.Thread(target=self._consume, name="dashboard-state", daemon=True).start()
+        threading.Thread(target=self._count_queues, name="dashboard-queues", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self.sub.close()
+
+    def _consume(self):
+        while not self._stop.is_set():
+            event = self.sub.get(timeout=1)
+            if event:
+                self.apply(event)
+
+    def apply(self, event: Dict[str, Any]):
+        data = event["data"]
+        with self.lock:
+            if event["topic"] == "audit":
+                self.audit.append(data)
+            elif event["topic"] == "task" and data.get("task"):
+                task, stage = data["task"], data.get("to")
+                previous = self.entered.pop(task, None)
+                if previous:
+                    # Time the task spent in the stage it just left
+                    self.latency.setdefault(previous[0], deque(maxlen=LATENCY_SAMPLES)).append(event["ts"] - previous[1])
+                if stage and stage != "Done":
+                    self.entered[task] = (stage, event["ts"])
+                    if len(self.entered) > TRACKED_TASKS:
+                        self.entered.popitem(last=False)
+
+    def _count_queues(self):
+        while not self._stop.is_set():
+            queues = {name: count_tasks(self.vault / name) for name in QUEUE_FOLDERS + ["Alerts"]}
+            if queues != self.queues:
+                self.queues = queues
+                self.bus.publish("queues", queues, source="dashboard")
+            self._stop.wait(QUEUE_REFRESH)
+
+    def watchers(self) -> Dict[str, Any]:
+        if self.telemetry:
+            return self.telemetry()
+        try:
+            return json.loads((self.vault / "Logs" / TELEMETRY_FILE.name).read_text(encoding="utf-8"))["processes"]
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            latency = {}
+            for stage, samples in self.latency.items():
+                ordered = sorted(samples)
+                latency[stage] = {
+                    "count": len(ordered),
+                    "p50_s": round(statistics.median(ordered), 3),
+                    "p95_s": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+                    "max_s": round(ordered[-1], 3),
+                }
+            in_flight = {}
+            for stage, _ in self.entered.values():
+                in_flight[stage] = in_flight.get(stage, 0) + 1
+            audit = list(self.audit)
+        return {
+            "updated": time.time(),
+            "queues": self.queues,
+            "in_flight": in_flight,
+            "stage_latency": latency,
+            "watchers": self.watchers(),
+            "recent_audit": audit,
+        }
+
+
+class DashboardHandler(BaseHTTPRequestHandler):
+    server: "DashboardServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt, *args):
+        logger.debug(fmt % args)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/":
+            self._send(200, PAGE.encode("utf-8"), "text/html; charset=utf-8")
+        elif url.path == "/api/state":
+            self._send(200, json.dumps(self.server.state.snapshot(), default=str).encode("utf-8"), "application/json")
+        elif url.path == "/events":
+            self._stream(parse_qs(url.query).get("topic"))
+        elif url.path == "/metrics":
+            self._send(200, metrics.render().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8")
+        else:
+            self._send(404, b'{"error": "not found"}', "application/json")
+
+    def _send(self, code: int, body: bytes, content_type: str):
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, topics=None):
+        bus = self.server.bus
+        sub = bus.subscribe(topics)
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            self.wfile.write(b"retry: 2000\n\n")
+            last_id = self.headers.get("Last-Event-ID")
+            if last_id and last_id.isdigit():
+                for event in bus.since(int(last_id), topics):
+                    self._write_event(event)
+            self.wfile.flush()
+            while not self.server.stopping.is_set():
+                event = sub.get(timeout=SSE_KEEPALIVE)
+                if event is None:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    self._write_event(event)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client went away
+        finally:
+            sub.close()
+
+    def _write_event(self, event: Dict[str, Any]):
+        payload = json.dumps(event, default=str)
+        self.wfile.write(f"id: {event['id']}\nevent: message\ndata: {payload}\n\n".encode("utf-8"))
+
+
+class DashboardServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = DASHBOARD_PORT, host: str = DASHBOARD_HOST, vault: Path = VAULT_PATH,
+                 bus: EventBus = None, telemetry: Callable[[], Dict[str, Any]] = None):
+        super().__init__((host, port), DashboardHandler)
+        self.bus = bus or get_event_bus()
+        self.state = PipelineState(self.bus, vault, telemetry)
+        self.stopping = threading.Event()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "DashboardServer":
+        self.state.start()
+        threading.Thread(target=self.serve_forever, name="dashboard-http", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        self.state.stop()
+        self.shutdown()
+        self.server_close()
+
+
+def start_dashboard_server(port: int = DASHBOARD_PORT, bus_port: int = EVENT_BUS_PORT,
+                           telemetry: Callable[[], Dict[str, Any]] = None) -> Optional[DashboardServer]:
+    """Hosts the event bus and serves the dashboard; returns None if turned off or the port is taken."""
+    if not port:
+        return None
+    try:
+        get_event_bus().listen(bus_port)
+        server = DashboardServer(port, telemetry=telemetry).start()
+    except OSError as e:
+        logger.warning(f"Live dashboard not started: {e}")
+        return None
+    logger.info(f"Live dashboard at {server.url} (events on udp/{bus_port})")
+    return server
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve the live pipeline dashboard.")
+    parser.add_argument("--port", type=int, default=DASHBOARD_PORT)
+    parser.add_argument("--bus-port", type=int, default=EVENT_BUS_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    server = start_dashboard_server(args.port, args.bus_port)
+    if not server:
+        raise SystemExit(1)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,27 @@
 import os
 import time
-import shutil
 import functools
 import logging
 from pathlib import Path
 from datetime import datetime
 from typing import Callable, Any
+from .utils.circuit_breaker import CircuitOpenError
+from .failure_store import get_failure_store
+from .utils.metrics import counter
 
 VAULT_PATH = Path("AI_Employee_Vault")
 QUARANTINE_DIR = VAULT_PATH / "Quarantine"
 ALERTS_DIR = VAULT_PATH / "Alerts"
 LOGS_DIR = VAULT_PATH / "Logs"
-FAILED_QUEUE_FILE = ALERTS_DIR / "Failed_Actions_Queue.md"
+# Functions touching money are never retried automatically
+BANKING_TERMS = ["bank", "payment", "odoo", "invoice", "transfer"]
 
-# Configure logging for errors
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger("ErrorManager")
 
+RETRIES = counter("retry_attempts_total", "Retries made by with_backoff", ["function"])
+BACKOFF_SECONDS = counter("retry_backoff_seconds_total", "Time with_backoff spent sleeping between attempts", ["function"])
+RETRIES_EXHAUSTED = counter("retry_exhausted_total", "Calls that failed after every with_backoff attempt", ["function"])
+
 class ErrorManager:
     @staticmethod
     def is_auth_error(error: Exception) -> bool:
@@ -28,27 +30,42 @@ class ErrorManager:
         return any(term in err_msg for term in ["auth", "permission", "unauthorized", "login", "credentials", "401", "403"])
 
     @staticmethod
-    def with_backoff(max_retries: int = 3, base_delay: float = 1.0, exceptions: tuple = (Exception,)):
+    def is_banking_function(func_name: str) -> bool:
+        return any(term in func_name.lower() for term in BANKING_TERMS)
+
+    @staticmethod
+    def with_backoff(max_retries: int = 3, base_delay: float = 1.0, exceptions: tuple = (Exception,),
+                     replay: bool = True, banking: Callable[..., bool] = None):
         """
         Decorator for exponential backoff.
+        `replay=False` keeps a finally failed call out of the replay queue, for callers
+        whose input (e.g. an approval file) stays the source of truth. `banking(*args,
+        **kwargs)` decides per call whether it touches money; by default the function
+        name is checked.
         """
         def decorator(func: Callable):
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
+                replay_func = func if replay else None
+                is_banking = banking(*args, **kwargs) if banking else ErrorManager.is_banking_function(func.__name__)
                 # Banking safety check
-                func_name_lower = func.__name__.lower()
-                if any(term in func_name_lower for term in ["bank", "payment", "odoo", "invoice", "transfer"]):
+                if is_banking:
                     logger.warning(f"Safety: Skipping auto-retry for banking-related function '{func.__name__}'")
                     try:
                         return func(*args, **kwargs)
+                    except CircuitOpenError:
+                        raise
                     except exceptions as e:
-                        ErrorManager.handle_failure(func.__name__, e, args, kwargs)
+                        ErrorManager.handle_failure(func.__name__, e, args, kwargs, func=replay_func)
                         raise
 
                 delay = base_delay
                 for attempt in range(max_retries):
                     try:
                         return func(*args, **kwargs)
+                    except CircuitOpenError:
+                        # The connector is known to be down; retrying now cannot succeed
+                        raise
                     except exceptions as e:
                         if ErrorManager.is_auth_error(e):
                             logger.error(f"Critical Authentication Error in {func.__name__}: {e}")
@@ -56,47 +73,70 @@ class ErrorManager:
                             raise e
                         
                         if attempt == max_retries - 1:
+                            RETRIES_EXHAUSTED.inc(function=func.__name__)
                             logger.error(f"Function {func.__name__} failed after {max_retries} attempts.")
-                            ErrorManager.handle_failure(func.__name__, e, args, kwargs)
+                            ErrorManager.handle_failure(func.__name__, e, args, kwargs, func=replay_func)
                             raise e
                         
                         logger.warning(f"Attempt {attempt+1} failed for {func.__name__}: {e}. Retrying in {delay}s...")
+                        RETRIES.inc(function=func.__name__)
+                        BACKOFF_SECONDS.inc(delay, function=func.__name__)
                         time.sleep(delay)
                         delay *= 2
             return wrapper
         return decorator
 
     @staticmethod
-    def update_failure_queue(timestamp: str, func_name: str, error: str, report_link: str):
-        """Appends a failure entry to the central queue file."""
-        if not FAILED_QUEUE_FILE.exists():
-            FAILED_QUEUE_FILE.write_text("# 📋 Failed Actions Queue\n\n| Timestamp | Function | Error | Status | Report Link |\n|-----------|----------|-------|--------|-------------|\n")
-        
-        entry = f"| {timestamp} | {func_name} | {error} | 🔴 Failed | [View Report](./{report_link}) |\n"
-        with open(FAILED_QUEUE_FILE, "a", encoding="utf-8") as f:
-            f.write(entry)
-
-    @staticmethod
-    def handle_failure(func_name: str, error: Exception, args: tuple = None, kwargs: dict = None):
+    def handle_failure(func_name: str, error: Exception, args: tuple = None, kwargs: dict = None,
+                       func: Callable = None):
         """
-        Handles non-critical failures by logging and creating a failure report.
+        Handles non-critical failures: counts them per fingerprint and keeps one report
+        per fingerprint per window up to date, instead of one file per occurrence.
+        When `func` is given and the call is serializable, it is queued for replay.
         """
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        ts_filename = datetime.now().strftime("%Y%m%d_%H%M%S")
-        report_filename = f"FAILURE_{func_name}_{ts_filename}.md"
+        if isinstance(error, CircuitOpenError):
+            # One report when the circuit opened is enough; short-circuited calls add nothing
+            logger.debug(f"{func_name} short-circuited: {error}")
+            return
+
+        store = get_failure_store()
+        failure = store.record(func_name, error, args, kwargs)
+        queue_id = ErrorManager._queue_replay(func, args, kwargs, failure["fingerprint"]) if func else None
+        if not failure["render_report"]:
+            logger.debug(f"Failure {failure['fingerprint']} in {func_name} seen again (x{failure['count']})")
+            store.render_queue()
+            return
+
+        if failure["new_window"] or not failure["report_file"]:
+            window = datetime.fromtimestamp(failure["window_start"]).strftime("%Y%m%d_%H%M%S")
+            report_filename = f"FAILURE_{func_name}_{failure['fingerprint']}_{window}.md"
+        else:
+            report_filename = failure["report_file"]
         report_path = ALERTS_DIR / report_filename
+        if queue_id is None:
+            replay_step = "Manually retry the task if critical."
+        elif ErrorManager.is_banking_function(func_name):
+            replay_step = f"Banking action held for review; release it with `python -m scripts.action_queue release {queue_id}`."
+        else:
+            replay_step = f"Queued for automatic replay (queue id {queue_id}); see `python -m scripts.action_queue list`."
         
         content = f"""---
 type: failure_report
 severity: medium
 timestamp: {datetime.now().isoformat()}
 function: {func_name}
+fingerprint: {failure['fingerprint']}
+occurrences: {failure['window_count']}
+first_seen: {failure['first_seen']}
+last_seen: {failure['last_seen']}
 ---
 
 # ❌ Task Failure: {func_name}
 
 ## Error Details
+**Exception:** `{failure['exception']}`
 **Message:** `{str(error)}`
+**Occurrences:** {failure['window_count']} in this window ({failure['count']} total since {failure['first_seen'][:19]})
 
 ## Context
 - **Arguments:** `{args}`
@@ -105,13 +145,42 @@ function: {func_name}
 ## Recovery Steps
 1. Check network connectivity.
 2. Verify external API status.
-3. Manually retry the task if critical.
+3. {replay_step}
+4. Mark it handled: `python -m scripts.failure_store resolve {failure['fingerprint']}`
 """
-        with open(report_path, "w", encoding="utf-8") as f:
+        ALERTS_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = report_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
             f.write(content)
-        
-        ErrorManager.update_failure_queue(timestamp, func_name, str(error), report_filename)
-        logger.info(f"Created failure report: {report_path}")
+        tmp_path.replace(report_path)
+        store.mark_rendered(failure["fingerprint"], report_filename)
+
+        # A new fingerprint or window always shows up in the queue right away
+        store.render_queue(force=failure["new_window"])
+        logger.info(f"Updated failure report: {report_path}")
+
+    @staticmethod
+    def _queue_replay(func: Callable, args: tuple, kwargs: dict, fingerprint: str):
+        """Persists the failed call in the durable replay queue; returns its queue id or None."""
+        # Imported here: the queue module depends on this one
+        from .action_queue import get_action_queue
+        try:
+            queue_id = get_action_queue().enqueue(func, args, kwargs, fingerprint)
+        except Exception as e:
+            logger.error(f"Could not queue {func.__name__} for replay: {e}")
+            return None
+        if queue_id is not None and not ErrorManager.is_banking_function(func.__name__):
+            get_failure_store().set_status(fingerprint, "retrying")
+        return queue_id
+
+    @staticmethod
+    def resolve_failure(fingerprint: str, status: str = "resolved", note: str = None) -> bool:
+        """Updates a queued failure's status and refreshes the queue view."""
+        store = get_failure_store()
+        updated = store.set_status(fingerprint, status, note)
+        if updated:
+            store.render_queue(force=True)
+        return updated
 
     @staticmethod
     def handle_critical(func_name: str, error: Exception):
@@ -147,20 +216,13 @@ The system encountered an authentication or permission error and has paused rela
         logger.error(f"CRITICAL ALERT CREATED: {alert_path}")
 
     @staticmethod
-    def quarantine_file(file_path: Path, reason: str):
+    def quarantine_file(file_path: Path, reason: str, stage: str = None, error: Exception = None,
+                        release_to: Path = None):
         """
-        Moves a corrupted or unprocessable file to the Quarantine folder.
+        Moves a corrupted or unprocessable file into the content-addressed quarantine store.
+        `stage` names the pipeline step that rejected it (defaults to its folder);
+        `release_to` is where a release sends it back (defaults to where it was).
         """
-        if not file_path.exists():
-            return
-
-        QUARANTINE_DIR.mkdir(parents=True, exist_ok=True)
-        dest_path = QUARANTINE_DIR / file_path.name
-        shutil.move(file_path, dest_path)
-        
-        # Create metadata report
-        report_path = dest_path.with_suffix(".md.report")
-        with open(report_path, "w", encoding="utf-8") as f:
-            f.write(f"Quarantined on: {datetime.now().isoformat()}\nReason: {reason}\nOriginal Path: {file_path}")
-        
-        logger.warning(f"File quarantined: {file_path.name}. Reason: {reason}")
+        # Imported here to keep quarantine out of the import path of every ErrorManager user
+        from .quarantine_store import get_quarantine_store
+        return get_quarantine_store().quarantine(Path(file_path), reason, stage=stage, error=error, release_to=release_to)
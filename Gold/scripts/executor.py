@@ -6,6 +6,7 @@ import subprocess
 import sys
 import logging
 import re
+from pathlib import Path
 from logging.handlers import RotatingFileHandler
 from dotenv import load_dotenv
 import yaml # Import PyYAML
@@ -30,8 +31,14 @@ APPROVED_PATH = os.path.join(VAULT_PATH, "Approved")
 DONE_PATH = os.path.join(VAULT_PATH, "Done")
 
 from .error_manager import ErrorManager
+from .task_journal import get_task_journal
 
 from .utils.audit_logger import audit_logger
+from .utils.circuit_breaker import breaker_for, CircuitOpenError
+from .utils.tracing import read_trace_ids, record_wait, span, trace_context
+from .utils.metrics import histogram
+
+SCAN_SECONDS = histogram("approval_scan_seconds", "Duration of one scan of the Approved folder", ["handler"])
 
 # Paths to the action scripts
 SEND_EMAIL_SCRIPT = os.path.join(PROJECT_ROOT, ".claude", "skills", "gmail-send", "scripts", "send_email.py")
@@ -40,7 +47,21 @@ ODOO_SCRIPT = os.path.join(PROJECT_ROOT, ".claude", "skills", "odoo-accounting",
 META_SCRIPT = os.path.join(PROJECT_ROOT, ".claude", "skills", "meta-social", "scripts", "meta_social.py")
 X_SCRIPT = os.path.join(PROJECT_ROOT, ".claude", "skills", "x-twitter", "scripts", "x_twitter.py")
 
-@ErrorManager.with_backoff(max_retries=3, base_delay=2.0)
+def run_connector(connector, cmd):
+    """
+    Runs an action script behind its own circuit breaker; a non-zero exit counts as a failure.
+    The breaker is separate from the connector's API client breaker, which only trips on
+    transport errors: a script can exit non-zero on bad input with the service up.
+    """
+    with breaker_for(f"{connector}_script"), span("rpc", connector=connector):
+        subprocess.run(cmd, check=True)
+
+def is_banking_action(action_details):
+    """Banking is decided by the approved action, not by the generic executor function's name."""
+    return ErrorManager.is_banking_function(action_details.get('action') or '')
+
+# Not queued for replay: the approval file stays the source of truth for the action
+@ErrorManager.with_backoff(max_retries=3, base_delay=2.0, replay=False, banking=is_banking_action)
 def execute_action(action_details):
     """Executes the action specified in the approval file."""
     action = action_details.get('action')
@@ -63,7 +84,7 @@ def execute_action(action_details):
             if to and subject and body:
                 # Ensure body is a single string for subprocess call
                 body_str = body.replace('\n  ', '\n').strip()
-                subprocess.run([sys.executable, SEND_EMAIL_SCRIPT, to, subject, body_str])
+                run_connector("gmail", [sys.executable, SEND_EMAIL_SCRIPT, to, subject, body_str])
             else:
                 logger.error(f"Missing details for sending email: {action_details}")
 
@@ -72,7 +93,7 @@ def execute_action(action_details):
             if content:
                 # Ensure content is a single string for subprocess call
                 content_str = content.replace('\n  ', '\n').strip()
-                subprocess.run([sys.executable, POST_LINKEDIN_SCRIPT, content_str])
+                run_connector("linkedin", [sys.executable, POST_LINKEDIN_SCRIPT, content_str])
             else:
                 logger.error(f"Missing content for LinkedIn post: {action_details}")
 
@@ -80,7 +101,7 @@ def execute_action(action_details):
             client_id = action_details.get('client_id')
             amount = action_details.get('amount')
             if client_id and amount:
-                subprocess.run([sys.executable, ODOO_SCRIPT, str(client_id), str(amount)])
+                run_connector("odoo", [sys.executable, ODOO_SCRIPT, str(client_id), str(amount)])
             else:
                 logger.error(f"Missing details for Odoo invoice: {action_details}")
 
@@ -89,7 +110,7 @@ def execute_action(action_details):
             content = action_details.get('content')
             if content:
                 content_str = content.replace('\n  ', '\n').strip()
-                subprocess.run([sys.executable, META_SCRIPT, platform, content_str])
+                run_connector("meta", [sys.executable, META_SCRIPT, platform, content_str])
             else:
                 logger.error(f"Missing content for Meta post: {action_details}")
 
@@ -97,13 +118,16 @@ def execute_action(action_details):
             content = action_details.get('content')
             if content:
                 content_str = content.replace('\n  ', '\n').strip()
-                subprocess.run([sys.executable, X_SCRIPT, content_str])
+                run_connector("x", [sys.executable, X_SCRIPT, content_str])
             else:
                 logger.error(f"Missing content for X post: {action_details}")
         
         else:
             logger.error(f"Unknown action: {action_details}")
             
+    except CircuitOpenError:
+        # Connector is down; the approval stays in place for a later scan
+        raise
     except Exception as e:
         # Audit failure
         audit_logger.log(
@@ -115,22 +139,68 @@ def execute_action(action_details):
         )
         raise e
 
+def parse_approval_file(file_path):
+    """Returns the approval's front matter (action and its parameters) plus its trace ids, or None."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+    match = re.match(r'---\n(.*?)\n---', content, re.DOTALL)
+    if not match:
+        return None
+    try:
+        action_details = yaml.safe_load(match.group(1))
+    except yaml.YAMLError as e:
+        logger.error(f"Invalid front matter in {os.path.basename(file_path)}: {e}")
+        return None
+    if not isinstance(action_details, dict) or not action_details.get('action'):
+        return None
+    # YAML would read an all-digit id as a number; take them from the raw text
+    action_details.pop('trace_id', None)
+    action_details['trace_ids'] = read_trace_ids(content)
+    return action_details
+
 def move_to_done(file_path):
     """Moves a file to the Done directory."""
     done_file_path = os.path.join(DONE_PATH, os.path.basename(file_path))
     shutil.move(file_path, done_file_path)
     logger.info(f"Moved approval file {os.path.basename(file_path)} to Done.")
 
+@SCAN_SECONDS.time(handler="executor")
 def scan_approved_and_execute():
     """Scans the Approved directory and executes tasks."""
     logger.info(f"Scanning for approved tasks: {APPROVED_PATH}")
+    journal = get_task_journal(VAULT_PATH)
     for file_path in glob.glob(os.path.join(APPROVED_PATH, "*.md")):
         logger.info(f"Approved task found: {file_path}")
         
         action_details = parse_approval_file(file_path)
         if action_details:
-            execute_action(action_details)
-            move_to_done(file_path)
+            trace_ids = action_details.pop('trace_ids', [])
+            record_wait("approval_wait", file_path, trace_ids, action=action_details['action'])
+            try:
+                # A crash between executing and moving to Done must not execute the action twice
+                with journal.transition(os.path.basename(file_path), "Approved", "Done") as t, trace_context(trace_ids):
+                    if t.done("executed"):
+                        logger.info(f"{os.path.basename(file_path)} was already executed. Moving to Done.")
+                    else:
+                        try:
+                            with span("execute", action=action_details['action']):
+                                execute_action(action_details)
+                        except CircuitOpenError:
+                            raise
+                        except Exception as e:
+                            # Retries are used up (banking actions get none); rather than running it
+                            # again every scan, park the approval until someone releases it
+                            t.cancel()
+                            ErrorManager.quarantine_file(
+                                Path(file_path), f"Execution failed: {e}", stage="execution",
+                                error=e, release_to=Path(APPROVED_PATH)
+                            )
+                            continue
+                        t.effect("executed")
+                    move_to_done(file_path)
+            except CircuitOpenError as e:
+                logger.warning(f"Deferring {os.path.basename(file_path)}: {e}")
+                continue
         else:
             logger.error(f"Could not parse approval file: {file_path}")
 
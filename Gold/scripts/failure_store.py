@@ -0,0 +1,270 @@
+# scripts/failure_store.py
+import os
+import re
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+VAULT_PATH = Path("AI_Employee_Vault")
+ALERTS_DIR = VAULT_PATH / "Alerts"
+FAILURE_DB = ALERTS_DIR / "failed_actions.db"
+FAILED_QUEUE_FILE = ALERTS_DIR / "Failed_Actions_Queue.md"
+
+STATUSES = ("failed", "retrying", "resolved", "ignored")
+STATUS_ICONS = {"failed": "🔴 Failed", "retrying": "🟡 Retrying", "resolved": "🟢 Resolved", "ignored": "⚪ Ignored"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS failures (
+    fingerprint TEXT PRIMARY KEY,
+    function TEXT NOT NULL,
+    exception TEXT NOT NULL,
+    template TEXT NOT NULL,
+    last_message TEXT,
+    last_args TEXT,
+    last_kwargs TEXT,
+    count INTEGER NOT NULL DEFAULT 0,
+    window_count INTEGER NOT NULL DEFAULT 0,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    window_start REAL,
+    status TEXT NOT NULL DEFAULT 'failed',
+    note TEXT,
+    report_file TEXT,
+    report_rendered_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_failures_status ON failures (status, last_seen);
+"""
+
+# Variable parts of an error message, most specific first
+_TEMPLATE_PATTERNS = [
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}\b"), "<uuid>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<hex>"),
+    (re.compile(r"\b[0-9a-fA-F]{12,}\b"), "<id>"),
+    (re.compile(r"\d+(\.\d+)?"), "<n>"),
+]
+
+
+def message_template(message: str) -> str:
+    """Strips ids, numbers and quoted values so recurring errors share one template."""
+    for pattern, placeholder in _TEMPLATE_PATTERNS:
+        message = pattern.sub(placeholder, message)
+    return message[:200]
+
+
+def fingerprint(func_name: str, error: Exception) -> str:
+    key = f"{func_name}|{type(error).__name__}|{message_template(str(error))}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+
+
+class FailureStore:
+    """
+    Aggregated failure index in SQLite.
+
+    Failures are grouped by fingerprint (function, exception type, message template)
+    with total and per-window counts. Callers get back whether the fingerprint's report
+    is due for a (re-)render, so one report exists per fingerprint per window instead of
+    one per occurrence. `Failed_Actions_Queue.md` is rendered from here.
+    """
+
+    def __init__(self, db_path: Path = FAILURE_DB, window: float = None, refresh: float = None):
+        self.db_path = Path(db_path)
+        self.window = window if window is not None else float(os.getenv("FAILURE_REPORT_WINDOW", "3600"))
+        # Minimum gap between re-renders of the same report or of the queue view
+        self.refresh = refresh if refresh is not None else float(os.getenv("FAILURE_REPORT_REFRESH", "60"))
+        self.queue_rendered_at = 0.0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(self, func_name: str, error: Exception, args: tuple = None, kwargs: dict = None) -> Dict[str, Any]:
+        """
+        Counts one occurrence. Returns the fingerprint row plus `new_window` (a fresh
+        report file is due) and `render_report` (the report should be (re-)written now).
+        """
+        fp = fingerprint(func_name, error)
+        now = time.time()
+        now_iso = datetime.now().isoformat()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT * FROM failures WHERE fingerprint = ?", (fp,)).fetchone()
+            if row is None:
+                new_window = True
+            else:
+                # A fingerprint that was closed and comes back starts a new report
+                new_window = row["window_start"] is None or now - row["window_start"] >= self.window \
+                    or row["status"] in ("resolved", "ignored")
+
+            values = {
+                "last_message": str(error)[:1000],
+                "last_args": json.dumps(args, default=str) if args is not None else None,
+                "last_kwargs": json.dumps(kwargs, default=str) if kwargs is not None else None,
+                "last_seen": now_iso,
+            }
+            if row is None:
+                conn.execute(
+                    "INSERT INTO failures (fingerprint, function, exception, template, last_message, last_args, "
+                    "last_kwargs, count, window_count, first_seen, last_seen, window_start, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, 1, 1, ?, ?, ?, 'failed')",
+                    (fp, func_name, type(error).__name__, message_template(str(error)), values["last_message"],
+                     values["last_args"], values["last_kwargs"], now_iso, now_iso, now)
+                )
+            elif new_window:
+                conn.execute(
+                    "UPDATE failures SET last_message = ?, last_args = ?, last_kwargs = ?, last_seen = ?, "
+                    "count = count + 1, window_count = 1, window_start = ?, status = 'failed', note = NULL "
+                    "WHERE fingerprint = ?",
+                    (values["last_message"], values["last_args"], values["last_kwargs"], now_iso, now, fp)
+                )
+            else:
+                conn.execute(
+                    "UPDATE failures SET last_message = ?, last_args = ?, last_kwargs = ?, last_seen = ?, "
+                    "count = count + 1, window_count = window_count + 1 WHERE fingerprint = ?",
+                    (values["last_message"], values["last_args"], values["last_kwargs"], now_iso, fp)
+                )
+            row = dict(conn.execute("SELECT * FROM failures WHERE fingerprint = ?", (fp,)).fetchone())
+
+        rendered_at = row.get("report_rendered_at") or 0
+        row["new_window"] = new_window
+        row["render_report"] = new_window or now - rendered_at >= self.refresh
+        return row
+
+    def mark_rendered(self, fp: str, report_file: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE failures SET report_file = ?, report_rendered_at = ? WHERE fingerprint = ?",
+                (report_file, time.time(), fp)
+            )
+
+    def set_status(self, fp: str, status: str, note: str = None) -> bool:
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status: {status} (expected one of {', '.join(STATUSES)})")
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE failures SET status = ?, note = ? WHERE fingerprint = ?", (status, note, fp)
+            )
+        return cur.rowcount > 0
+
+    def get(self, fp: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM failures WHERE fingerprint = ?", (fp,)).fetchone()
+        return dict(row) if row else None
+
+    def list(self, status: str = None, limit: int = 200) -> List[Dict[str, Any]]:
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    "SELECT * FROM failures WHERE status = ? ORDER BY last_seen DESC LIMIT ?", (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM failures ORDER BY last_seen DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(r) for r in rows]
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS n FROM failures GROUP BY status").fetchall()
+        return {r["status"]: r["n"] for r in rows}
+
+    def render_queue(self, path: Path = FAILED_QUEUE_FILE, limit: int = 200, force: bool = False) -> bool:
+        """
+        Rewrites the queue view: open fingerprints first, then the most recent closed ones.
+        Throttled to once per `refresh` seconds unless `force`. Returns True if written.
+        """
+        now = time.time()
+        if not force and now - self.queue_rendered_at < self.refresh:
+            return False
+        self.queue_rendered_at = now
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT * FROM failures ORDER BY status IN ('resolved', 'ignored'), last_seen DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        counts = self.counts()
+
+        lines = [
+            "# 📋 Failed Actions Queue",
+            "",
+            f"_Updated {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} — "
+            + ", ".join(f"{counts.get(s, 0)} {s}" for s in STATUSES) + "_",
+            "",
+            "| Last Seen | Function | Error | Count | Status | Fingerprint | Report Link |",
+            "|-----------|----------|-------|-------|--------|-------------|-------------|",
+        ]
+        for r in rows:
+            error = f"{r['exception']}: {r['template']}".replace("|", "\\|")
+            report = f"[View Report](./{r['report_file']})" if r["report_file"] else "-"
+            lines.append(
+                f"| {r['last_seen'][:19].replace('T', ' ')} | {r['function']} | {error} | {r['count']} | "
+                f"{STATUS_ICONS.get(r['status'], r['status'])} | `{r['fingerprint']}` | {report} |"
+            )
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tmp_path.replace(path)
+        return True
+
+
+_store: Optional[FailureStore] = None
+_store_lock = threading.Lock()
+
+
+def get_failure_store() -> FailureStore:
+    """Process-wide store, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = FailureStore()
+        return _store
+
+
+def main():
+    """CLI: list / resolve / ignore / reopen / render."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Failed actions queue")
+    sub = parser.add_subparsers(dest="command", required=True)
+    list_cmd = sub.add_parser("list")
+    list_cmd.add_argument("--status", choices=STATUSES)
+    for name in ("resolve", "ignore", "reopen"):
+        cmd = sub.add_parser(name)
+        cmd.add_argument("fingerprint")
+        cmd.add_argument("--note")
+    sub.add_parser("render")
+    args = parser.parse_args()
+
+    store = get_failure_store()
+    if args.command == "list":
+        for r in store.list(status=args.status):
+            print(f"{r['fingerprint']}  {r['status']:<9} x{r['count']:<6} {r['function']}: {r['exception']}: {r['template']}")
+        return
+
+    if args.command in ("resolve", "ignore", "reopen"):
+        status = {"resolve": "resolved", "ignore": "ignored", "reopen": "failed"}[args.command]
+        if not store.set_status(args.fingerprint, status, args.note):
+            print(f"No failure with fingerprint {args.fingerprint}")
+            sys.exit(1)
+    store.render_queue(force=True)
+
+
+if __name__ == "__main__":
+    main()
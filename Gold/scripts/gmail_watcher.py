@@ -8,6 +8,7 @@ import logging
 from pathlib import Path
 from datetime import datetime
 from .base_watcher import BaseWatcher
+from .utils.circuit_breaker import breaker_for, CircuitOpenError
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -19,14 +20,22 @@ class GmailWatcher(BaseWatcher):
         self.email_pass = os.getenv("EMAIL_PASSWORD")
         self.server = "imap.gmail.com"
         self.processed_ids = set()
+        self.breaker = breaker_for("gmail")
 
     def check_for_updates(self):
         updates = []
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError as e:
+            self.logger.debug(f"Skipping IMAP check: {e}")
+            return updates
+
         try:
             # Connect to Gmail
             mail = imaplib.IMAP4_SSL(self.server)
             mail.login(self.email_user, self.email_pass)
             mail.select("inbox")
+            self.breaker.record_success()
 
             # Search for unread messages
             status, messages = mail.search(None, 'UNSEEN')
@@ -58,6 +67,7 @@ class GmailWatcher(BaseWatcher):
             mail.logout()
         except Exception as e:
             self.logger.error(f"Gmail IMAP Error: {e}")
+            self.breaker.record_failure(e)
         
         return updates
 
@@ -7,12 +7,19 @@ from pathlib import Path
 import shutil
 import logging
 from .audit_logger import logger
-from mcp.odoo.scripts.odoo_client import OdooClient
+from .error_manager import ErrorManager
+from .dashboard import get_dashboard
+from .utils.tracing import read_trace_ids, record_wait, span, trace_context
+from .utils.metrics import histogram
+from mcp.odoo.scripts.odoo_client import OdooClient, OdooRPCError
 
 VAULT_PATH = Path("AI_Employee_Vault")
 APPROVED = VAULT_PATH / "Approved"
 DONE = VAULT_PATH / "Done"
 LOGS = VAULT_PATH / "Logs"
+# Approvals owned by SocialApprovalHandler, which shares the Approved folder
+SOCIAL_ACTIONS = {"post_facebook", "post_instagram", "post_twitter"}
+SCAN_SECONDS = histogram("approval_scan_seconds", "Duration of one scan of the Approved folder", ["handler"])
 
 import yaml
 
@@ -22,51 +29,160 @@ class OdooApprovalHandler:
         self.logger = logger
         self.logger.info("Odoo Approval Handler Initialized.")
 
+    def _parse_approval(self, file_path: Path):
+        """Returns (action, details, trace_ids) from an approval file's YAML front matter, or None."""
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = f.read()
+        
+        # Extract action and details from YAML front matter
+        match = re.search(r'---\n(.*?)\n---', content, re.DOTALL)
+        if not match:
+            self.logger.error(f"No YAML metadata in {file_path.name}")
+            return None
+        
+        metadata = yaml.safe_load(match.group(1))
+        action = metadata.get('action')
+        details = metadata.get('details')
+        
+        # Handle cases where details might be a string (legacy/test mock)
+        if isinstance(details, str):
+            details = json.loads(details)
+        
+        return action, details or {}, read_trace_ids(content)
+
+    @SCAN_SECONDS.time(handler="odoo")
     def scan_approved(self):
-        """Scans the /Approved folder for Odoo actions."""
-        files = list(APPROVED.glob("APPROVAL_*.md"))
-        for file_path in files:
+        """
+        Scans the /Approved folder for Odoo actions.
+        All approvals found in one cycle are coalesced: every invoice posting goes out in a
+        single `action_post`, every payment in one batched create + post.
+        """
+        posts = []     # (file_path, [invoice_id, ...])
+        payments = []  # (file_path, [{"invoice_id", "amount", "journal_id"}, ...])
+        others = []    # (file_path, action)
+        traces = {}    # file_path -> trace ids carried by the approval
+
+        for file_path in sorted(APPROVED.glob("APPROVAL_*.md")):
             self.logger.info(f"Processing approved Odoo action: {file_path.name}")
-            
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            
-            # Extract action and details from YAML front matter
-            match = re.search(r'---\n(.*?)\n---', content, re.DOTALL)
-            if not match:
-                self.logger.error(f"No YAML metadata in {file_path.name}")
-                continue
-            
             try:
-                metadata = yaml.safe_load(match.group(1))
-                action = metadata.get('action')
-                details = metadata.get('details')
-                
-                # Handle cases where details might be a string (legacy/test mock)
-                if isinstance(details, str):
-                    details = json.loads(details)
-                
-                if not details:
-                    details = {}
-                
-                if action == "post_invoice":
-                    invoice_id = details.get("invoice_id")
-                    result = self.client.post_invoice(invoice_id)
-                    self.logger.log_action("post_invoice", "human", f"invoice_{invoice_id}", result)
-
-                elif action == "record_payment":
-                    invoice_id = details.get("invoice_id")
-                    amount = details.get("amount")
-                    # Assuming journal_id = 1 for now
-                    result = self.client.record_payment(invoice_id, amount, journal_id=1)
-                    self.logger.log_action("record_payment", "human", f"invoice_{invoice_id}", result)
-                
-                # Move to Done
-                shutil.move(file_path, DONE / file_path.name)
-                self.logger.info(f"Odoo action {action} completed for {file_path.name}")
-                
+                parsed = self._parse_approval(file_path)
             except Exception as e:
-                self.logger.error(f"Error executing approved Odoo action: {e}", exc_info=True)
+                self.logger.error(f"Error reading approved Odoo action {file_path.name}: {e}", exc_info=True)
+                # Unparseable approvals would otherwise be re-read every cycle
+                ErrorManager.quarantine_file(file_path, f"Unreadable Odoo approval: {e}", stage="odoo_approval", error=e)
+                continue
+            if not parsed:
+                continue
+
+            action, details, trace_ids = parsed
+            if action in SOCIAL_ACTIONS:
+                continue
+            traces[file_path] = trace_ids
+            record_wait("approval_wait", file_path, trace_ids, action=action)
+            if action == "post_invoice":
+                posts.append((file_path, [details.get("invoice_id")]))
+            elif action == "post_invoices":
+                posts.append((file_path, list(details.get("invoice_ids", []))))
+            elif action == "record_payment":
+                # Assuming journal_id = 1 for now
+                payments.append((file_path, [{
+                    "invoice_id": details.get("invoice_id"),
+                    "amount": details.get("amount"),
+                    "journal_id": details.get("journal_id", 1),
+                }]))
+            elif action == "record_payments":
+                payments.append((file_path, [{
+                    "invoice_id": p.get("invoice_id"),
+                    "amount": p.get("amount"),
+                    "journal_id": p.get("journal_id", 1),
+                } for p in details.get("payments", [])]))
+            else:
+                others.append((file_path, action))
+
+        if (posts or payments) and self.client.breaker.is_open():
+            # Odoo is down: leave the approvals in place until the circuit lets a trial call through
+            self.logger.info(f"Odoo circuit open; deferring {len(posts) + len(payments)} approvals")
+            posts, payments = [], []
+
+        if posts:
+            self._execute_posts(posts, traces)
+        if payments:
+            self._execute_payments(payments, traces)
+        for file_path, action in others:
+            self._complete(file_path, action)
+
+    def _execute_posts(self, posts, traces):
+        invoice_ids = [invoice_id for _, ids in posts for invoice_id in ids]
+        error = None
+        try:
+            # One batched call serves every trace in the batch
+            with trace_context([t for file_path, _ in posts for t in traces.get(file_path, [])]), \
+                    span("execute", action="post_invoices", invoices=len(invoice_ids)):
+                result = self.client.post_invoices(invoice_ids)
+        except Exception as e:
+            self.logger.error(f"Error posting {len(invoice_ids)} approved invoices: {e}", exc_info=True)
+            error = e
+        if error is not None:
+            # Split outside the except block so per-approval failures don't chain onto this traceback
+            self._split_failed_batch(posts, traces, error, self._execute_posts, "post invoices")
+            return
+
+        for file_path, ids in posts:
+            with trace_context(traces.get(file_path)):
+                for invoice_id in ids:
+                    item_result = {"status": result.get("status"), "invoice_id": invoice_id}
+                    self.logger.log_action("post_invoice", "human", f"invoice_{invoice_id}", item_result)
+            self._complete(file_path, "post_invoice")
+
+    def _execute_payments(self, payments, traces):
+        batch = [payment for _, items in payments for payment in items]
+        error = None
+        try:
+            with trace_context([t for file_path, _ in payments for t in traces.get(file_path, [])]), \
+                    span("execute", action="record_payments", payments=len(batch)):
+                result = self.client.record_payments(batch)
+        except Exception as e:
+            self.logger.error(f"Error recording {len(batch)} approved payments: {e}", exc_info=True)
+            error = e
+        if error is not None:
+            # Split outside the except block so per-approval failures don't chain onto this traceback
+            self._split_failed_batch(payments, traces, error, self._execute_payments, "record payments")
+            return
+
+        payment_ids = iter(result.get("payment_ids", []))
+        for file_path, items in payments:
+            with trace_context(traces.get(file_path)):
+                for payment in items:
+                    item_result = {"status": result.get("status"), "amount": payment["amount"]}
+                    payment_id = next(payment_ids, None)
+                    if payment_id is not None:
+                        item_result["payment_id"] = payment_id
+                    self.logger.log_action("record_payment", "human", f"invoice_{payment['invoice_id']}", item_result)
+            self._complete(file_path, "record_payment")
+
+    def _split_failed_batch(self, items, traces, error: Exception, execute, what: str):
+        """
+        Odoo runs a batched call all-or-nothing, so one bad approval fails the whole batch.
+        Retries each approval on its own; one that fails alone is quarantined, the rest complete.
+        Only Odoo rejecting the records themselves is split. Anything else (Odoo unreachable,
+        an open circuit, failed authentication) leaves the approvals for the next cycle.
+        """
+        if ErrorManager.is_auth_error(error):
+            return
+        if not (isinstance(error, OdooRPCError) and error.is_record_error()):
+            return
+        if len(items) > 1:
+            for item in items:
+                execute([item], traces)
+            return
+        file_path = items[0][0]
+        ErrorManager.quarantine_file(file_path, f"Odoo could not {what}: {error}", stage="odoo_approval", error=error)
+
+    def _complete(self, file_path: Path, action: str):
+        # Move to Done
+        shutil.move(file_path, DONE / file_path.name)
+        self.logger.info(f"Odoo action {action} completed for {file_path.name}")
+        get_dashboard().add_update(f"Odoo {action} completed ({file_path.name})")
 
     def run(self, interval=30):
         self.logger.info("Odoo Approval Handler started (polling mode).")
@@ -78,5 +194,6 @@ class OdooApprovalHandler:
             time.sleep(interval)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     handler = OdooApprovalHandler()
     handler.run()
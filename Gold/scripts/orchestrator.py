@@ -3,34 +3,39 @@ import os
 import sys
 import time
 import logging
-import subprocess
+import threading
 import schedule
 from pathlib import Path
 from datetime import datetime
-from dotenv import load_dotenv
+from functools import cached_property
 
-# Import Core Systems
-from scripts.reasoning.reasoning_engine import ReasoningEngine
-from scripts.odoo_approval_handler import OdooApprovalHandler
-from scripts.social_approval_handler import SocialApprovalHandler
-from scripts.ceo_briefing import CEOBriefingGenerator
+# Core systems are imported when first used (see the properties below), so importing
+# this module stays cheap; connectors and their HTTP stacks load on the first cycle
 from scripts.utils.audit_logger import audit_logger
 from scripts.error_manager import ErrorManager
+from scripts.retry_scheduler import RetryScheduler
+from scripts.supervisor import ProcessSupervisor
+from scripts.zygote import default_spawner
+from scripts.utils.circuit_breaker import breaker_states
+from scripts.utils.event_bus import publish
+from scripts.utils.metrics import clear_process_files
+
+LOGS_DIR = Path("AI_Employee_Vault/Logs")
+
+
+def configure_logging():
+    """Console plus Logs/orchestrator.log; called from main() rather than at import."""
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(LOGS_DIR / "orchestrator.log"),
+            logging.StreamHandler()
+        ],
+        force=True
+    )
 
-# Load Environment
-load_dotenv()
-DRY_RUN = os.getenv("DRY_RUN", "true").lower() == "true"
-LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-
-# Setup Logging
-logging.basicConfig(
-    level=LOG_LEVEL,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("AI_Employee_Vault/Logs/orchestrator.log"),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger("Orchestrator")
 
 class Orchestrator:
@@ -44,70 +49,99 @@ class Orchestrator:
 
     def __init__(self):
         self.running = True
-        self.watchers = {}
+        self._replay_thread = None
+        self.circuit_states = {}
         self.watcher_scripts = {
             "gmail": ["python", "-m", "scripts.gmail_watcher"],
             "whatsapp": ["python", "-m", "scripts.whatsapp_watcher"],
-            "finance": ["python", "-m", "scripts.finance_watcher"]
+            "finance": ["python", "-m", "scripts.finance_watcher"],
+            "ledger_sync": ["python", "-m", "mcp.odoo.scripts.ledger_mirror"]
         }
+        # Drains watcher output into Logs/processes/ and restarts them with backoff
+        self.supervisor = ProcessSupervisor(
+            self.watcher_scripts, on_event=self._on_process_event, spawn=default_spawner(self.watcher_scripts)
+        )
+        self.watchers = self.supervisor.processes
         
-        # Initialize Subsystems
-        self.reasoning = ReasoningEngine()
-        self.odoo_handler = OdooApprovalHandler()
-        self.social_handler = SocialApprovalHandler()
-        self.briefing_generator = CEOBriefingGenerator()
+        # Failed cycles are retried from the main loop instead of sleeping inside it
+        self.retries = RetryScheduler(
+            is_fatal=ErrorManager.is_auth_error,
+            on_fatal=ErrorManager.handle_critical,
+            on_exhausted=ErrorManager.handle_failure
+        )
         
         # Scheduler
         schedule.every().monday.at("08:00").do(self.run_weekly_audit)
         schedule.every(10).seconds.do(self.health_check)
+        schedule.every(int(os.getenv("REPLAY_INTERVAL", "60"))).seconds.do(self.replay_failed_actions)
+        schedule.every(int(os.getenv("DASHBOARD_REFRESH_INTERVAL", "30"))).seconds.do(self.refresh_dashboard)
+
+    # Subsystems are built on first use
+
+    @cached_property
+    def reasoning(self):
+        from scripts.reasoning.reasoning_engine import ReasoningEngine
+        return ReasoningEngine()
+
+    @cached_property
+    def odoo_handler(self):
+        from scripts.odoo_approval_handler import OdooApprovalHandler
+        return OdooApprovalHandler()
+
+    @cached_property
+    def social_handler(self):
+        from scripts.social_approval_handler import SocialApprovalHandler
+        return SocialApprovalHandler()
+
+    @cached_property
+    def briefing_generator(self):
+        from scripts.ceo_briefing import CEOBriefingGenerator
+        return CEOBriefingGenerator()
 
     def start_watchers(self):
         """Starts all perception agents (watchers) as subprocesses."""
         logger.info("Starting Perception Layer (Watchers)...")
-        for name, cmd in self.watcher_scripts.items():
-            self._start_process(name, cmd)
+        self.supervisor.start_all()
 
-    def _start_process(self, name, cmd):
-        try:
-            # Use separate process groups
-            proc = subprocess.Popen(
-                cmd, 
-                stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            self.watchers[name] = proc
-            logger.info(f"Started {name} (PID: {proc.pid})")
-            audit_logger.log("system_start", name, {"pid": proc.pid}, result="success")
-        except Exception as e:
-            logger.error(f"Failed to start {name}: {e}")
-            ErrorManager.handle_failure(f"start_{name}", e)
+    def _on_process_event(self, event, name, info):
+        publish("process", {"event": event, "name": name, **info})
+        if event == "started":
+            audit_logger.log("system_start", name, {"pid": info["pid"]}, result="success")
+        elif event == "exited":
+            logger.warning(f"Watcher died: {name} (Exit Code: {info['code']}, {info['reason']})")
+            if info.get("stderr_tail"):
+                logger.error(f"{name} Error Output: " + "\n".join(info["stderr_tail"]))
+            audit_logger.log("process_crash", name, {"exit_code": info["code"], "reason": info["reason"]}, result="failure")
+        elif event == "limit_exceeded":
+            audit_logger.log("process_limit", name, info, result="failure")
+        elif event == "start_failed":
+            ErrorManager.handle_failure(f"start_{name}", Exception(info["error"]))
 
     def health_check(self):
-        """Monitors watcher processes and restarts them if they fail."""
-        for name, proc in list(self.watchers.items()):
-            if proc.poll() is not None:
-                # Process has died
-                stdout, stderr = proc.communicate()
-                logger.warning(f"Watcher died: {name} (Exit Code: {proc.returncode})")
-                if stderr:
-                    logger.error(f"{name} Error Output: {stderr}")
-                
-                # Log failure
-                audit_logger.log("process_crash", name, {"exit_code": proc.returncode}, result="failure")
-                
-                # Restart
-                logger.info(f"Restarting {name}...")
-                self._start_process(name, self.watcher_scripts[name])
+        """Monitors watcher processes (exits, CPU/RSS limits) and restarts them with backoff."""
+        telemetry = self.supervisor.poll()
+        publish("health", telemetry)
+
+        self.check_circuits()
+
+    def check_circuits(self):
+        """Reports connector circuit breaker transitions (published by every process)."""
+        states = breaker_states()
+        for name, info in states.items():
+            state = info.get("state")
+            if self.circuit_states.get(name, "closed") != state:
+                log = logger.warning if state == "open" else logger.info
+                log(f"Connector {name} circuit is {state}" + (f": {info.get('last_error')}" if state == "open" else ""))
+                audit_logger.log("circuit_state", name, info, result="failure" if state == "open" else "success")
+            self.circuit_states[name] = state
+        return states
 
-    @ErrorManager.with_backoff(max_retries=3)
     def run_reasoning_cycle(self):
         """Triggers the Reasoning Engine to process Needs_Action -> Plans."""
-        try:
-            self.reasoning.process()
-        except Exception as e:
-            logger.error(f"Reasoning Cycle Failed: {e}")
-            raise e
+        # While a retry is queued, the scheduler owns the next attempt
+        if self.retries.is_pending("run_reasoning_cycle"):
+            return
+        self.retries.call("run_reasoning_cycle", self.reasoning.process, connector="reasoning")
 
     def run_approval_workflows(self):
         """Scans for approved tasks and executes them (MCP Layer)."""
@@ -125,6 +159,28 @@ class Orchestrator:
             logger.error(f"Social Handler Failed: {e}")
             ErrorManager.handle_failure("social_approval", e)
 
+    def replay_failed_actions(self):
+        """Drains due entries of the durable failed-action queue on a background thread, one drain at a time."""
+        if self._replay_thread and self._replay_thread.is_alive():
+            return  # A slow backlog must not hold up health checks and retries in the main loop
+        self._replay_thread = threading.Thread(target=self._drain_replays, name="replay-drain", daemon=True)
+        self._replay_thread.start()
+
+    def _drain_replays(self):
+        try:
+            from scripts.action_queue import ReplayWorker
+            ReplayWorker().drain(max_batches=5)
+        except Exception as e:
+            logger.error(f"Replay Failed: {e}")
+
+    def refresh_dashboard(self):
+        """Re-renders Dashboard.md so queue depths, failures and revenue stay current between updates."""
+        try:
+            from scripts.dashboard import get_dashboard
+            get_dashboard().request_render()
+        except Exception as e:
+            logger.error(f"Dashboard refresh failed: {e}")
+
     def run_weekly_audit(self):
         """Generates the CEO Briefing."""
         logger.info("Running Weekly CEO Audit...")
@@ -138,14 +194,25 @@ class Orchestrator:
 
     def run(self):
         """Main Orchestration Loop."""
-        logger.info(f"Orchestrator Started (DRY_RUN={DRY_RUN})")
+        dry_run = os.getenv("DRY_RUN", "true").lower() == "true"
+        logger.info(f"Orchestrator Started (DRY_RUN={dry_run})")
         
+        # Metric snapshots of an earlier run's workers would be summed into this one's
+        clear_process_files()
+
+        # Live dashboard (and /metrics); also hosts the event bus the other processes publish to
+        from scripts.dashboard_server import start_dashboard_server
+        self.dashboard = start_dashboard_server(telemetry=self.supervisor.telemetry)
+
         self.start_watchers()
         
         while self.running:
             try:
                 # 1. Perception Health Check
                 schedule.run_pending()
+
+                # Retries that have come due
+                self.retries.run_due()
                 
                 # 2. Reasoning (Brain)
                 self.run_reasoning_cycle()
@@ -153,8 +220,9 @@ class Orchestrator:
                 # 3. Action (Hands)
                 self.run_approval_workflows()
                 
-                # Pace the loop
-                time.sleep(5)
+                # Pace the loop, waking early for a due retry
+                next_retry = self.retries.next_due()
+                time.sleep(5 if next_retry is None else min(5, next_retry))
                 
             except KeyboardInterrupt:
                 logger.info("Stopping Orchestrator...")
@@ -166,12 +234,17 @@ class Orchestrator:
     def stop(self):
         """Graceful Shutdown."""
         self.running = False
-        for name, proc in self.watchers.items():
-            if proc.poll() is None:
-                logger.info(f"Terminating {name}...")
-                proc.terminate()
+        if getattr(self, "dashboard", None):
+            self.dashboard.stop()
+        self.supervisor.stop_all()
         sys.exit(0)
 
-if __name__ == "__main__":
+def main():
+    from dotenv import load_dotenv
+    load_dotenv()
+    configure_logging()
     orchestrator = Orchestrator()
     orchestrator.run()
+
+if __name__ == "__main__":
+    main()
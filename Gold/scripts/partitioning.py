@@ -0,0 +1,125 @@
+# scripts/partitioning.py
+"""
+Consistent-hash partitioning of Needs_Action across agents.
+
+Every live agent owns the tasks whose ID hashes onto its arc of a hash ring (with
+virtual nodes for an even spread), so agents stop racing each other for the same
+files. Agents announce themselves by touching `In_Progress/<agent>/.heartbeat`;
+when one joins or its heartbeat goes stale the ring is rebuilt and only the tasks
+on the affected arcs move. An agent whose own partition is empty steals from the
+tail of any partition that has backed up past `STEAL_THRESHOLD`. The lease claim
+(`task_lease.TaskLeaser`) stays the final arbiter, so a stale view of the ring can
+cost a lost claim but never a double claim.
+"""
+import os
+import time
+import bisect
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+HEARTBEAT_FILE = ".heartbeat"
+AGENT_TIMEOUT = float(os.getenv("AGENT_HEARTBEAT_TIMEOUT", "90"))
+VNODES = int(os.getenv("PARTITION_VNODES", "64"))
+STEAL_THRESHOLD = int(os.getenv("STEAL_THRESHOLD", "10"))
+
+logger = logging.getLogger("Partitioning")
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+def task_id(task_path) -> str:
+    """Task ID used for placement: the file name, which stays the same across folders."""
+    return Path(task_path).name
+
+
+class HashRing:
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = VNODES):
+        self.vnodes = vnodes
+        self.nodes = sorted(set(nodes))
+        points = sorted((_hash(f"{node}#{i}"), node) for node in self.nodes for i in range(vnodes))
+        self._keys = [p for p, _ in points]
+        self._owners = [n for _, n in points]
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._keys:
+            return None
+        i = bisect.bisect(self._keys, _hash(key)) % len(self._keys)
+        return self._owners[i]
+
+
+class Partitioner:
+    """One agent's view of the ring, refreshed from the heartbeat files on every `assign()`."""
+
+    def __init__(self, in_progress: Path, agent: str, timeout: float = AGENT_TIMEOUT,
+                 vnodes: int = VNODES, steal_threshold: int = STEAL_THRESHOLD):
+        self.in_progress = Path(in_progress)
+        self.agent = agent
+        self.timeout = timeout
+        self.vnodes = vnodes
+        self.steal_threshold = steal_threshold
+        self.heartbeat_path = self.in_progress / agent / HEARTBEAT_FILE
+        self.ring = HashRing([agent], vnodes)
+
+    def beat(self):
+        """Marks this agent alive; cheap enough to call once per task."""
+        try:
+            os.utime(self.heartbeat_path)
+        except FileNotFoundError:
+            self.heartbeat_path.parent.mkdir(parents=True, exist_ok=True)
+            self.heartbeat_path.touch()
+
+    def leave(self):
+        """Drops out of the ring right away instead of waiting for the heartbeat to expire."""
+        self.heartbeat_path.unlink(missing_ok=True)
+
+    def live_agents(self) -> List[str]:
+        now = time.time()
+        agents = {self.agent}
+        for hb in self.in_progress.glob(f"*/{HEARTBEAT_FILE}"):
+            try:
+                if now - hb.stat().st_mtime < self.timeout:
+                    agents.add(hb.parent.name)
+            except FileNotFoundError:
+                continue
+        return sorted(agents)
+
+    def refresh(self) -> HashRing:
+        agents = self.live_agents()
+        if agents != self.ring.nodes:
+            joined = sorted(set(agents) - set(self.ring.nodes))
+            left = sorted(set(self.ring.nodes) - set(agents))
+            logger.info(f"Rebalancing over {len(agents)} agent(s) (joined: {joined or '-'}, left: {left or '-'})")
+            self.ring = HashRing(agents, self.vnodes)
+        return self.ring
+
+    def partitions(self, tasks: Iterable) -> Dict[str, List]:
+        ring = self.refresh()
+        parts: Dict[str, List] = {node: [] for node in ring.nodes}
+        for task in tasks:
+            parts[ring.owner(task_id(task))].append(task)
+        return parts
+
+    def assign(self, tasks: Iterable) -> List:
+        """
+        The tasks this agent should try to claim, in order: its own partition, then
+        (only when that is empty) stolen tasks from backed-up partitions. Stealing
+        takes from the end of a partition while its owner works from the front.
+        """
+        self.beat()
+        parts = self.partitions(sorted(tasks, key=task_id))
+        mine = parts.pop(self.agent, [])
+        if mine:
+            return mine
+        stolen = []
+        for owner, backlog in sorted(parts.items(), key=lambda kv: -len(kv[1])):
+            excess = len(backlog) - self.steal_threshold
+            if excess <= 0:
+                break
+            take = backlog[-((excess + 1) // 2):]  # Half the excess, so owner and thief meet in the middle
+            logger.info(f"Stealing {len(take)} task(s) from {owner} (backlog {len(backlog)})")
+            stolen.extend(reversed(take))
+        return stolen
@@ -106,7 +106,7 @@ def parse_plan(plan_content):
             
     return actions if actions else None
 
-def create_approval_request(plan_file, action_details):
+def create_approval_request(plan_file, action_details, trace_ids=()):
     """Creates a file in the Pending_Approval directory for a single action."""
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f") # Add microseconds for more uniqueness
     action_type = action_details['action']
@@ -118,6 +118,9 @@ def create_approval_request(plan_file, action_details):
 action: {action_type}
 plan_file: {os.path.basename(plan_file)}
 """
+    if trace_ids:
+        # Carries the task's traces on to the executor
+        approval_content_header += f"trace_ids: [{', '.join(trace_ids)}]\n"
     approval_content_body = ""
 
     if action_type == 'send_email':
@@ -185,25 +188,48 @@ def move_plan_to_done(plan_file):
 
 IN_PROGRESS_PATH = os.path.join(VAULT_PATH, "In_Progress")
 AGENT_NAME = os.getenv("AGENT_NAME", "Agent_Local") # Default to Local
+# How often expired leases (crashed agents) are looked for
+RECLAIM_INTERVAL = float(os.getenv("TASK_RECLAIM_INTERVAL", "60"))
 
-def is_task_claimed(task_filename):
-    """Checks if a task is already being worked on by another agent."""
-    for agent_dir in glob.glob(os.path.join(IN_PROGRESS_PATH, "*")):
-        if os.path.exists(os.path.join(agent_dir, task_filename)):
-            return True
-    return False
+from .error_manager import ErrorManager
+from .task_lease import TaskLeaser
+from .partitioning import Partitioner
+from .task_journal import get_task_journal
+from .utils.tracing import read_trace_ids, span
+from pathlib import Path
+
+_leaser = None
+_partitioner = None
+_last_reclaim = 0.0
+
+def get_leaser():
+    global _leaser
+    if _leaser is None:
+        _leaser = TaskLeaser(NEEDS_ACTION_PATH, IN_PROGRESS_PATH, AGENT_NAME)
+        _leaser.start_heartbeat()
+    return _leaser
+
+def get_partitioner():
+    global _partitioner
+    if _partitioner is None:
+        _partitioner = Partitioner(IN_PROGRESS_PATH, AGENT_NAME)
+    return _partitioner
 
 def claim_task(task_path):
-    """Claims a task by moving it to the agent's In_Progress folder."""
-    agent_in_progress = os.path.join(IN_PROGRESS_PATH, AGENT_NAME)
-    os.makedirs(agent_in_progress, exist_ok=True)
-    task_filename = os.path.basename(task_path)
-    dest_path = os.path.join(agent_in_progress, task_filename)
-    shutil.move(task_path, dest_path)
-    return dest_path
+    """
+    Claims a task by atomically renaming it into the agent's In_Progress folder.
+    Returns the claimed path, or None if another agent claimed it first.
+    """
+    claimed = get_leaser().claim(task_path)
+    return str(claimed) if claimed else None
 
-from .error_manager import ErrorManager
-from pathlib import Path
+def reclaim_expired_tasks():
+    """Returns tasks of agents whose lease expired to Needs_Action (at most every RECLAIM_INTERVAL)."""
+    global _last_reclaim
+    if time.time() - _last_reclaim < RECLAIM_INTERVAL:
+        return []
+    _last_reclaim = time.time()
+    return get_leaser().reclaim()
 
 # ... (rest of imports)
 
@@ -212,36 +238,58 @@ def scan_plans_and_process():
     processed_plans = get_processed_plans()
     logger.info(f"Scanning for plans: {NEEDS_ACTION_PATH}")
 
-    for plan_file in glob.glob(os.path.join(NEEDS_ACTION_PATH, "*.md")):
+    for task in reclaim_expired_tasks():
+        logger.warning(f"Reclaimed {os.path.basename(task)} from an agent whose lease expired.")
+
+    leaser = get_leaser()
+    partitioner = get_partitioner()
+    journal = get_task_journal(VAULT_PATH)
+    # Only this agent's share of the ring (plus stolen work when it has none)
+    for plan_file in partitioner.assign(glob.glob(os.path.join(NEEDS_ACTION_PATH, "*.md"))):
         plan_filename = os.path.basename(plan_file)
+        partitioner.beat()
         
-        # Multi-agent coordination: Check if task is already claimed
-        if is_task_claimed(plan_filename):
+        # Multi-agent coordination: the atomic claim fails if another agent got there first
+        claimed_plan_path = claim_task(plan_file)
+        if not claimed_plan_path:
             logger.info(f"Task {plan_filename} already claimed by another agent. Skipping.")
             continue
-            
+
         logger.info(f"New plan found: {plan_file}")
-        
-        # Claim the task
-        claimed_plan_path = claim_task(plan_file)
+        journal.record(plan_filename, "Needs_Action", f"In_Progress/{AGENT_NAME}", agent=AGENT_NAME)
         
         try:
             with open(claimed_plan_path, 'r', encoding='utf-8') as f:
                 plan_content = f.read()
             
-            actions_to_take = parse_plan(plan_content)
+            trace_ids = read_trace_ids(plan_content)
+            with span("classify", trace_ids, task=plan_filename, agent=AGENT_NAME):
+                actions_to_take = parse_plan(plan_content)
             
-            if actions_to_take:
-                for action_details in actions_to_take:
-                    create_approval_request(claimed_plan_path, action_details)
-                move_plan_to_done(claimed_plan_path)
-            else:
-                logger.info(f"No specific actions found in plan: {plan_filename}. Moving to Done.")
+            # Journaled, so a retry after a crash or quarantine skips approvals already written
+            with journal.transition(plan_filename, "In_Progress", "Done", agent=AGENT_NAME) as t, \
+                    span("plan", trace_ids, task=plan_filename, agent=AGENT_NAME):
+                if actions_to_take:
+                    for i, action_details in enumerate(actions_to_take):
+                        step = f"approval:{i}:{action_details['action']}"
+                        if t.done(step):
+                            logger.info(f"Approval {step} for {plan_filename} already created. Skipping.")
+                            continue
+                        if create_approval_request(claimed_plan_path, action_details, trace_ids):
+                            t.effect(step)
+                else:
+                    logger.info(f"No specific actions found in plan: {plan_filename}. Moving to Done.")
                 move_plan_to_done(claimed_plan_path)
         except Exception as e:
             logger.error(f"Critical error processing plan {plan_filename}: {e}")
-            ErrorManager.quarantine_file(Path(claimed_plan_path), f"Plan Processing Error: {e}")
+            # Released plans go back to Needs_Action, not to this agent's In_Progress folder
+            ErrorManager.quarantine_file(
+                Path(claimed_plan_path), f"Plan Processing Error: {e}",
+                stage="plan_processing", error=e, release_to=NEEDS_ACTION_PATH
+            )
             ErrorManager.handle_failure("scan_plans_and_process", e, (plan_filename,))
+        finally:
+            leaser.release(claimed_plan_path)
 
 def main():
     """Main loop for the AI Employee processor."""
@@ -249,10 +297,14 @@ def main():
     os.makedirs(PENDING_APPROVAL_PATH, exist_ok=True)
     os.makedirs(DONE_PATH, exist_ok=True)
     
-    while True:
-        scan_plans_and_process()
-        logger.info(f"Waiting for 15 seconds before next scan...")
-        time.sleep(15)
+    try:
+        while True:
+            scan_plans_and_process()
+            logger.info(f"Waiting for 15 seconds before next scan...")
+            time.sleep(15)
+    finally:
+        # Let the other agents take over this partition without waiting for the heartbeat to expire
+        get_partitioner().leave()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,308 @@
+# scripts/quarantine_store.py
+import os
+import re
+import uuid
+import shutil
+import hashlib
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+VAULT_PATH = Path("AI_Employee_Vault")
+QUARANTINE_DIR = VAULT_PATH / "Quarantine"
+QUARANTINE_DB = QUARANTINE_DIR / "quarantine.db"
+INCOMING_DIR = QUARANTINE_DIR / ".incoming"
+
+logger = logging.getLogger("QuarantineStore")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    sha256 TEXT NOT NULL,
+    original_path TEXT NOT NULL,
+    original_name TEXT NOT NULL,
+    size INTEGER,
+    reason TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    exception TEXT,
+    release_dir TEXT,
+    quarantined_at TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'quarantined',
+    released_at TEXT,
+    released_to TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_stage ON entries (stage, quarantined_at);
+CREATE INDEX IF NOT EXISTS idx_entries_status ON entries (status, quarantined_at);
+CREATE INDEX IF NOT EXISTS idx_entries_sha ON entries (sha256);
+"""
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_since(value: str) -> str:
+    """Accepts an ISO date/time or a relative age like `7d`, `12h`, `30m`."""
+    match = re.fullmatch(r"(\d+)([dhm])", value.strip())
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        delta = {"d": timedelta(days=amount), "h": timedelta(hours=amount), "m": timedelta(minutes=amount)}[unit]
+        return (datetime.now() - delta).isoformat()
+    return datetime.fromisoformat(value).isoformat()
+
+
+class QuarantineStore:
+    """
+    Content-addressed quarantine with an SQLite index.
+
+    Blobs live at `Quarantine/<sha[:2]>/<sha><suffix>`, so identical files are stored
+    once and same-named files never clobber each other. Each quarantine event is an
+    index row (original path, reason, pipeline stage, exception, timestamps, status),
+    so triage is a query rather than a walk over sidecar files.
+    """
+
+    def __init__(self, root: Path = QUARANTINE_DIR, db_path: Path = None):
+        self.root = Path(root)
+        self.db_path = Path(db_path) if db_path else self.root / QUARANTINE_DB.name
+        self.incoming = self.root / INCOMING_DIR.name
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def blob_path(self, sha: str, suffix: str) -> Path:
+        return self.root / sha[:2] / f"{sha}{suffix}"
+
+    def quarantine(self, file_path: Path, reason: str, stage: str = None, error: Exception = None,
+                   release_to: Path = None) -> Optional[Dict[str, Any]]:
+        """
+        Moves `file_path` into the store and indexes it. Returns the entry, or None if the file is gone.
+        `release_to` is where a release puts it back (defaults to the folder it came from).
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            return None
+        stage = stage or file_path.parent.name or "unknown"
+
+        # Move out of the pipeline first so no other worker picks the file up while we hash it
+        self.incoming.mkdir(parents=True, exist_ok=True)
+        staged = self.incoming / f"{uuid.uuid4().hex}{file_path.suffix}"
+        shutil.move(str(file_path), staged)
+
+        sha = _hash_file(staged)
+        size = staged.stat().st_size
+        blob = self.blob_path(sha, file_path.suffix)
+        if blob.exists():
+            staged.unlink()  # Same content already stored
+        else:
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged, blob)
+
+        entry = {
+            "sha256": sha,
+            "original_path": str(file_path),
+            "original_name": file_path.name,
+            "size": size,
+            "reason": reason,
+            "stage": stage,
+            "exception": f"{type(error).__name__}: {error}" if error else None,
+            "release_dir": str(release_to) if release_to else None,
+            "quarantined_at": datetime.now().isoformat(),
+        }
+        with self._connect() as conn:
+            cur = conn.execute(
+                f"INSERT INTO entries ({', '.join(entry)}) VALUES ({', '.join('?' for _ in entry)})",
+                list(entry.values())
+            )
+        entry["id"] = cur.lastrowid
+        entry["blob"] = str(blob)
+        logger.warning(f"File quarantined: {file_path.name} [{stage}] -> {blob.name}. Reason: {reason}")
+        return entry
+
+    def query(self, stage: str = None, status: str = "quarantined", since: str = None, until: str = None,
+              reason: str = None, name: str = None, ids: List[int] = None, limit: int = None) -> List[Dict[str, Any]]:
+        """Filters are ANDed; `stage`, `reason` and `name` are substring matches."""
+        clauses, params = [], []
+        if ids:
+            clauses.append(f"id IN ({', '.join('?' for _ in ids)})")
+            params += list(ids)
+        if stage:
+            clauses.append("stage LIKE ?")
+            params.append(f"%{stage}%")
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if since:
+            clauses.append("quarantined_at >= ?")
+            params.append(parse_since(since))
+        if until:
+            clauses.append("quarantined_at < ?")
+            params.append(parse_since(until))
+        if reason:
+            clauses.append("(reason LIKE ? OR exception LIKE ?)")
+            params += [f"%{reason}%", f"%{reason}%"]
+        if name:
+            clauses.append("original_name LIKE ?")
+            params.append(f"%{name}%")
+
+        sql = "SELECT * FROM entries"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY quarantined_at DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._connect() as conn:
+            return [dict(r) for r in conn.execute(sql, params).fetchall()]
+
+    def release(self, entries: List[Dict[str, Any]], dest: Path = None) -> List[Path]:
+        """
+        Restores entries to `dest`, else their release folder, else their original folder,
+        and marks them released.
+        A name already taken at the destination gets the short content hash appended.
+        """
+        released = []
+        for entry in entries:
+            if entry["status"] != "quarantined":
+                continue
+            original = Path(entry["original_path"])
+            target_dir = Path(dest or entry["release_dir"] or original.parent)
+            target_dir.mkdir(parents=True, exist_ok=True)
+            target = target_dir / entry["original_name"]
+            if target.exists():
+                target = target_dir / f"{original.stem}_{entry['sha256'][:8]}{original.suffix}"
+
+            blob = self.blob_path(entry["sha256"], original.suffix)
+            if not blob.exists():
+                logger.error(f"Blob missing for quarantine entry {entry['id']}: {blob}")
+                continue
+            shutil.copy2(blob, target)
+            with self._connect() as conn:
+                conn.execute(
+                    "UPDATE entries SET status = 'released', released_at = ?, released_to = ? WHERE id = ?",
+                    (datetime.now().isoformat(), str(target), entry["id"])
+                )
+            self._collect(entry["sha256"], original.suffix)
+            released.append(target)
+        logger.info(f"Released {len(released)} quarantined files")
+        return released
+
+    def _collect(self, sha: str, suffix: str):
+        """Deletes a blob once no quarantined entry references it."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) AS n FROM entries WHERE sha256 = ? AND status = 'quarantined'", (sha,)
+            ).fetchone()
+        if row["n"] == 0:
+            self.blob_path(sha, suffix).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            by_stage = conn.execute(
+                "SELECT stage, COUNT(*) AS n FROM entries WHERE status = 'quarantined' GROUP BY stage ORDER BY n DESC"
+            ).fetchall()
+            totals = conn.execute(
+                "SELECT COUNT(*) AS entries, COUNT(DISTINCT sha256) AS blobs, COALESCE(SUM(size), 0) AS bytes "
+                "FROM entries WHERE status = 'quarantined'"
+            ).fetchone()
+        return {**dict(totals), "by_stage": {r["stage"]: r["n"] for r in by_stage}}
+
+    def import_legacy(self) -> int:
+        """Indexes files left flat in Quarantine/ by the old layout, using their `.md.report` sidecars."""
+        imported = 0
+        for path in sorted(self.root.iterdir()):
+            if not path.is_file() or path.name.endswith(".report") or path.name.startswith("quarantine.db"):
+                continue
+            reason, original = "Legacy quarantine", str(path)
+            sidecar = path.with_suffix(".md.report")
+            if sidecar.exists():
+                for line in sidecar.read_text(encoding="utf-8").splitlines():
+                    if line.startswith("Reason: "):
+                        reason = line[len("Reason: "):]
+                    elif line.startswith("Original Path: "):
+                        original = line[len("Original Path: "):]
+            entry = self.quarantine(path, reason, stage=Path(original).parent.name or "legacy")
+            if entry:
+                # Keep the pre-quarantine location so release puts the file back where it came from
+                with self._connect() as conn:
+                    conn.execute("UPDATE entries SET original_path = ? WHERE id = ?", (original, entry["id"]))
+                sidecar.unlink(missing_ok=True)
+                imported += 1
+        return imported
+
+
+_store: Optional[QuarantineStore] = None
+_store_lock = threading.Lock()
+
+
+def get_quarantine_store() -> QuarantineStore:
+    """Process-wide store, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = QuarantineStore()
+        return _store
+
+
+def main():
+    """CLI: list / release / stats / import-legacy."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Quarantine triage")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_filters(cmd):
+        cmd.add_argument("--id", type=int, action="append", dest="ids")
+        cmd.add_argument("--stage")
+        cmd.add_argument("--since", help="ISO date or age such as 7d / 12h")
+        cmd.add_argument("--until")
+        cmd.add_argument("--reason", help="Substring of the reason or exception")
+        cmd.add_argument("--name", help="Substring of the original file name")
+
+    list_cmd = sub.add_parser("list")
+    add_filters(list_cmd)
+    list_cmd.add_argument("--status", default="quarantined", choices=["quarantined", "released"])
+    list_cmd.add_argument("--limit", type=int, default=200)
+    release_cmd = sub.add_parser("release", help="Return every matching file to the pipeline")
+    add_filters(release_cmd)
+    release_cmd.add_argument("--to", help="Release into this folder instead of each file's original one")
+    sub.add_parser("stats")
+    sub.add_parser("import-legacy")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    store = get_quarantine_store()
+    if args.command == "list":
+        for e in store.query(args.stage, args.status, args.since, args.until, args.reason, args.name, args.ids, args.limit):
+            print(f"{e['id']:>6}  {e['quarantined_at'][:19]}  {e['stage']:<16} {e['original_name']}  ({e['reason']})")
+    elif args.command == "release":
+        if not any([args.ids, args.stage, args.since, args.until, args.reason, args.name]):
+            parser.error("release needs at least one filter (use --since 36500d to release everything)")
+        entries = store.query(args.stage, "quarantined", args.since, args.until, args.reason, args.name, args.ids)
+        for path in store.release(entries, dest=args.to):
+            print(path)
+    elif args.command == "stats":
+        import json
+        print(json.dumps(store.stats(), indent=2))
+    elif args.command == "import-legacy":
+        print(f"Imported {store.import_legacy()} legacy files")
+
+
+if __name__ == "__main__":
+    main()
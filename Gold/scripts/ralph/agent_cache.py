@@ -0,0 +1,161 @@
+# scripts/ralph/agent_cache.py
+"""
+Content-addressed cache of agent CLI calls.
+
+A call is keyed by the agent command, the whitespace-normalised prompt and a hash
+of the context it runs against (the loop's target file), so a retried or resumed
+loop that would send the exact same request against the same files gets the
+recorded output back instead of paying for another agent run. Only clean exits
+are cached. The store is an SQLite file bounded by total output size; the least
+recently used entries are evicted first.
+"""
+import os
+import re
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+CACHE_DB = Path(".ralph") / "agent_cache.db"
+CACHE_MAX_BYTES = int(os.getenv("RALPH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calls (
+    key TEXT PRIMARY KEY,
+    agent_cmd TEXT NOT NULL,
+    output TEXT NOT NULL,
+    promise_seen INTEGER NOT NULL DEFAULT 0,
+    exit_code INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_calls_lru ON calls (last_used);
+"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def context_hash(paths: Iterable[Path]) -> str:
+    """Hash of the files a call depends on; a missing file hashes as absent."""
+    digest = hashlib.sha256()
+    for path in paths:
+        path = Path(path)
+        digest.update(str(path).encode("utf-8") + b"\0")
+        if path.is_file():
+            digest.update(path.read_bytes())
+        else:
+            digest.update(b"<absent>")
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def cache_key(prompt: str, context: str, agent_cmd: List[str]) -> str:
+    payload = json.dumps([agent_cmd, normalize_prompt(prompt), context])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AgentCache:
+    def __init__(self, db_path: Path = CACHE_DB, max_bytes: int = CACHE_MAX_BYTES):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM calls WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE calls SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        return dict(row)
+
+    def put(self, key: str, agent_cmd: List[str], output: str, promise_seen: bool = False, exit_code: int = 0):
+        now = time.time()
+        size = len(output.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO calls (key, agent_cmd, output, promise_seen, exit_code, size, created_at, "
+                "last_used, hits) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (key, json.dumps(agent_cmd), output, int(promise_seen), exit_code, size, now, now)
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM calls").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        victims = []
+        for row in conn.execute("SELECT key, size FROM calls ORDER BY last_used"):
+            if total - freed <= self.max_bytes:
+                break
+            victims.append((row["key"],))
+            freed += row["size"]
+        conn.executemany("DELETE FROM calls WHERE key = ?", victims)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) AS entries, COALESCE(SUM(size), 0) AS bytes, COALESCE(SUM(hits), 0) AS hits FROM calls"
+            ).fetchone()
+        return {**dict(row), "max_bytes": self.max_bytes}
+
+    def clear(self):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM calls")
+
+
+_cache: Optional[AgentCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_agent_cache() -> AgentCache:
+    """Process-wide cache, opened on first use (shared by every loop the manager runs)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = AgentCache()
+        return _cache
+
+
+def main():
+    """CLI: stats / clear."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Ralph agent call cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats")
+    sub.add_parser("clear")
+    args = parser.parse_args()
+
+    cache = get_agent_cache()
+    if args.command == "stats":
+        print(json.dumps(cache.stats(), indent=2))
+    elif args.command == "clear":
+        cache.clear()
+        print("Agent cache cleared")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,45 @@
 import argparse
 import sys
 import os
-import json
+import time
+import queue
+import shlex
+import codecs
+import threading
 import subprocess
 from pathlib import Path
 from .state_manager import RalphState
 from .stop_hook import ralph_stop_hook
+from .agent_cache import get_agent_cache, cache_key, context_hash
+
+# Agent invocation; the iteration prompt is appended as the last argument
+AGENT_CMD = os.getenv("RALPH_AGENT_CMD", "claude -p")
+# Output tail kept per iteration for the stop hook and history summary
+OUTPUT_TAIL_CHARS = 64 * 1024
+
 
 class RalphCLI:
-    def __init__(self, prompt, completion_promise=None, target_file=None, max_iterations=10):
+    def __init__(self, prompt, completion_promise=None, target_file=None, max_iterations=10,
+                 agent_cmd=None, iteration_timeout=None, promise_grace=None, echo=True,
+                 task_id=None, budget=None, output_log=None, cache=None):
+        self.task_id = task_id
+        # Identical calls (same command, prompt and target file contents) replay the recorded output
+        if cache is None:
+            cache = os.getenv("RALPH_AGENT_CACHE", "true").lower() == "true"
+        self.cache = get_agent_cache() if cache is True else (cache or None)
+        # Shared IterationBudget when several loops run under the loop manager
+        self.budget = budget
+        # Agent output is appended here (parallel loops don't echo to the console)
+        self.output_log = Path(output_log) if output_log else None
         self.prompt = prompt
         self.completion_promise = completion_promise
         self.target_file = target_file
         self.max_iterations = max_iterations
+        self.agent_cmd = shlex.split(agent_cmd or AGENT_CMD)
+        self.iteration_timeout = iteration_timeout or float(os.getenv("RALPH_ITERATION_TIMEOUT", "1800"))
+        # Once the promise is printed the agent gets this long to exit on its own
+        self.promise_grace = promise_grace if promise_grace is not None else float(os.getenv("RALPH_PROMISE_GRACE", "5"))
+        self.echo = echo
         self.state = None
 
     def initialize_state(self):
@@ -22,44 +49,137 @@ class RalphCLI:
             prompt=self.prompt,
             completion_promise=self.completion_promise,
             target_file=self.target_file,
-            max_iterations=self.max_iterations
+            max_iterations=self.max_iterations,
+            task_id=self.task_id
         )
-        self.state.save()
-        print(f"--- Ralph Loop Initialized for: {self.prompt} ---")
+        self.state.start()
+        self.say(f"--- Ralph Loop Initialized for: {self.prompt} ---")
+
+    def say(self, message):
+        print(f"[{self.task_id}] {message}" if self.task_id else message)
+
+    def call_agent(self, prompt):
+        """run_agent() through the cache. Returns (output, promise_seen, exit_code, cached)."""
+        key = None
+        if self.cache:
+            context = context_hash([Path(self.target_file)] if self.target_file else [])
+            key = cache_key(prompt, context, self.agent_cmd)
+            hit = self.cache.get(key)
+            if hit:
+                self.say("--- Agent call served from cache ---")
+                self._emit(hit["output"])
+                return hit["output"], bool(hit["promise_seen"]), hit["exit_code"], True
+
+        output, promise_seen, code = self.run_agent(prompt)
+        if key and code == 0:
+            self.cache.put(key, self.agent_cmd, output, promise_seen, code)
+        return output, promise_seen, code, False
+
+    def _emit(self, text):
+        if self.echo:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+        if self.output_log:
+            with open(self.output_log, "a", encoding="utf-8") as log:
+                log.write(text)
+
+    def run_agent(self, prompt):
+        """
+        Runs one agent iteration, streaming its output as it arrives.
+        Returns (output_tail, promise_seen, exit_code). The promise is matched on the
+        stream, so the loop reacts as soon as it is printed rather than at exit.
+        """
+        # The agent's own stop hook finds this loop's state through RALPH_TASK_ID
+        env = {**os.environ, "RALPH_TASK_ID": self.task_id} if self.task_id else None
+        proc = subprocess.Popen(
+            self.agent_cmd + [prompt], stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+            env=env
+        )
+        chunks = queue.Queue()
+
+        def pump():
+            # read1 returns whatever is available, so partial lines are not held back
+            for chunk in iter(lambda: proc.stdout.read1(8192), b""):
+                chunks.put(chunk)
+            chunks.put(None)
+
+        threading.Thread(target=pump, daemon=True).start()
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        promise = self.completion_promise
+        output, window = "", ""
+        promise_seen = False
+        deadline = time.monotonic() + self.iteration_timeout
+        log = open(self.output_log, "a", encoding="utf-8") if self.output_log else None
+        while True:
+            try:
+                chunk = chunks.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                self.say(f"--- Iteration {'past promise grace' if promise_seen else 'timed out'}; stopping agent ---")
+                proc.terminate()
+                try:
+                    proc.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    proc.kill()
+                break
+            if chunk is None:
+                break
+            text = decoder.decode(chunk)
+            if self.echo:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+            if log:
+                log.write(text)
+                log.flush()
+            output = (output + text)[-OUTPUT_TAIL_CHARS:]
+
+            if promise and not promise_seen:
+                # Only the overlap with the previous chunk needs re-scanning
+                window = window[-(len(promise) - 1):] + text if len(promise) > 1 else text
+                if promise in window:
+                    promise_seen = True
+                    deadline = min(deadline, time.monotonic() + self.promise_grace)
+
+        output += decoder.decode(b"", final=True)
+        if log:
+            log.close()
+        return output, promise_seen, proc.wait()
 
     def run_loop(self):
         """
         Main execution loop.
-        Calls Claude CLI and intercepts exit using the stop hook logic.
+        Calls the agent CLI and intercepts exit using the stop hook logic.
         """
         self.initialize_state()
-        
+        prompt = self.prompt
+
         while self.state.status == "active":
-            print(f"--- Iteration {self.state.current_iteration + 1}/{self.max_iterations} ---")
-            
-            # In a real environment, this calls 'claude' or 'gemini-cli'
-            # For this scaffold, we simulate the interaction loop:
-            # result = subprocess.run(["claude", "-p", self.prompt], capture_output=True, text=True)
-            # last_output = result.stdout
-            
-            # Simulated output for scaffold:
-            # last_output = "Task in progress, checking more files..."
-            
-            # Call stop hook
-            # if ralph_stop_hook(last_output):
-            #     break # Exit loop
-            
-            # For scaffold, let's pretend it runs one iteration and then we check status
-            # self.state.add_history(last_output)
-            # if self.state.is_complete(last_output):
-            #     break
-                
-            # Simulate real loop behavior:
-            # Break after some dummy time if iterating
-            # time.sleep(2)
-            break
-        
-        print(f"--- Ralph Loop Exit [Status: {self.state.status}] ---")
+            if self.budget and not self.budget.try_acquire():
+                self.say("--- Shared iteration budget exhausted ---")
+                self.state.set_status("budget_exhausted")
+                break
+            self.say(f"--- Iteration {self.state.current_iteration + 1}/{self.max_iterations} ---")
+            if self.output_log:
+                self.output_log.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.output_log, "a", encoding="utf-8") as log:
+                    log.write(f"\n--- Iteration {self.state.current_iteration + 1} ---\n")
+            try:
+                last_output, promise_seen, code, cached = self.call_agent(prompt)
+            except OSError as e:
+                self.say(f"Could not start agent {' '.join(self.agent_cmd)}: {e}")
+                self.state.set_status("failed")
+                break
+            if code:
+                self.say(f"--- Agent exited with code {code} ---")
+
+            if ralph_stop_hook(last_output, self.state, promise_seen, cached=cached):
+                break # Exit loop
+            prompt = self.state.reinjection_prompt()
+
+        self.say(f"--- Ralph Loop Exit [Status: {self.state.status}] ---")
+        if self.cache:
+            self.say(f"--- Agent cache: {self.state.cache_hits} hits / {self.state.cache_misses} misses "
+                     f"({self.state.cache_hit_rate():.0%}) ---")
         return self.state.status == "completed"
 
 def main():
@@ -68,16 +188,24 @@ def main():
     parser.add_argument("--completion-promise", help="Substring that indicates task completion.")
     parser.add_argument("--target-file", help="Path to file that should be moved to /Done for completion.")
     parser.add_argument("--max-iterations", type=int, default=10, help="Maximum number of autonomous iterations.")
-    
+    parser.add_argument("--agent-cmd", help=f"Agent command; the prompt is appended (default: RALPH_AGENT_CMD or '{AGENT_CMD}').")
+    parser.add_argument("--iteration-timeout", type=float, help="Seconds before an iteration is stopped.")
+    parser.add_argument("--task-id", help="Keep this loop's state in .ralph/<task-id>/ instead of .ralph_state.json.")
+    parser.add_argument("--no-cache", action="store_true", help="Always call the agent, even for a cached request.")
+
     args = parser.parse_args()
-    
+
     cli = RalphCLI(
         prompt=args.prompt,
         completion_promise=args.completion_promise,
         target_file=args.target_file,
-        max_iterations=args.max_iterations
+        max_iterations=args.max_iterations,
+        agent_cmd=args.agent_cmd,
+        iteration_timeout=args.iteration_timeout,
+        task_id=args.task_id,
+        cache=False if args.no_cache else None
     )
-    
+
     success = cli.run_loop()
     sys.exit(0 if success else 1)
 
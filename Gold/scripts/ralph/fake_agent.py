@@ -0,0 +1,66 @@
+# scripts/ralph/fake_agent.py
+"""
+Stand-in for the agent CLI, for exercising Ralph loops without a model.
+
+    RALPH_AGENT_CMD="python -m scripts.ralph.fake_agent --promise DONE --after 3" \
+        python -m scripts.ralph.cli_wrapper "Do the thing" --completion-promise DONE
+
+Prints a deterministic, prompt-derived transcript a chunk at a time and emits the
+promise (or moves the target file to Done) on its `--after`-th call. Calls are
+counted per RALPH_TASK_ID in `.ralph/fake_agent_calls/<task_id>`, which also lets
+a test check how many real agent runs a cached loop made.
+"""
+import os
+import sys
+import time
+import shutil
+import hashlib
+import argparse
+from pathlib import Path
+
+CALLS_DIR = Path(".ralph") / "fake_agent_calls"
+DONE_DIR = Path("AI_Employee_Vault/Done")
+
+
+def count_call(task_id: str) -> int:
+    # One counter file per task, so parallel loops never race on it
+    CALLS_DIR.mkdir(parents=True, exist_ok=True)
+    path = CALLS_DIR / task_id
+    calls = int(path.read_text(encoding="utf-8")) + 1 if path.exists() else 1
+    path.write_text(str(calls), encoding="utf-8")
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake agent CLI for Ralph loop tests")
+    parser.add_argument("-p", action="store_true", help="Accepted for compatibility with `claude -p`")
+    parser.add_argument("--promise", help="Print this completion promise on the --after-th call")
+    parser.add_argument("--after", type=int, default=1, help="Call on which the task gets done")
+    parser.add_argument("--move-target", help="Move this file to AI_Employee_Vault/Done on the --after-th call")
+    parser.add_argument("--delay", type=float, default=0.05, help="Seconds between output chunks")
+    parser.add_argument("--exit-code", type=int, default=0)
+    parser.add_argument("prompt")
+    args = parser.parse_args()
+
+    call = count_call(os.getenv("RALPH_TASK_ID", "default"))
+    digest = hashlib.sha256(args.prompt.encode("utf-8")).hexdigest()[:12]
+    for line in [f"Reading task ({digest})...", "Checking the vault...", "Drafting plan..."]:
+        sys.stdout.write(line + "\n")
+        sys.stdout.flush()
+        time.sleep(args.delay)
+
+    if call >= args.after:
+        if args.move_target and Path(args.move_target).exists():
+            DONE_DIR.mkdir(parents=True, exist_ok=True)
+            shutil.move(args.move_target, DONE_DIR / Path(args.move_target).name)
+            print(f"Moved {args.move_target} to Done")
+        if args.promise:
+            print(f"<promise>{args.promise}</promise>")
+    else:
+        print(f"Not finished yet (call {call}/{args.after}).")
+    sys.stdout.flush()
+    sys.exit(args.exit_code)
+
+
+if __name__ == "__main__":
+    main()
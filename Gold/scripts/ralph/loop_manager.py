@@ -0,0 +1,152 @@
+# scripts/ralph/loop_manager.py
+"""
+Runs several Ralph loops side by side, one per target file.
+
+Each loop keeps its state, journal and agent output under `.ralph/<task_id>/`.
+At most `concurrency` loops run at once and all of them draw agent iterations
+from one shared budget, so a large Needs_Action backlog cannot run up an
+unbounded number of agent calls.
+
+    python -m scripts.ralph.loop_manager run --needs-action --concurrency 3 --budget 60
+    python -m scripts.ralph.loop_manager status
+"""
+import os
+import sys
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .cli_wrapper import RalphCLI
+from .state_manager import RalphState, RALPH_DIR, task_id_for
+
+NEEDS_ACTION = Path("AI_Employee_Vault/Needs_Action")
+
+DEFAULT_PROMPT = (
+    "Process the task in {target_file}. Follow the Company Handbook, create any plans or approval "
+    "requests it needs, and move the file to AI_Employee_Vault/Done when it is fully handled."
+)
+
+
+class IterationBudget:
+    """Agent iterations shared by every loop under one manager (None = unlimited)."""
+
+    def __init__(self, total: Optional[int] = None):
+        self.total = total
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self.lock:
+            if self.total is not None and self.used >= self.total:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def remaining(self) -> Optional[int]:
+        return None if self.total is None else max(0, self.total - self.used)
+
+
+class RalphLoopManager:
+    def __init__(self, targets: List[Path], concurrency: int = 3, budget: Optional[int] = None,
+                 prompt_template: str = DEFAULT_PROMPT, completion_promise: str = None,
+                 max_iterations: int = 10, agent_cmd: str = None, iteration_timeout: float = None,
+                 cache: bool = None):
+        self.targets = [Path(t) for t in targets]
+        self.concurrency = max(1, concurrency)
+        self.budget = IterationBudget(budget)
+        self.prompt_template = prompt_template
+        self.completion_promise = completion_promise
+        self.max_iterations = max_iterations
+        self.agent_cmd = agent_cmd
+        self.iteration_timeout = iteration_timeout
+        self.cache = cache
+
+    def loop_for(self, target: Path) -> RalphCLI:
+        task_id = task_id_for(target)
+        return RalphCLI(
+            prompt=self.prompt_template.format(target_file=target),
+            completion_promise=self.completion_promise,
+            target_file=str(target),
+            max_iterations=self.max_iterations,
+            agent_cmd=self.agent_cmd,
+            iteration_timeout=self.iteration_timeout,
+            echo=False,
+            task_id=task_id,
+            budget=self.budget,
+            output_log=RALPH_DIR / task_id / "output.log",
+            cache=self.cache
+        )
+
+    def run(self) -> Dict[str, str]:
+        """Runs every target's loop to completion; returns task_id -> final status."""
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="ralph") as pool:
+            futures = {pool.submit(self.loop_for(t).run_loop): t for t in self.targets}
+            for future in as_completed(futures):
+                task_id = task_id_for(futures[future])
+                try:
+                    future.result()
+                    state = RalphState.load(task_id)
+                    results[task_id] = state.status if state else "unknown"
+                except Exception as e:
+                    print(f"[{task_id}] Loop crashed: {e}")
+                    results[task_id] = "error"
+        return results
+
+
+def status_table(states: List[RalphState] = None) -> str:
+    states = RalphState.list_tasks() if states is None else states
+    if not states:
+        return "No Ralph loops found in .ralph/"
+    lines = [f"{'task':<52} {'status':<17} {'iter':>7} {'cache':>6}  target"]
+    for s in states:
+        lines.append(
+            f"{s.task_id:<52} {s.status:<17} {f'{s.current_iteration}/{s.max_iterations}':>7} "
+            f"{s.cache_hit_rate():>6.0%}  {s.target_file or '-'}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Ralph loops in parallel, one per task file.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_cmd = sub.add_parser("run")
+    run_cmd.add_argument("targets", nargs="*", help="Task files to loop on")
+    run_cmd.add_argument("--needs-action", action="store_true", help="Loop on every file in Needs_Action")
+    run_cmd.add_argument("--concurrency", type=int, default=int(os.getenv("RALPH_CONCURRENCY", "3")))
+    run_cmd.add_argument("--budget", type=int, help="Total agent iterations across all loops")
+    run_cmd.add_argument("--max-iterations", type=int, default=10, help="Per-loop iteration cap")
+    run_cmd.add_argument("--completion-promise", help="Substring that marks a task complete")
+    run_cmd.add_argument("--prompt", default=DEFAULT_PROMPT, help="Prompt template; {target_file} is substituted")
+    run_cmd.add_argument("--agent-cmd", help="Agent command (default: RALPH_AGENT_CMD)")
+    run_cmd.add_argument("--iteration-timeout", type=float)
+    run_cmd.add_argument("--no-cache", action="store_true", help="Bypass the agent call cache")
+    sub.add_parser("status")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        print(status_table())
+        return
+
+    targets = [Path(t) for t in args.targets]
+    if args.needs_action:
+        targets += sorted(NEEDS_ACTION.glob("*.md"))
+    if not targets:
+        parser.error("no targets (pass files or --needs-action)")
+
+    manager = RalphLoopManager(
+        targets, concurrency=args.concurrency, budget=args.budget, prompt_template=args.prompt,
+        completion_promise=args.completion_promise, max_iterations=args.max_iterations,
+        agent_cmd=args.agent_cmd, iteration_timeout=args.iteration_timeout,
+        cache=False if args.no_cache else None
+    )
+    results = manager.run()
+    print(status_table([s for s in (RalphState.load(t) for t in results) if s]))
+    sys.exit(0 if all(status == "completed" for status in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,76 +1,227 @@
 # scripts/ralph/state_manager.py
 import json
 import os
+import re
+import hashlib
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 
+# Single-loop (legacy) location; loops started with a task ID live in .ralph/<task_id>/
 STATE_FILE = Path(".ralph_state.json")
+JOURNAL_FILE = Path(".ralph_journal.jsonl")
+RALPH_DIR = Path(".ralph")
+DONE_DIR = Path("AI_Employee_Vault/Done")
+
+# Iterations between snapshot compactions; loading replays at most this many journal lines
+COMPACT_EVERY = int(os.getenv("RALPH_COMPACT_EVERY", "10"))
+# Recent iterations kept in memory and in the snapshot for context re-injection
+HISTORY_TAIL = 20
+JOURNAL_MAX_BYTES = int(os.getenv("RALPH_JOURNAL_MAX_BYTES", str(5 * 1024 * 1024)))
+
+
+def task_id_for(target_file):
+    """Stable, filesystem-safe task ID for a target file: readable stem plus a path hash."""
+    path = Path(target_file)
+    stem = re.sub(r"[^A-Za-z0-9_-]+", "_", path.stem)[:40] or "task"
+    return f"{stem}-{hashlib.sha1(str(path.resolve()).encode('utf-8')).hexdigest()[:8]}"
+
+
+def state_paths(task_id=None):
+    """(snapshot, journal) for a task, or the legacy global pair without one."""
+    if not task_id:
+        return STATE_FILE, JOURNAL_FILE
+    return RALPH_DIR / task_id / "state.json", RALPH_DIR / task_id / "journal.jsonl"
+
 
 class RalphState:
-    def __init__(self, prompt, completion_promise=None, target_file=None, max_iterations=10):
+    """
+    Loop state as a compact snapshot plus an append-only journal.
+
+    Each iteration appends one line to the journal; the snapshot is only rewritten
+    every `COMPACT_EVERY` iterations and on status changes, and records the journal
+    offset it covers. Loading reads the snapshot and replays the journal tail, so
+    both cost O(1) per iteration. With a `task_id` both files live in
+    `.ralph/<task_id>/`, so loops for different tasks never share state.
+    """
+
+    def __init__(self, prompt, completion_promise=None, target_file=None, max_iterations=10, task_id=None):
+        self.task_id = task_id
+        self.state_file, self.journal_file = state_paths(task_id)
         self.prompt = prompt
         self.completion_promise = completion_promise
         self.target_file = Path(target_file) if target_file else None
         self.max_iterations = max_iterations
         self.current_iteration = 0
-        self.history = []
-        self.status = "active" # active, completed, failed
+        self.history = deque(maxlen=HISTORY_TAIL)
+        self.status = "active" # active, completed, failed, budget_exhausted
+        self.journal_offset = 0  # Journal bytes already applied to this object
+        self.snapshot_mtime = None
+        self.since_compact = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
 
     def save(self):
+        """Compacts: writes the snapshot covering everything journaled so far."""
+        self._rotate_journal()
         data = {
             "prompt": self.prompt,
             "completion_promise": self.completion_promise,
             "target_file": str(self.target_file) if self.target_file else None,
             "max_iterations": self.max_iterations,
             "current_iteration": self.current_iteration,
-            "history": self.history,
+            "history": list(self.history),
             "status": self.status,
+            "journal_offset": self.journal_offset,
+            "task_id": self.task_id,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
             "last_updated": datetime.now().isoformat()
         }
-        with open(STATE_FILE, "w") as f:
-            json.dump(data, f, indent=4)
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_file)
+        self.snapshot_mtime = self.state_file.stat().st_mtime_ns
+        self.since_compact = 0
+
+    def _rotate_journal(self):
+        # Everything in the journal is about to be covered by the snapshot, so it can be moved aside
+        if self.journal_offset >= JOURNAL_MAX_BYTES and self.journal_file.exists():
+            os.replace(self.journal_file, self.journal_file.with_suffix(".jsonl.1"))
+            self.journal_offset = 0
+
+    def start(self):
+        """Fresh loop: discards the previous loop's journal and writes the initial snapshot."""
+        self.journal_file.unlink(missing_ok=True)
+        self.journal_offset = 0
+        self.save()
 
     @classmethod
-    def load(cls):
-        if not STATE_FILE.exists():
+    def load(cls, task_id=None):
+        state_file, _ = state_paths(task_id)
+        if not state_file.exists():
             return None
-        with open(STATE_FILE, "r") as f:
+        with open(state_file, "r") as f:
             data = json.load(f)
-        
+
         state = cls(
             data["prompt"],
             data["completion_promise"],
             data["target_file"],
-            data["max_iterations"]
+            data["max_iterations"],
+            task_id=task_id
         )
         state.current_iteration = data["current_iteration"]
-        state.history = data["history"]
+        state.history.extend(data["history"])
         state.status = data["status"]
+        state.journal_offset = data.get("journal_offset", 0)
+        state.cache_hits = data.get("cache_hits", 0)
+        state.cache_misses = data.get("cache_misses", 0)
+        state.snapshot_mtime = state_file.stat().st_mtime_ns
+        state._replay()
         return state
 
-    def add_history(self, output):
-        self.history.append({
+    @classmethod
+    def list_tasks(cls):
+        """Every per-task loop under .ralph/, most recently started first."""
+        if not RALPH_DIR.exists():
+            return []
+        states = [cls.load(p.parent.name) for p in RALPH_DIR.glob("*/state.json")]
+        return sorted((s for s in states if s), key=lambda s: s.snapshot_mtime or 0, reverse=True)
+
+    def refresh(self):
+        """
+        Brings a long-lived copy (e.g. the stop hook's) up to date. Only journal lines
+        written since the last call are read, unless another process re-snapshotted.
+        """
+        if not self.state_file.exists():
+            return None
+        if self.state_file.stat().st_mtime_ns != self.snapshot_mtime:
+            return RalphState.load(self.task_id)
+        self._replay()
+        return self
+
+    def _replay(self):
+        if not self.journal_file.exists() or self.journal_file.stat().st_size <= self.journal_offset:
+            return
+        with open(self.journal_file, "rb") as f:
+            f.seek(self.journal_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written record; picked up next time
+                self._apply(json.loads(line))
+                self.journal_offset += len(line)
+
+    def _apply(self, record):
+        if record["type"] == "iteration":
+            self.history.append({k: v for k, v in record.items() if k != "type"})
+            self.current_iteration = record["iteration"] + 1
+            if record.get("cached") is not None:
+                if record["cached"]:
+                    self.cache_hits += 1
+                else:
+                    self.cache_misses += 1
+        elif record["type"] == "status":
+            self.status = record["status"]
+
+    def _append(self, record):
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with open(self.journal_file, "ab") as f:
+            f.write(line)
+        self._apply(record)
+        self.journal_offset += len(line)
+
+    def add_history(self, output, cached=None):
+        record = {
+            "type": "iteration",
             "iteration": self.current_iteration,
             "timestamp": datetime.now().isoformat(),
             "output_summary": output[-500:] # Keep last 500 chars for context re-injection
-        })
-        self.current_iteration += 1
+        }
+        if cached is not None:
+            record["cached"] = cached
+        self._append(record)
+        self.since_compact += 1
+        if self.since_compact >= COMPACT_EVERY:
+            self.save()
+
+    def set_status(self, status):
+        self._append({"type": "status", "status": status, "timestamp": datetime.now().isoformat()})
         self.save()
 
-    def is_complete(self, last_output):
-        # 1. Check for completion promise in output
-        if self.completion_promise and self.completion_promise in last_output:
-            self.status = "completed"
-            return True
-        
-        # 2. Check if target file moved to /Done
-        if self.target_file and "/Done/" in str(self.target_file) and self.target_file.exists():
+    def cache_hit_rate(self):
+        calls = self.cache_hits + self.cache_misses
+        return self.cache_hits / calls if calls else 0.0
+
+    def is_complete(self, last_output, promise_seen=False):
+        # 1. Check for completion promise in output (the driver detects it while streaming)
+        if self.completion_promise and (promise_seen or self.completion_promise in last_output):
             self.status = "completed"
             return True
-            
+
+        # 2. Check if target file moved to /Done (given either as its /Done path or its original one)
+        if self.target_file:
+            done_path = self.target_file if "/Done/" in self.target_file.as_posix() else DONE_DIR / self.target_file.name
+            if done_path.exists():
+                self.status = "completed"
+                return True
+
         # 3. Check max iterations
         if self.current_iteration >= self.max_iterations:
             self.status = "failed"
             return True
-            
+
         return False
+
+    def reinjection_prompt(self):
+        """Original goal plus the previous attempt's summary, for the next iteration."""
+        summary = self.history[-1]["output_summary"] if self.history else ""
+        return f"""{self.prompt}
+
+I am continuing the autonomous loop (Ralph Wiggum pattern).
+Previous attempt summary: {summary}
+Continue until {self.completion_promise or 'file is moved to /Done'}.
+Remaining iterations: {self.max_iterations - self.current_iteration}
+"""
@@ -1,53 +1,46 @@
 # scripts/ralph/stop_hook.py
-import sys
 import os
-import json
-from pathlib import Path
-import subprocess
 from .state_manager import RalphState
 
-def ralph_stop_hook(last_output):
+# Kept between calls per task; refresh() only reads journal lines written since the last one
+_states = {}
+
+
+def _current_state(task_id=None):
+    """State of the loop `task_id` (default: RALPH_TASK_ID, set for agents the driver starts)."""
+    task_id = task_id or os.getenv("RALPH_TASK_ID") or None
+    state = _states.get(task_id)
+    state = state.refresh() if state else RalphState.load(task_id)
+    _states[task_id] = state
+    return state
+
+
+def ralph_stop_hook(last_output, state=None, promise_seen=False, task_id=None, cached=None):
     """
     Ralph Wiggum Stop Hook implementation.
     Intercepts Claude's exit and decides whether to allow exit or re-inject prompt.
+    The loop driver passes its own `state`; standalone callers get the on-disk one for `task_id`.
     """
-    state = RalphState.load()
+    state = state or _current_state(task_id)
     if not state or state.status != "active":
         # No active loop, allow exit
         return True
 
-    print(f"
---- Ralph Hook [Iteration {state.current_iteration}/{state.max_iterations}] ---")
-    
-    # 1. Check for completion or failure
-    if state.is_complete(last_output):
+    prefix = f"[{state.task_id}] " if state.task_id else ""
+
+    # 1. Add last output to context history
+    state.add_history(last_output, cached)
+    print(f"\n--- {prefix}Ralph Hook [Iteration {state.current_iteration}/{state.max_iterations}] ---")
+
+    # 2. Check for completion or failure
+    if state.is_complete(last_output, promise_seen):
         if state.status == "completed":
-            print(f"Task successfully completed: {state.completion_promise or state.target_file}")
-            # Mark state as done
-            state.status = "done"
-            state.save()
-            return True # Allow exit
+            print(f"{prefix}Task successfully completed: {state.completion_promise or state.target_file}")
         else:
-            print(f"Loop failed: Maximum iterations ({state.max_iterations}) reached.")
-            state.status = "failed"
-            state.save()
-            return True # Allow exit (with failure log)
-
-    # 2. Add last output to context history
-    state.add_history(last_output)
-    
-    # 3. Task is incomplete, block exit and re-inject
-    print("Task incomplete. Re-injecting context and continuing autonomous loop...")
-    
-    # In a real environment, this hook would feed back to the Claude process
-    # Re-inject the original prompt + previous output summary for context continuity
-    context_reinjection = f"""
-I am continuing the autonomous loop (Ralph Wiggum pattern).
-Previous attempt summary: {state.history[-1]['output_summary']}
-Continue until {state.completion_promise or 'file is moved to /Done'}.
-Remaining iterations: {state.max_iterations - state.current_iteration}
-    """
-    
-    # We block exit by returning False and triggering another 'run' call
-    # This logic depends on the CLI wrapper implementation.
-    return False 
+            print(f"{prefix}Loop failed: Maximum iterations ({state.max_iterations}) reached.")
+        state.set_status(state.status)
+        return True # Allow exit
+
+    # 3. Task is incomplete, block exit; the driver re-injects state.reinjection_prompt()
+    print(f"{prefix}Task incomplete. Re-injecting context and continuing autonomous loop...")
+    return False
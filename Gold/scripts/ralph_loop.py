@@ -1,38 +1,17 @@
-import subprocess
-import os
 import sys
-import time
+
+from scripts.ralph.cli_wrapper import RalphCLI
 
 # Ralph Wiggum pattern: a Stop hook that intercepts Claude's exit and feeds the prompt back.
 def ralph_loop(prompt, completion_promise="TASK_COMPLETE", max_iterations=10):
     """Start a Ralph loop: Process all files in /Needs_Action, move to /Done when complete."""
-    iteration = 0
-    while iteration < max_iterations:
-        print(f"--- Ralph Loop Iteration {iteration + 1}/{max_iterations} ---")
-        
-        # In a real environment, we'd call `claude` CLI here.
-        # Since this is a hackathon environment, we simulate it or use the `run_ai_employee.py`.
-        
-        # Simulate Claude's output
-        # result = subprocess.run(["claude", "-p", prompt], capture_output=True, text=True)
-        # simulated_output = result.stdout
-        
-        simulated_output = f"<promise>{completion_promise}</promise>"
-        
-        if completion_promise in simulated_output:
-            print(f"Task complete (iteration {iteration + 1})")
-            return True
-        
-        iteration += 1
-        time.sleep(2) # Wait before next iteration
-    
-    print("Max iterations reached without completion.")
-    return False
+    # The streaming driver runs the agent (RALPH_AGENT_CMD), watches for the promise and journals each iteration
+    return RalphCLI(prompt, completion_promise=completion_promise, max_iterations=max_iterations).run_loop()
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python scripts/ralph_loop.py "prompt"")
+        print('Usage: python -m scripts.ralph_loop "prompt"')
         sys.exit(1)
-    
+
     prompt = sys.argv[1]
-    ralph_loop(prompt)
+    sys.exit(0 if ralph_loop(prompt) else 1)
@@ -5,8 +5,11 @@ from typing import List, Dict, Any
 from datetime import datetime
 import os
 import shutil
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
 from .intent_classifier import IntentClassifier
+from ..utils.tracing import read_trace_ids, span
+from ..utils.metrics import counter, histogram
 
 VAULT_PATH = Path("AI_Employee_Vault")
 PLANS_DIR = VAULT_PATH / "Plans"
@@ -14,6 +17,11 @@ DONE_DIR = VAULT_PATH / "Done"
 ACCOUNTING_DIR = VAULT_PATH / "Accounting"
 LOGS_DIR = VAULT_PATH / "Logs"
 
+FILES_PER_CYCLE = histogram("planner_files_per_cycle", "Task files handed to one planning cycle",
+                            buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500))
+CYCLE_SECONDS = histogram("planner_cycle_seconds", "Duration of a planning cycle")
+PLANS = counter("planner_plans_total", "Plans written", ["intent"])
+
 class Planner:
     """
     Orchestrates the reasoning process:
@@ -24,19 +32,41 @@ class Planner:
     5. Writes plan files to `Plans/`.
     """
     
-    def __init__(self):
+    def __init__(self, journal=None, agent: str = "ReasoningEngine"):
         self.classifier = IntentClassifier()
         self.logger = logging.getLogger("ReasoningEngine")
+        self.journal = journal
+        self.agent = agent
         
         # Ensure directories exist
         PLANS_DIR.mkdir(parents=True, exist_ok=True)
         ACCOUNTING_DIR.mkdir(parents=True, exist_ok=True)
         LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
-    def scan_and_plan(self, files: List[Path]) -> List[Dict[str, Any]]:
+    def scan_and_plan(self, files: List[Path], on_planned=None) -> List[Dict[str, Any]]:
         """
         Scans a list of files from `Needs_Action`, classifies them, and generates plans.
+        `on_planned(plan)` runs right after each plan file is written, while the journal
+        transitions of its source files are still open.
         """
+        FILES_PER_CYCLE.observe(len(files))
+        with CYCLE_SECONDS.time():
+            return self._scan_and_plan(files, on_planned)
+
+    @contextmanager
+    def _claim_sources(self, plan: Dict[str, Any]):
+        """Opens a Needs_Action -> In_Progress transition per source file before the plan is written."""
+        if self.journal is None:
+            yield []
+            return
+        with ExitStack() as stack:
+            yield [
+                stack.enter_context(self.journal.transition(
+                    Path(item['source_file']).name, "Needs_Action", "In_Progress", agent=self.agent))
+                for item in plan['context']
+            ]
+
+    def _scan_and_plan(self, files: List[Path], on_planned=None) -> List[Dict[str, Any]]:
         intents = []
         file_map = {}
 
@@ -46,7 +76,11 @@ class Planner:
                 with open(file_path, "r", encoding="utf-8") as f:
                     content = f.read()
                 
-                classification = self.classifier.classify(content)
+                trace_ids = read_trace_ids(content)
+                with span("classify", trace_ids, task=file_path.name) as attrs:
+                    classification = self.classifier.classify(content)
+                    attrs["intent"] = classification["intent"]
+                classification["trace_ids"] = trace_ids
                 classification["source_file"] = str(file_path)
                 classification["content_preview"] = content[:100].replace('\n', ' ') + "..."
                 
@@ -62,10 +96,18 @@ class Planner:
 
         plans = []
         for group_id, group in grouped_intents.items():
-            plan = self._generate_multi_step_plan(group)
-            if plan:
-                plans.append(plan)
-                self._write_plan_file(plan)
+            trace_ids = [t for intent in group for t in intent.get("trace_ids", [])]
+            with span("plan", trace_ids, group=group_id) as attrs:
+                plan = self._generate_multi_step_plan(group)
+                if plan:
+                    plans.append(plan)
+                    with self._claim_sources(plan) as transitions:
+                        attrs["plan"] = self._write_plan_file(plan).name
+                        for t in transitions:
+                            t.effect("planned")
+                        PLANS.inc(intent=plan["intent"])
+                        if on_planned:
+                            on_planned(plan)
 
         return plans
 
@@ -173,9 +215,10 @@ class Planner:
         return {
             "title": f"Invoice Request: {client}",
             "priority": "High",
+            "intent": "invoice_request",
             "steps": [
-                {"step": 1, "action": "generate_invoice", "tool": "odoo.create_draft_invoice"},
-                {"step": 2, "action": "send_email", "tool": "gmail.send"}
+                {"step": 1, "action": "generate_invoice", "details": f"Create invoice for {client}", "tool": "odoo.create_draft_invoice"},
+                {"step": 2, "action": "send_email", "details": "Send the invoice to the client", "tool": "gmail.send"}
             ],
             "context": [intent]
         }
@@ -185,15 +228,17 @@ class Planner:
         return {
             "title": f"Process Late Fee: ${amount}",
             "priority": "Medium",
+            "intent": "late_fee_notice",
             "steps": [
-                {"step": 1, "action": "log_expense", "tool": "odoo.record_expense"},
-                {"step": 2, "action": "update_dashboard", "tool": "vault_writer.update_dashboard"}
+                {"step": 1, "action": "log_expense", "details": f"Log late fee of ${amount} in Odoo expense ledger", "tool": "odoo.record_expense"},
+                {"step": 2, "action": "update_dashboard", "details": "Update Dashboard.md with the new expense", "tool": "vault_writer.update_dashboard"}
             ],
             "context": [intent]
         }
 
-    def _write_plan_file(self, plan: Dict[str, Any]):
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    def _write_plan_file(self, plan: Dict[str, Any]) -> Path:
+        # Microseconds keep plans written in the same second from overwriting each other
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         filename = f"PLAN_{timestamp}_{plan['intent']}.md"
         filepath = PLANS_DIR / filename
         
@@ -204,6 +249,9 @@ class Planner:
         content.append(f"created: {datetime.now().isoformat()}")
         content.append("status: pending")
         content.append("type: plan")
+        trace_ids = [t for item in plan['context'] for t in item.get('trace_ids', [])]
+        if trace_ids:
+            content.append(f"trace_ids: [{', '.join(trace_ids)}]")
         content.append("---")
         content.append("")
         content.append(f"# {plan['title']}")
@@ -230,3 +278,4 @@ class Planner:
             f.write("\n".join(content))
             
         self.logger.info(f"Generated Plan: {filepath}")
+        return filepath
@@ -5,6 +5,8 @@ import os
 import shutil
 from pathlib import Path
 from .planner import Planner
+from .vault_writer import VaultWriter
+from ..task_journal import get_task_journal
 
 VAULT_PATH = Path("AI_Employee_Vault")
 NEEDS_ACTION = VAULT_PATH / "Needs_Action"
@@ -17,8 +19,9 @@ class ReasoningEngine:
     """
     
     def __init__(self):
-        self.planner = Planner()
         self.logger = logging.getLogger("ReasoningEngine")
+        self.journal = get_task_journal(VAULT_PATH)
+        self.planner = Planner(journal=self.journal, agent="ReasoningEngine")
         
         # Ensure directories exist
         NEEDS_ACTION.mkdir(parents=True, exist_ok=True)
@@ -29,6 +32,7 @@ class ReasoningEngine:
         Main reasoning cycle.
         """
         self.logger.info("Scanning for new tasks...")
+        self._resume_moves()
         files = list(NEEDS_ACTION.glob("*.md"))
         
         if not files:
@@ -38,24 +42,34 @@ class ReasoningEngine:
         self.logger.info(f"Found {len(files)} new tasks.")
         
         # 1. Analyze and Plan (Cross-Domain)
-        plans = self.planner.scan_and_plan(files)
+        # 2. Each plan's source files move to In_Progress as soon as it is written, to prevent re-scanning.
+        # The planner journals the move before writing the plan, so a crash never plans a task twice.
+        plans = self.planner.scan_and_plan(files, on_planned=self._consume_sources)
         
         if plans:
             self.logger.info(f"Generated {len(plans)} plans.")
-            
-            # 2. Move processed files to In_Progress to prevent re-scanning
-            # In a real system, we'd only move files that were *part of a plan*.
-            # Here, we assume the planner consumed them.
-            for plan in plans:
-                for item in plan['context']:
-                    src_path = Path(item['source_file'])
-                    if src_path.exists():
-                        dest_path = IN_PROGRESS / src_path.name
-                        shutil.move(src_path, dest_path)
-                        self.logger.info(f"Moved {src_path.name} to In_Progress")
         else:
             self.logger.info("No actionable plans generated.")
 
+    def _consume_sources(self, plan):
+        for item in plan['context']:
+            self._move_to_in_progress(Path(item['source_file']))
+        VaultWriter.update_dashboard(f"Planned: {plan['title']} ({len(plan['context'])} tasks)")
+
+    def _move_to_in_progress(self, src_path: Path):
+        if src_path.exists():
+            dest_path = IN_PROGRESS / src_path.name
+            shutil.move(src_path, dest_path)
+            self.logger.info(f"Moved {src_path.name} to In_Progress")
+
+    def _resume_moves(self):
+        """Finishes moves a crash interrupted after planning, so those tasks are not planned twice."""
+        for entry in self.journal.open_transitions(agent="ReasoningEngine"):
+            if entry["to"] != "In_Progress" or "planned" not in entry["effects"]:
+                continue
+            with self.journal.transition(entry["task"], entry["from"], entry["to"], agent="ReasoningEngine"):
+                self._move_to_in_progress(NEEDS_ACTION / entry["task"])
+
     def run(self):
         self.logger.info("Starting Reasoning Engine Loop...")
         while True:
@@ -1,12 +1,11 @@
 # scripts/reasoning/vault_writer.py
-import os
-import datetime
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
+from ..dashboard import get_dashboard
 
 VAULT_PATH = Path("AI_Employee_Vault")
 PLANS = VAULT_PATH / "Plans"
-DASHBOARD = VAULT_PATH / "Dashboard.md"
 ACCOUNTING = VAULT_PATH / "Accounting"
 
 class VaultWriter:
@@ -37,15 +36,11 @@ type: plan
 ## Context
 """
         for item in plan.get('context', []):
-            content += f"- **{item.get('intent', 'event')}**: {item.get('content_preview', '')}
-"
+            content += f"- **{item.get('intent', 'event')}**: {item.get('content_preview', '')}\n"
 
-        content += "
-## Execution Steps
-"
+        content += "\n## Execution Steps\n"
         for i, step in enumerate(plan['steps'], 1):
-            content += f"{i}. **{step['action']}**: {step['details']} (Tool: `{step['tool']}`)
-"
+            content += f"{i}. **{step['action']}**: {step['details']} (Tool: `{step['tool']}`)\n"
             
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(content)
@@ -55,18 +50,9 @@ type: plan
     @staticmethod
     def update_dashboard(summary: str):
         """
-        Appends a status update to the Dashboard.
+        Adds a status update to the Dashboard (bounded and debounced, see scripts/dashboard.py).
         """
-        if not DASHBOARD.exists():
-            with open(DASHBOARD, "w", encoding="utf-8") as f:
-                f.write("# Executive Dashboard
-
-## Recent Updates
-")
-        
-        with open(DASHBOARD, "a", encoding="utf-8") as f:
-            f.write(f"- [{datetime.now().strftime('%H:%M')}] {summary}
-")
+        get_dashboard().add_update(summary)
 
     @staticmethod
     def log_accounting(entry: Dict[str, Any]):
@@ -78,10 +64,7 @@ type: plan
         
         if not ledger_file.exists():
             with open(ledger_file, "w", encoding="utf-8") as f:
-                f.write("| Time | Description | Amount | Category |
-|---|---|---|---|
-")
+                f.write("| Time | Description | Amount | Category |\n|---|---|---|---|\n")
         
         with open(ledger_file, "a", encoding="utf-8") as f:
-            f.write(f"| {datetime.now().strftime('%H:%M')} | {entry['description']} | {entry['amount']} | {entry['category']} |
-")
+            f.write(f"| {datetime.now().strftime('%H:%M')} | {entry['description']} | {entry['amount']} | {entry['category']} |\n")
@@ -0,0 +1,196 @@
+# scripts/retry_scheduler.py
+import time
+import heapq
+import random
+import logging
+import itertools
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+from scripts.error_manager import ErrorManager
+from scripts.utils.circuit_breaker import CircuitOpenError
+
+logger = logging.getLogger("RetryScheduler")
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter. `max_retries=0` means the error is never retried."""
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, factor: float = 2.0,
+                 max_delay: float = 300.0, jitter: float = 0.5):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def delay(self, attempt: int) -> float:
+        """Delay before retry number `attempt` (1-based), spread by +/- `jitter`."""
+        delay = min(self.max_delay, self.base_delay * self.factor ** (attempt - 1))
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return max(0.0, delay)
+
+
+# Network trouble is worth waiting out; bad data and programming errors are not
+DEFAULT_POLICIES = {
+    Exception: RetryPolicy(max_retries=3),
+    OSError: RetryPolicy(max_retries=5, base_delay=2.0),
+    ValueError: RetryPolicy(max_retries=0),
+    TypeError: RetryPolicy(max_retries=0),
+    KeyError: RetryPolicy(max_retries=0),
+}
+
+
+class RetryBudget:
+    """Caps how many retries one connector may schedule within a sliding window."""
+
+    def __init__(self, max_retries: int = 20, window: float = 300.0):
+        self.max_retries = max_retries
+        self.window = window
+        self.spent = deque()
+
+    def try_acquire(self, now: float) -> bool:
+        while self.spent and now - self.spent[0] >= self.window:
+            self.spent.popleft()
+        if len(self.spent) >= self.max_retries:
+            return False
+        self.spent.append(now)
+        return True
+
+    def remaining(self, now: float) -> int:
+        return self.max_retries - sum(1 for t in self.spent if now - t < self.window)
+
+
+class RetryItem:
+    def __init__(self, key: str, func: Callable, args: tuple, kwargs: dict, connector: str):
+        self.key = key
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.connector = connector
+        self.attempts = 0
+        self.last_error: Optional[Exception] = None
+
+
+class RetryScheduler:
+    """
+    Non-blocking retries: a failed call is re-enqueued with a due time instead of
+    sleeping in the caller. The owning loop calls `run_due()` on each pass and keeps
+    doing other work while retries wait.
+
+    Policies are looked up by exception class along its MRO, so the most specific
+    registered class wins. Banking-related keys are never retried. `is_fatal` errors
+    (e.g. auth failures) go straight to `on_fatal`; exhausted retries or an empty
+    connector budget go to `on_exhausted`.
+    """
+
+    def __init__(self, policies: Dict[type, RetryPolicy] = None, budgets: Dict[str, RetryBudget] = None,
+                 default_budget: Callable[[], RetryBudget] = RetryBudget,
+                 is_fatal: Callable[[Exception], bool] = None,
+                 on_fatal: Callable[[str, Exception], Any] = None,
+                 on_exhausted: Callable[[str, Exception, tuple, dict], Any] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.budgets = dict(budgets or {})
+        self.default_budget = default_budget
+        self.is_fatal = is_fatal or (lambda e: False)
+        self.on_fatal = on_fatal
+        self.on_exhausted = on_exhausted
+        self.clock = clock
+        self.queue = []
+        self.pending: Dict[str, RetryItem] = {}
+        self.counter = itertools.count()
+
+    def policy_for(self, error: Exception) -> RetryPolicy:
+        for cls in type(error).__mro__:
+            if cls in self.policies:
+                return self.policies[cls]
+        return RetryPolicy(max_retries=0)
+
+    def budget_for(self, connector: str) -> RetryBudget:
+        if connector not in self.budgets:
+            self.budgets[connector] = self.default_budget()
+        return self.budgets[connector]
+
+    def is_pending(self, key: str) -> bool:
+        return key in self.pending
+
+    def call(self, key: str, func: Callable, *args, connector: str = "default", **kwargs) -> Any:
+        """Runs `func` now; on failure schedules a retry and returns None."""
+        if key in self.pending:
+            logger.debug(f"{key} already has a retry queued; skipping")
+            return None
+        return self._attempt(RetryItem(key, func, args, kwargs, connector))
+
+    def run_due(self, max_items: int = None) -> int:
+        """Runs every retry whose due time has passed. Returns how many ran."""
+        ran = 0
+        while self.queue and self.queue[0][0] <= self.clock():
+            if max_items is not None and ran >= max_items:
+                break
+            _, _, item = heapq.heappop(self.queue)
+            self.pending.pop(item.key, None)
+            self._attempt(item)
+            ran += 1
+        return ran
+
+    def next_due(self) -> Optional[float]:
+        """Seconds until the next retry is due, or None if nothing is queued."""
+        if not self.queue:
+            return None
+        return max(0.0, self.queue[0][0] - self.clock())
+
+    def _attempt(self, item: RetryItem) -> Any:
+        try:
+            return item.func(*item.args, **item.kwargs)
+        except Exception as e:
+            item.attempts += 1
+            item.last_error = e
+            self._reschedule(item, e)
+            return None
+
+    def _reschedule(self, item: RetryItem, error: Exception):
+        if isinstance(error, CircuitOpenError):
+            # The connector is down; its owner will try again once the circuit lets calls through
+            logger.debug(f"{item.key} short-circuited: {error}")
+            return
+
+        if self.is_fatal(error):
+            logger.error(f"Fatal error in {item.key}, not retrying: {error}")
+            if self.on_fatal:
+                self.on_fatal(item.key, error)
+            return
+
+        if ErrorManager.is_banking_function(item.key):
+            logger.warning(f"Safety: Skipping auto-retry for banking-related task '{item.key}'")
+            self._exhausted(item, error)
+            return
+
+        policy = self.policy_for(error)
+        if item.attempts > policy.max_retries:
+            logger.error(f"{item.key} failed after {item.attempts} attempts: {error}")
+            self._exhausted(item, error)
+            return
+
+        now = self.clock()
+        if not self.budget_for(item.connector).try_acquire(now):
+            logger.error(f"Retry budget for '{item.connector}' spent; giving up on {item.key}: {error}")
+            self._exhausted(item, error)
+            return
+
+        delay = policy.delay(item.attempts)
+        heapq.heappush(self.queue, (now + delay, next(self.counter), item))
+        self.pending[item.key] = item
+        logger.warning(f"Attempt {item.attempts} failed for {item.key}: {error}. Retrying in {delay:.1f}s")
+
+    def _exhausted(self, item: RetryItem, error: Exception):
+        if self.on_exhausted:
+            self.on_exhausted(item.key, error, item.args, item.kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        now = self.clock()
+        return {
+            "queued": len(self.queue),
+            "next_due_s": self.next_due(),
+            "budgets": {name: budget.remaining(now) for name, budget in self.budgets.items()},
+        }
@@ -37,6 +37,7 @@ def add_to_processed_tasks(task_file):
         f.write(os.path.basename(task_file) + '\n')
 
 from .error_manager import ErrorManager
+from .task_journal import get_task_journal
 from pathlib import Path
 
 # ... (other imports)
@@ -47,7 +48,7 @@ def read_task_content(task_file_path):
             return f.read()
     except Exception as e:
         logger.error(f"Error reading task file {task_file_path}: {e}")
-        ErrorManager.quarantine_file(Path(task_file_path), f"Read Error: {e}")
+        ErrorManager.quarantine_file(Path(task_file_path), f"Read Error: {e}", stage="task_read", error=e)
         return None
 
 def create_plan_file(original_task_content, original_task_filename):
@@ -121,6 +122,7 @@ def run_planner_once():
         print("No new tasks found in Inbox.")
         return
 
+    journal = get_task_journal(VAULT_PATH)
     for task_file in inbox_files:
         task_filename = os.path.basename(task_file)
         if task_filename not in processed_tasks:
@@ -129,12 +131,19 @@ def run_planner_once():
             
             task_content = read_task_content(task_file)
             if task_content:
-                if create_plan_file(task_content, task_filename):
-                    add_to_processed_tasks(task_filename)
-                    # We move the original file to Done to prevent re-processing
-                    move_to_done(task_file) 
-                else:
-                    logger.error(f"Failed to create plan for {task_filename}")
+                # Journaled, so a crash before the move to Done does not create a second plan
+                with journal.transition(task_filename, "Inbox", "Done") as t:
+                    planned = t.done("plan")
+                    if not planned and create_plan_file(task_content, task_filename):
+                        t.effect("plan")
+                        planned = True
+                    if planned:
+                        add_to_processed_tasks(task_filename)
+                        # We move the original file to Done to prevent re-processing
+                        move_to_done(task_file) 
+                    else:
+                        logger.error(f"Failed to create plan for {task_filename}")
+                        t.cancel()
             else:
                 logger.error(f"Could not read content for {task_filename}, skipping.")
         
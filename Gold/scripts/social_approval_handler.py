@@ -4,8 +4,13 @@ import time
 import json
 import re
 import shutil
+import logging
 from pathlib import Path
 from .utils.audit_logger import audit_logger
+from .dashboard import get_dashboard
+from .utils.circuit_breaker import CircuitOpenError
+from .utils.tracing import read_trace_ids, record_wait, span, trace_context
+from .utils.metrics import histogram
 from mcp.social.scripts.meta_client import MetaClient
 from mcp.social.scripts.x_client import XClient
 
@@ -13,6 +18,8 @@ VAULT_PATH = Path("AI_Employee_Vault")
 APPROVED = VAULT_PATH / "Approved"
 DONE = VAULT_PATH / "Done"
 ACCOUNTING = VAULT_PATH / "Accounting"
+SOCIAL_ACTIONS = {"post_facebook", "post_instagram", "post_twitter"}
+SCAN_SECONDS = histogram("approval_scan_seconds", "Duration of one scan of the Approved folder", ["handler"])
 
 import yaml
 
@@ -22,6 +29,7 @@ class SocialApprovalHandler:
         self.x_client = XClient()
         self.audit = audit_logger
 
+    @SCAN_SECONDS.time(handler="social")
     def scan_approved(self):
         """Processes approved social media posts."""
         files = list(APPROVED.glob("APPROVAL_post_*.md"))
@@ -49,26 +57,40 @@ class SocialApprovalHandler:
             except json.JSONDecodeError:
                 continue
 
-            result = {}
-            if action == "post_facebook":
-                result = self.meta_client.post_to_facebook(details.get("content", ""))
-            elif action == "post_instagram":
-                result = self.meta_client.post_to_instagram(details.get("image_url", ""), details.get("content", ""))
-            elif action == "post_twitter":
-                result = self.x_client.post_tweet(details.get("content", ""))
+            # APPROVAL_post_invoice(s) files are Odoo's
+            if action not in SOCIAL_ACTIONS:
+                continue
+
+            trace_ids = read_trace_ids(content)
+            record_wait("approval_wait", file_path, trace_ids, action=action)
+            with trace_context(trace_ids):
+                result = {}
+                try:
+                    with span("execute", action=action):
+                        if action == "post_facebook":
+                            result = self.meta_client.post_to_facebook(details.get("content", ""))
+                        elif action == "post_instagram":
+                            result = self.meta_client.post_to_instagram(details.get("image_url", ""), details.get("content", ""))
+                        elif action == "post_twitter":
+                            result = self.x_client.post_tweet(details.get("content", ""))
+                except CircuitOpenError as e:
+                    # Platform is down; keep the approval for a later cycle
+                    print(f"Deferring {file_path.name}: {e}")
+                    continue
 
-            # Audit and Move to Done
-            self.audit.log(
-                action_type=action,
-                target=action.replace("post_", ""),
-                parameters=details,
-                result="success" if result.get("status") in ["success", "dry_run"] else "failure",
-                approval_status="approved",
-                approved_by="human"
-            )
+                # Audit and Move to Done
+                self.audit.log(
+                    action_type=action,
+                    target=action.replace("post_", ""),
+                    parameters=details,
+                    result="success" if result.get("status") in ["success", "dry_run"] else "failure",
+                    approval_status="approved",
+                    approved_by="human"
+                )
             
             shutil.move(file_path, DONE / file_path.name)
             print(f"Social post {action} completed for {file_path.name}")
+            get_dashboard().add_update(f"Social {action} completed ({file_path.name})")
 
     def run(self, interval=30):
         print("Social Approval Handler started.")
@@ -80,5 +102,6 @@ class SocialApprovalHandler:
             time.sleep(interval)
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     handler = SocialApprovalHandler()
     handler.run()
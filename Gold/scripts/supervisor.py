@@ -0,0 +1,334 @@
+# scripts/supervisor.py
+import os
+import json
+import time
+import random
+import logging
+import threading
+import subprocess
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .utils.lazy import lazy_module
+
+psutil = lazy_module("psutil")  # First used when a child is started
+
+VAULT_PATH = Path("AI_Employee_Vault")
+PROCESS_LOG_DIR = VAULT_PATH / "Logs" / "processes"
+TELEMETRY_FILE = VAULT_PATH / "Logs" / "process_telemetry.json"
+
+logger = logging.getLogger("ProcessSupervisor")
+
+
+def process_output_logger(name: str) -> logging.Logger:
+    """Rotating log that receives one child's stdout/stderr lines."""
+    out = logging.getLogger(f"process.{name}")
+    out.propagate = False
+    if not out.handlers:
+        PROCESS_LOG_DIR.mkdir(parents=True, exist_ok=True)
+        handler = RotatingFileHandler(
+            PROCESS_LOG_DIR / f"{name}.log",
+            maxBytes=int(os.getenv("PROCESS_LOG_MAX_BYTES", str(5 * 1024 * 1024))),
+            backupCount=int(os.getenv("PROCESS_LOG_BACKUPS", "3")),
+            encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        out.addHandler(handler)
+        out.setLevel(logging.INFO)
+    return out
+
+
+class ManagedProcess:
+    """One supervised child: its spec, the running Popen, telemetry and restart bookkeeping."""
+
+    def __init__(self, name: str, cmd: List[str], restart: bool = True, max_rss_mb: float = None,
+                 max_cpu_percent: float = None, env: Dict[str, str] = None):
+        self.name = name
+        self.cmd = cmd
+        self.restart = restart
+        self.max_rss_mb = max_rss_mb
+        self.max_cpu_percent = max_cpu_percent
+        self.env = env
+        self.proc: Optional[subprocess.Popen] = None
+        self.ps: Optional[psutil.Process] = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.failures = 0          # Consecutive short-lived runs, drives the backoff
+        self.next_start_at: Optional[float] = None
+        self.cpu_strikes = 0
+        self.last_exit: Optional[Dict[str, Any]] = None
+        self.sample: Dict[str, Any] = {}
+        self.stderr_tail = deque(maxlen=50)
+        self.drains: List[threading.Thread] = []
+        self.startup_ms: Optional[float] = None
+        self.output = process_output_logger(name)
+
+    @property
+    def running(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+
+class ProcessSupervisor:
+    """
+    Starts and watches child processes without ever letting their pipes fill up.
+
+    Each child's stdout/stderr is drained by a background thread into a rotating
+    log under `Logs/processes/<name>.log`. `poll()` reaps exits, samples CPU, RSS
+    and open FDs through psutil, restarts children that exit or stay over their
+    memory/CPU limits, and spaces restarts with exponential backoff so a crash loop
+    cannot spin. Runs longer than `stable_after` seconds reset the backoff.
+    """
+
+    def __init__(self, specs: Dict[str, Dict[str, Any]], backoff_base: float = 1.0, backoff_max: float = 300.0,
+                 stable_after: float = 60.0, cpu_strikes: int = 3,
+                 on_event: Callable[[str, str, Dict[str, Any]], Any] = None,
+                 spawn: Callable[..., Any] = None):
+        default_rss = os.getenv("SUPERVISOR_MAX_RSS_MB")
+        default_cpu = os.getenv("SUPERVISOR_MAX_CPU_PERCENT")
+        self.processes: Dict[str, ManagedProcess] = {}
+        for name, spec in specs.items():
+            if isinstance(spec, list):
+                spec = {"cmd": spec}
+            self.processes[name] = ManagedProcess(
+                name, spec["cmd"], restart=spec.get("restart", True),
+                max_rss_mb=spec.get("max_rss_mb", float(default_rss) if default_rss else None),
+                max_cpu_percent=spec.get("max_cpu_percent", float(default_cpu) if default_cpu else None),
+                env=spec.get("env")
+            )
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.stable_after = stable_after
+        self.cpu_strikes = cpu_strikes
+        self.on_event = on_event
+        self.spawn = spawn or subprocess.Popen
+        self.lock = threading.RLock()
+
+    # --- Lifecycle ---
+
+    def start_all(self):
+        for name in self.processes:
+            self.start(name)
+
+    def start(self, name: str) -> bool:
+        with self.lock:
+            mp = self.processes[name]
+            if mp.running:
+                return True
+            env = {**os.environ, **mp.env} if mp.env else None
+            try:
+                mp.proc = self.spawn(mp.cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                     start_new_session=True, env=env)
+            except Exception as e:
+                logger.error(f"Failed to start {name}: {e}")
+                self._schedule_restart(mp, reason=f"spawn failed: {e}")
+                self._emit("start_failed", name, {"error": str(e)})
+                return False
+
+            mp.started_at = time.time()
+            mp.next_start_at = None
+            mp.cpu_strikes = 0
+            # Forked workers report how long the zygote took to hand them control
+            mp.startup_ms = getattr(mp.proc, "startup_ms", None)
+            mp.stderr_tail.clear()
+            try:
+                mp.ps = psutil.Process(mp.proc.pid)
+                mp.ps.cpu_percent(None)  # Prime the counter; the first reading is always 0
+            except psutil.Error:
+                mp.ps = None
+            mp.drains = [
+                self._drain(mp, mp.proc.stdout, "stdout"),
+                self._drain(mp, mp.proc.stderr, "stderr"),
+            ]
+            logger.info(f"Started {name} (PID: {mp.proc.pid})")
+            mp.output.info(f"[supervisor] started pid {mp.proc.pid}: {' '.join(mp.cmd)}")
+            self._emit("started", name, {"pid": mp.proc.pid, "startup_ms": mp.startup_ms})
+            return True
+
+    def _drain(self, mp: ManagedProcess, stream, label: str) -> Optional[threading.Thread]:
+        if stream is None:
+            return None
+
+        def pump():
+            try:
+                for raw in iter(stream.readline, b""):
+                    line = raw.decode("utf-8", errors="replace").rstrip()
+                    mp.output.info(f"[{label}] {line}")
+                    if label == "stderr":
+                        mp.stderr_tail.append(line)
+            except (OSError, ValueError):
+                pass
+            finally:
+                stream.close()
+
+        thread = threading.Thread(target=pump, name=f"drain-{mp.name}-{label}", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self, name: str, timeout: float = 5.0):
+        mp = self.processes[name]
+        if not mp.running:
+            return
+        mp.proc.terminate()
+        try:
+            mp.proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Force killing {name} (PID: {mp.proc.pid})")
+            mp.proc.kill()
+            mp.proc.wait()
+        for thread in mp.drains:
+            if thread:
+                thread.join(timeout=1)
+
+    def stop_all(self, timeout: float = 5.0):
+        with self.lock:
+            for name, mp in self.processes.items():
+                mp.restart = False
+                if mp.running:
+                    logger.info(f"Terminating {name} (PID: {mp.proc.pid})")
+                    self.stop(name, timeout)
+            if hasattr(self.spawn, "close"):
+                self.spawn.close()
+
+    # --- Supervision ---
+
+    def poll(self) -> Dict[str, Dict[str, Any]]:
+        """One supervision pass: reap exits, enforce limits, start due restarts. Returns telemetry."""
+        with self.lock:
+            now = time.time()
+            for name, mp in self.processes.items():
+                if mp.proc is not None and mp.proc.poll() is not None:
+                    self._handle_exit(mp)
+                elif mp.running:
+                    self._sample(mp)
+                    breach = self._limit_breach(mp)
+                    if breach:
+                        logger.warning(f"{name} over limit ({breach}); restarting")
+                        mp.output.info(f"[supervisor] restarting: {breach}")
+                        self._emit("limit_exceeded", name, {"reason": breach, **mp.sample})
+                        self.stop(name)
+                        self._handle_exit(mp, reason=breach)
+
+                if mp.next_start_at is not None and now >= mp.next_start_at:
+                    mp.restarts += 1
+                    logger.info(f"Restarting {name} (restart #{mp.restarts})...")
+                    self.start(name)
+
+            telemetry = self.telemetry()
+        self._write_telemetry(telemetry)
+        return telemetry
+
+    def _handle_exit(self, mp: ManagedProcess, reason: str = None):
+        code = mp.proc.returncode
+        for thread in mp.drains:
+            if thread:
+                thread.join(timeout=1)  # Let the last lines reach the log
+        uptime = time.time() - mp.started_at
+        mp.last_exit = {
+            "code": code,
+            "reason": reason or "exited",
+            "uptime_s": round(uptime, 1),
+            "at": datetime.now().isoformat(),
+            "stderr_tail": list(mp.stderr_tail)[-10:],
+        }
+        mp.proc, mp.ps, mp.sample = None, None, {}
+        logger.warning(f"Process {mp.name} exited with code {code} after {uptime:.0f}s ({mp.last_exit['reason']})")
+        mp.output.info(f"[supervisor] exited with code {code} after {uptime:.0f}s")
+        self._emit("exited", mp.name, mp.last_exit)
+
+        if not mp.restart:
+            logger.info(f"Not restarting {mp.name} based on configuration.")
+            return
+        if uptime >= self.stable_after:
+            mp.failures = 0
+        self._schedule_restart(mp, reason=mp.last_exit["reason"])
+
+    def _schedule_restart(self, mp: ManagedProcess, reason: str):
+        delay = min(self.backoff_max, self.backoff_base * (2 ** mp.failures)) if mp.failures else 0.0
+        delay *= random.uniform(0.8, 1.2)
+        mp.failures += 1
+        mp.next_start_at = time.time() + delay
+        if delay:
+            logger.info(f"{mp.name} restart in {delay:.1f}s (failure streak {mp.failures}, {reason})")
+
+    def _sample(self, mp: ManagedProcess):
+        if mp.ps is None:
+            return
+        try:
+            with mp.ps.oneshot():
+                sample = {
+                    "cpu_percent": mp.ps.cpu_percent(None),
+                    "rss_mb": round(mp.ps.memory_info().rss / (1024 * 1024), 1),
+                    "threads": mp.ps.num_threads(),
+                }
+                if hasattr(mp.ps, "num_fds"):
+                    sample["fds"] = mp.ps.num_fds()
+                elif hasattr(mp.ps, "num_handles"):
+                    sample["handles"] = mp.ps.num_handles()
+        except psutil.Error:
+            return
+        mp.sample = sample
+
+    def _limit_breach(self, mp: ManagedProcess) -> Optional[str]:
+        sample = mp.sample
+        if not sample:
+            return None
+        if mp.max_rss_mb and sample["rss_mb"] > mp.max_rss_mb:
+            return f"rss {sample['rss_mb']}MB > {mp.max_rss_mb}MB"
+        if mp.max_cpu_percent:
+            # CPU must stay high for several samples; one busy tick is normal
+            mp.cpu_strikes = mp.cpu_strikes + 1 if sample["cpu_percent"] > mp.max_cpu_percent else 0
+            if mp.cpu_strikes >= self.cpu_strikes:
+                return f"cpu {sample['cpu_percent']}% > {mp.max_cpu_percent}% for {mp.cpu_strikes} samples"
+        return None
+
+    def next_due(self) -> Optional[float]:
+        """Seconds until the next scheduled restart, if any."""
+        pending = [mp.next_start_at for mp in self.processes.values() if mp.next_start_at is not None]
+        return max(0.0, min(pending) - time.time()) if pending else None
+
+    # --- Reporting ---
+
+    def telemetry(self) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        report = {}
+        for name, mp in self.processes.items():
+            if mp.running:
+                state = "running"
+            elif mp.next_start_at is not None:
+                state = "backoff"
+            else:
+                state = "stopped"
+            report[name] = {
+                "state": state,
+                "pid": mp.proc.pid if mp.running else None,
+                "uptime_s": round(now - mp.started_at, 1) if mp.running else 0,
+                "restarts": mp.restarts,
+                "startup_ms": mp.startup_ms,
+                "restart_in_s": round(max(0.0, mp.next_start_at - now), 1) if mp.next_start_at else None,
+                **mp.sample,
+                "last_exit": mp.last_exit,
+            }
+        return report
+
+    def _write_telemetry(self, telemetry: Dict[str, Dict[str, Any]]):
+        try:
+            TELEMETRY_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = TELEMETRY_FILE.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({
+                "updated": datetime.now().isoformat(),
+                "supervisor_pid": os.getpid(),
+                "processes": telemetry,
+            }, indent=2), encoding="utf-8")
+            tmp_path.replace(TELEMETRY_FILE)
+        except OSError as e:
+            logger.debug(f"Could not write process telemetry: {e}")
+
+    def _emit(self, event: str, name: str, info: Dict[str, Any]):
+        if self.on_event:
+            try:
+                self.on_event(event, name, info)
+            except Exception as e:
+                logger.error(f"Supervisor event handler failed for {event}/{name}: {e}")
@@ -0,0 +1,287 @@
+# scripts/task_journal.py
+"""
+Write-ahead journal of task lifecycle transitions.
+
+A task's stage is otherwise only implied by the folder its file sits in, so every
+restart rescans the whole vault and a crash halfway through a multi-step move
+(e.g. approvals written, plan not yet in Done) repeats the finished steps. Each
+transition is appended to `<vault>/.journal/journal.jsonl` *before* the files
+move, the steps it completes are recorded as effects, and a commit closes it.
+An in-memory index answers `where(task)` in O(1); a snapshot of that index is
+written every `SNAPSHOT_EVERY` records, so a restart loads the snapshot and
+replays only the journal tail.
+
+    with get_task_journal(VAULT_PATH).transition(name, "In_Progress", "Done", agent=AGENT_NAME) as t:
+        for i, action in enumerate(actions):
+            if not t.done(f"approval:{i}"):
+                create_approval_request(...)
+                t.effect(f"approval:{i}")
+        move_plan_to_done(...)
+
+An exception inside the block leaves the transition open with its effects, so
+the next attempt at the same move resumes it instead of starting over.
+
+    python -m scripts.task_journal where TASK_foo.md --vault vault
+    python -m scripts.task_journal pending --vault vault
+"""
+import os
+import json
+import uuid
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .utils.event_bus import publish
+
+JOURNAL_DIRNAME = ".journal"
+SNAPSHOT_EVERY = int(os.getenv("TASK_JOURNAL_SNAPSHOT_EVERY", "500"))
+JOURNAL_MAX_BYTES = int(os.getenv("TASK_JOURNAL_MAX_BYTES", str(16 * 1024 * 1024)))
+
+
+class Transition:
+    """An open move; handed out by `TaskJournal.transition()`."""
+
+    def __init__(self, journal: "TaskJournal", task: str, op: str, effects: List[str]):
+        self.journal = journal
+        self.task = task
+        self.op = op
+        self.effects = set(effects)
+        self.cancelled = False
+
+    def done(self, key: str) -> bool:
+        """True if a previous (crashed) attempt already completed this step."""
+        return key in self.effects
+
+    def effect(self, key: str):
+        self.journal._append({"type": "effect", "op": self.op, "task": self.task, "key": key})
+        self.effects.add(key)
+
+    def cancel(self):
+        """Gives up on the move (nothing was done that a retry would repeat); it is not committed."""
+        self.journal._append({"type": "abort", "op": self.op, "task": self.task})
+        self.cancelled = True
+
+
+class TaskJournal:
+    """
+    Append-only transition log plus a snapshot of where every task is.
+
+    Several processes may share one journal: records are single O_APPEND writes,
+    and each process tails the file before answering a query, so all of them see
+    the same order of transitions.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.journal_file = self.root / "journal.jsonl"
+        self.snapshot_file = self.root / "snapshot.json"
+        self.locations: Dict[str, Dict[str, Any]] = {}
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self.offset = 0
+        self.inode = None  # Journal file the offset refers to (it changes when the journal rotates)
+        self.since_snapshot = 0
+        self.lock = threading.RLock()
+        self._load_snapshot()
+        self.refresh()
+
+    # --- persistence -------------------------------------------------
+
+    def _load_snapshot(self):
+        if not self.snapshot_file.exists():
+            return
+        data = json.loads(self.snapshot_file.read_text(encoding="utf-8"))
+        self.locations = data["locations"]
+        self.pending = data["pending"]
+        self.offset = data["offset"]
+        self.inode = data.get("inode")
+
+    def snapshot(self):
+        """Writes the index covering everything journaled so far (and rotates a large journal)."""
+        with self.lock:
+            self.refresh()
+            if self.offset >= JOURNAL_MAX_BYTES:
+                self._rotate()
+            data = {
+                "locations": self.locations,
+                "pending": self.pending,
+                "offset": self.offset,
+                "inode": self.inode,
+                "written_at": datetime.now().isoformat(),
+            }
+            tmp_path = self.snapshot_file.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp_path, self.snapshot_file)
+            self.since_snapshot = 0
+
+    def _rotate(self):
+        # The snapshot about to be written covers the whole journal, so it can start over.
+        # Lines another process appended after our last read are carried into the new file.
+        rotated = self.journal_file.with_suffix(".jsonl.1")
+        os.replace(self.journal_file, rotated)
+        with open(rotated, "rb") as f:
+            f.seek(self.offset)
+            tail = f.read()
+        with open(self.journal_file, "ab") as f:
+            f.write(tail)
+        self.offset = 0
+        self.inode = self.journal_file.stat().st_ino
+        self.refresh()
+
+    def refresh(self):
+        """Applies records other processes appended since the last call."""
+        with self.lock:
+            try:
+                stat = self.journal_file.stat()
+            except FileNotFoundError:
+                return
+            if self.inode is None and self.offset == 0:
+                self.inode = stat.st_ino
+            if stat.st_ino != self.inode:
+                # Rotated by another process; the snapshot it writes right after covers the old file
+                self._load_snapshot()
+                if stat.st_ino != self.inode:
+                    if self.snapshot_file.exists() and self.snapshot_file.stat().st_mtime < stat.st_ctime - 1:
+                        # Journal recreated by hand after the last snapshot: start reading it from the top
+                        self.inode, self.offset = stat.st_ino, 0
+                    else:
+                        return  # Snapshot for the new file not written yet; catch up next time
+            with open(self.journal_file, "rb") as f:
+                f.seek(self.offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Partially written record; picked up next time
+                    self._apply(json.loads(line))
+                    self.offset += len(line)
+
+    def _append(self, record: Dict[str, Any]):
+        record.setdefault("ts", datetime.now().isoformat())
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with self.lock:
+            self.refresh()
+            entry = self.pending.get(record["task"])
+            fd = os.open(self.journal_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            self.refresh()
+            if record["type"] == "move":
+                publish("task", {"task": record["task"], "from": record["from"], "to": record["state"],
+                                 "agent": record.get("agent")})
+            elif record["type"] == "commit" and entry:
+                publish("task", {"task": record["task"], "from": entry["from"], "to": entry["to"],
+                                 "agent": record.get("agent")})
+            self.since_snapshot += 1
+            if self.since_snapshot >= SNAPSHOT_EVERY:
+                self.snapshot()
+
+    def _apply(self, record: Dict[str, Any]):
+        task = record["task"]
+        kind = record["type"]
+        if kind == "move":
+            self.locations[task] = {k: record.get(k) for k in ("state", "agent", "ts")}
+        elif kind == "begin":
+            self.pending[task] = {
+                "op": record["op"], "from": record["from"], "to": record["to"],
+                "agent": record.get("agent"), "ts": record["ts"], "effects": [],
+            }
+            self.locations.setdefault(task, {"state": record["from"], "agent": record.get("agent"), "ts": record["ts"]})
+        elif kind == "effect":
+            entry = self.pending.get(task)
+            if entry and entry["op"] == record["op"]:
+                entry["effects"].append(record["key"])
+        elif kind == "abort":
+            entry = self.pending.get(task)
+            if entry and entry["op"] == record["op"]:
+                del self.pending[task]
+        elif kind == "commit":
+            entry = self.pending.get(task)
+            if entry and entry["op"] == record["op"]:
+                del self.pending[task]
+                self.locations[task] = {"state": entry["to"], "agent": record.get("agent"), "ts": record["ts"]}
+
+    # --- API ---------------------------------------------------------
+
+    def record(self, task: str, src: str, dst: str, agent: str = None):
+        """A single-step move that has already happened."""
+        self._append({"type": "move", "task": task, "from": src, "state": dst, "agent": agent})
+
+    @contextmanager
+    def transition(self, task: str, src: str, dst: str, agent: str = None):
+        """
+        Journals the intent to move `task` from `src` to `dst`, yields a `Transition`
+        for recording completed steps, and commits on a clean exit. An open transition
+        for the same move is resumed, with the steps it already finished.
+        """
+        with self.lock:
+            self.refresh()
+            open_entry = self.pending.get(task)
+            if open_entry and open_entry["to"] == dst:
+                op, effects = open_entry["op"], list(open_entry["effects"])
+            else:
+                op, effects = uuid.uuid4().hex[:12], []
+                self._append({"type": "begin", "op": op, "task": task, "from": src, "to": dst, "agent": agent})
+        t = Transition(self, task, op, effects)
+        yield t
+        if not t.cancelled:
+            self._append({"type": "commit", "op": op, "task": task, "agent": agent})
+
+    def where(self, task: str) -> Optional[Dict[str, Any]]:
+        """Last known stage of `task` (plus any open transition), or None if never journaled."""
+        with self.lock:
+            self.refresh()
+            location = self.locations.get(task)
+            if location is None:
+                return None
+            return {**location, "pending": self.pending.get(task)}
+
+    def open_transitions(self, agent: str = None) -> List[Dict[str, Any]]:
+        """Transitions begun but not committed, i.e. interrupted by a crash or an error."""
+        with self.lock:
+            self.refresh()
+            return [
+                {"task": task, **entry} for task, entry in self.pending.items()
+                if agent is None or entry.get("agent") == agent
+            ]
+
+
+_journals: Dict[Path, TaskJournal] = {}
+_journals_lock = threading.Lock()
+
+
+def get_task_journal(vault_path) -> TaskJournal:
+    """Process-wide journal for a vault, opened on first use."""
+    root = (Path(vault_path) / JOURNAL_DIRNAME).resolve()
+    with _journals_lock:
+        if root not in _journals:
+            _journals[root] = TaskJournal(root)
+        return _journals[root]
+
+
+def main():
+    """CLI: where / pending / snapshot."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Task lifecycle journal")
+    parser.add_argument("--vault", default="AI_Employee_Vault", help="Vault whose journal to read")
+    sub = parser.add_subparsers(dest="command", required=True)
+    where_cmd = sub.add_parser("where")
+    where_cmd.add_argument("task")
+    sub.add_parser("pending")
+    sub.add_parser("snapshot")
+    args = parser.parse_args()
+
+    journal = get_task_journal(args.vault)
+    if args.command == "where":
+        print(json.dumps(journal.where(args.task), indent=2))
+    elif args.command == "pending":
+        print(json.dumps(journal.open_transitions(), indent=2))
+    elif args.command == "snapshot":
+        journal.snapshot()
+        print(f"Snapshot written: {journal.snapshot_file}")
+
+
+if __name__ == "__main__":
+    main()
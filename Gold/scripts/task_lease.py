@@ -0,0 +1,145 @@
+# scripts/task_lease.py
+import os
+import json
+import time
+import socket
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional
+
+LEASE_TTL = float(os.getenv("TASK_LEASE_TTL", "300"))
+LEASE_SUFFIX = ".lease"
+
+logger = logging.getLogger("TaskLease")
+
+
+class TaskLeaser:
+    """
+    Atomic task claims for agents sharing one vault.
+
+    A task is claimed by renaming it from Needs_Action into `In_Progress/<agent>/`:
+    the rename either succeeds for exactly one agent or fails with FileNotFoundError,
+    so there is no check-then-move window and no need to look into other agents'
+    folders. Each claim has a `<task>.lease` file next to it whose mtime is the
+    holder's last heartbeat; tasks whose lease has not been renewed within `ttl`
+    (a crashed or hung agent) are renamed back to Needs_Action by `reclaim()`.
+    """
+
+    def __init__(self, needs_action: Path, in_progress: Path, agent: str, ttl: float = LEASE_TTL):
+        self.needs_action = Path(needs_action)
+        self.in_progress = Path(in_progress)
+        self.agent = agent
+        self.ttl = ttl
+        self.agent_dir = self.in_progress / agent
+        self.agent_dir.mkdir(parents=True, exist_ok=True)
+        self.held: Dict[str, Path] = {}
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+
+    @staticmethod
+    def lease_path(task_path: Path) -> Path:
+        return task_path.with_name(task_path.name + LEASE_SUFFIX)
+
+    def claim(self, task_path: Path) -> Optional[Path]:
+        """Claims `task_path`; returns its new path, or None if another agent got it first."""
+        task_path = Path(task_path)
+        dest = self.agent_dir / task_path.name
+        lease = self.lease_path(dest)
+        if dest.exists():
+            return None  # Already ours; writing a lease here would clobber the live one
+        # Lease first, so a reclaimer never sees a claimed task without one
+        lease.write_text(json.dumps({
+            "agent": self.agent, "host": socket.gethostname(), "pid": os.getpid(),
+            "task": task_path.name, "claimed_at": datetime.now().isoformat(),
+        }), encoding="utf-8")
+        try:
+            os.rename(task_path, dest)
+        except (FileNotFoundError, FileExistsError):
+            lease.unlink(missing_ok=True)
+            return None
+        with self.lock:
+            self.held[dest.name] = dest
+        return dest
+
+    def renew(self, claimed_path: Path) -> bool:
+        """Heartbeat for one claim. False means the lease was lost (reclaimed or finished)."""
+        claimed_path = Path(claimed_path)
+        try:
+            os.utime(self.lease_path(claimed_path))
+        except FileNotFoundError:
+            with self.lock:
+                self.held.pop(claimed_path.name, None)
+            return False
+        return claimed_path.exists()
+
+    def heartbeat(self) -> int:
+        """Renews every held lease; returns how many are still held."""
+        with self.lock:
+            held = list(self.held.values())
+        return sum(self.renew(p) for p in held)
+
+    def release(self, claimed_path: Path):
+        """Drops the lease once the task has been moved on (Done, quarantine, ...)."""
+        claimed_path = Path(claimed_path)
+        self.lease_path(claimed_path).unlink(missing_ok=True)
+        with self.lock:
+            self.held.pop(claimed_path.name, None)
+
+    def start_heartbeat(self, interval: float = None) -> threading.Thread:
+        """Background renewal, so a long-running task keeps its lease."""
+        interval = interval or self.ttl / 3
+
+        def beat():
+            while not self._stop.wait(interval):
+                try:
+                    self.heartbeat()
+                except Exception as e:
+                    logger.warning(f"Lease heartbeat failed: {e}")
+
+        thread = threading.Thread(target=beat, name=f"lease-{self.agent}", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self._stop.set()
+
+    def reclaim(self) -> List[Path]:
+        """
+        Returns tasks with expired leases (from any agent) to Needs_Action.
+        Only looks at In_Progress, so the cost is proportional to claimed tasks.
+        """
+        now = time.time()
+        reclaimed = []
+        for lease in self.in_progress.glob(f"*/*{LEASE_SUFFIX}"):
+            try:
+                if now - lease.stat().st_mtime < self.ttl:
+                    continue
+            except FileNotFoundError:
+                continue  # Released meanwhile
+            task = lease.with_name(lease.name[:-len(LEASE_SUFFIX)])
+            target = self.needs_action / task.name
+            try:
+                os.rename(task, target)
+            except FileNotFoundError:
+                # Finished (or reclaimed by someone else) after the lease expired
+                pass
+            else:
+                logger.warning(f"Reclaimed {task.name} from {task.parent.name} (lease expired)")
+                reclaimed.append(target)
+            lease.unlink(missing_ok=True)
+
+        # Tasks left without a lease (claimed before leases existed, or a crash mid-claim)
+        for task in self.in_progress.glob("*/*.md"):
+            if self.lease_path(task).exists():
+                continue
+            try:
+                if now - task.stat().st_ctime < self.ttl:  # rename updates ctime
+                    continue
+                os.rename(task, self.needs_action / task.name)
+            except FileNotFoundError:
+                continue
+            logger.warning(f"Reclaimed {task.name} from {task.parent.name} (no lease)")
+            reclaimed.append(self.needs_action / task.name)
+        return reclaimed
@@ -4,9 +4,15 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from .event_bus import publish
+from .tracing import current_trace_ids
+from .metrics import histogram
+
 VAULT_PATH = Path("AI_Employee_Vault")
 LOGS_DIR = VAULT_PATH / "Logs"
 
+WRITE_SECONDS = histogram("audit_write_seconds", "Time to append one audit entry", ["logger"])
+
 class AuditLogger:
     """
     Enterprise-grade structured audit logger.
@@ -15,11 +21,11 @@ class AuditLogger:
     
     def __init__(self, agent_id: str = "AI_Employee_01"):
         self.agent_id = agent_id
-        LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
     def _get_log_file(self) -> Path:
         """Returns the path to today's log file."""
         today = datetime.now().strftime("%Y-%m-%d")
+        LOGS_DIR.mkdir(parents=True, exist_ok=True)  # On first write, not at import
         return LOGS_DIR / f"{today}_audit.jsonl"
 
     def log(
@@ -45,11 +51,15 @@ class AuditLogger:
             "approved_by": approved_by,
             "result": result
         }
+        trace_ids = current_trace_ids()
+        if trace_ids:
+            entry["trace_id"] = trace_ids[0] if len(trace_ids) == 1 else list(trace_ids)
         
         log_file = self._get_log_file()
         try:
-            with open(log_file, "a", encoding="utf-8") as f:
+            with WRITE_SECONDS.time(logger="audit"), open(log_file, "a", encoding="utf-8") as f:
                 f.write(json.dumps(entry) + "\n")
+            publish("audit", entry)
         except Exception as e:
             # Fallback to standard logging if file write fails
             import logging
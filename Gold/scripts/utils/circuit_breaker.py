@@ -0,0 +1,220 @@
+# scripts/utils/circuit_breaker.py
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+VAULT_PATH = Path("AI_Employee_Vault")
+STATE_DIR = VAULT_PATH / "Logs" / "circuit_breakers"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+logger = logging.getLogger("CircuitBreaker")
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a connector whose circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit '{name}' is open; next trial in {retry_in:.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after `failure_threshold` consecutive failures; open -> half-open
+    after `recovery_timeout` seconds, when up to `half_open_max_calls` trial calls are
+    let through. A successful trial closes the circuit, a failed one re-opens it.
+
+    Only exceptions in `trip_on` count as failures; anything else (e.g. an application
+    error returned by a healthy server) counts as the dependency being up.
+    Use as a context manager or via `call()`.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 60.0,
+                 half_open_max_calls: int = 1, trip_on: tuple = (Exception,),
+                 clock: Callable[[], float] = time.monotonic, persist: bool = True):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.trip_on = trip_on
+        self.clock = clock
+        self.persist = persist
+        self.lock = threading.Lock()
+        self._state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_calls = 0
+        self.short_circuited = 0
+        self.last_error: Optional[str] = None
+        self.changed_at = datetime.now().isoformat()
+
+    @property
+    def state(self) -> str:
+        with self.lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self.clock() - self.opened_at >= self.recovery_timeout:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def is_open(self) -> bool:
+        """True while calls would be short-circuited (does not consume a half-open trial)."""
+        with self.lock:
+            state = self._current_state()
+            return state == OPEN or (state == HALF_OPEN and self.trial_calls >= self.half_open_max_calls)
+
+    def allow_request(self) -> bool:
+        with self.lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self.trial_calls < self.half_open_max_calls:
+                self.trial_calls += 1
+                return True
+            self.short_circuited += 1
+            return False
+
+    def before_call(self):
+        if not self.allow_request():
+            raise CircuitOpenError(self.name, self.retry_in())
+
+    def retry_in(self) -> float:
+        return max(0.0, self.recovery_timeout - (self.clock() - self.opened_at))
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self, error: Exception = None):
+        with self.lock:
+            self.failures += 1
+            self.last_error = str(error) if error else None
+            if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+                self._transition(OPEN)
+
+    def _transition(self, state: str):
+        # Called with the lock held
+        previous, self._state = self._state, state
+        self.trial_calls = 0
+        self.changed_at = datetime.now().isoformat()
+        if state == CLOSED:
+            self.failures = 0
+        log = logger.warning if state == OPEN else logger.info
+        log(f"Circuit '{self.name}': {previous} -> {state}" + (f" ({self.last_error})" if state == OPEN else ""))
+        if self.persist:
+            self._write_state()
+
+    def __enter__(self):
+        self.before_call()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and issubclass(exc_type, self.trip_on):
+            self.record_failure(exc)
+        else:
+            self.record_success()
+        return False
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        with self:
+            return func(*args, **kwargs)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            state = self._current_state()
+            return {
+                "name": self.name,
+                "state": state,
+                "failures": self.failures,
+                "short_circuited": self.short_circuited,
+                "retry_in_s": round(self.retry_in(), 1) if state == OPEN else 0,
+                "last_error": self.last_error,
+                "changed_at": self.changed_at,
+                "pid": os.getpid(),
+            }
+
+    def _write_state(self):
+        """Publishes the state so other processes (the orchestrator health check) can see it."""
+        snapshot = {
+            "name": self.name,
+            "state": self._state,
+            "failures": self.failures,
+            "recovery_timeout": self.recovery_timeout,
+            "opened_at": datetime.fromtimestamp(time.time() - (self.clock() - self.opened_at)).isoformat()
+            if self._state != CLOSED else None,
+            "last_error": self.last_error,
+            "changed_at": self.changed_at,
+            "pid": os.getpid(),
+        }
+        try:
+            STATE_DIR.mkdir(parents=True, exist_ok=True)
+            path = STATE_DIR / f"{self.name}.json"
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(snapshot, indent=2), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.debug(f"Could not write circuit state for {self.name}: {e}")
+
+
+_registry: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def breaker_for(name: str, **kwargs) -> CircuitBreaker:
+    """
+    Returns the process-wide breaker for a connector, creating it on first use.
+    Thresholds default to CIRCUIT_FAILURE_THRESHOLD / CIRCUIT_RECOVERY_TIMEOUT.
+    Later calls may omit the settings; settings that differ from the existing breaker's
+    raise ValueError rather than being ignored, so callers sharing a breaker must agree
+    on e.g. `trip_on`.
+    """
+    with _registry_lock:
+        breaker = _registry.get(name)
+        if breaker is None:
+            kwargs.setdefault("failure_threshold", int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")))
+            kwargs.setdefault("recovery_timeout", float(os.getenv("CIRCUIT_RECOVERY_TIMEOUT", "60")))
+            breaker = _registry[name] = CircuitBreaker(name, **kwargs)
+            return breaker
+        conflicts = {k: v for k, v in kwargs.items() if getattr(breaker, k) != v}
+        if conflicts:
+            current = {k: getattr(breaker, k) for k in conflicts}
+            raise ValueError(f"Circuit breaker {name} already exists with {current}, not {conflicts}")
+        return breaker
+
+
+def breaker_states() -> Dict[str, Dict[str, Any]]:
+    """
+    Connector states across processes: the last transition each process published,
+    overridden by live breakers in this process.
+    """
+    states = {}
+    if STATE_DIR.exists():
+        for path in STATE_DIR.glob("*.json"):
+            try:
+                state = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            # An open circuit past its recovery timeout lets the next call through
+            if state.get("state") == OPEN and state.get("opened_at"):
+                elapsed = (datetime.now() - datetime.fromisoformat(state["opened_at"])).total_seconds()
+                if elapsed >= state.get("recovery_timeout", 0):
+                    state["state"] = HALF_OPEN
+            states[path.stem] = state
+    with _registry_lock:
+        breakers = list(_registry.values())
+    for breaker in breakers:
+        states[breaker.name] = breaker.snapshot()
+    return states
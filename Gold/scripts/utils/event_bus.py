@@ -0,0 +1,146 @@
+# scripts/utils/event_bus.py
+"""
+Lightweight pipeline event bus.
+
+`publish(topic, data)` can be called from any process. Inside the process that
+runs the bus (the orchestrator, which hosts the live dashboard) events fan out
+to subscribers directly; everywhere else they are sent as one UDP datagram to
+`127.0.0.1:EVENT_BUS_PORT`, which costs a single non-blocking syscall and is
+silently dropped when nobody is listening. Subscribers get a bounded queue; a
+subscriber that falls behind loses events rather than slowing publishers down.
+"""
+import os
+import json
+import time
+import queue
+import socket
+import logging
+import threading
+from collections import deque
+from itertools import count
+from typing import Any, Dict, Iterable, List, Optional
+
+EVENT_BUS_HOST = "127.0.0.1"
+EVENT_BUS_PORT = int(os.getenv("EVENT_BUS_PORT", "8766"))
+RECENT_EVENTS = 500
+SUBSCRIBER_QUEUE = 1000
+MAX_DATAGRAM = 60000
+
+logger = logging.getLogger("EventBus")
+
+
+class Subscription:
+    def __init__(self, bus: "EventBus", topics: Optional[Iterable[str]] = None):
+        self.bus = bus
+        self.topics = set(topics) if topics else None
+        self.queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=SUBSCRIBER_QUEUE)
+        self.dropped = 0
+
+    def wants(self, event: Dict[str, Any]) -> bool:
+        return self.topics is None or event["topic"] in self.topics
+
+    def get(self, timeout: float = None) -> Optional[Dict[str, Any]]:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    def __init__(self, recent: int = RECENT_EVENTS):
+        self.recent = deque(maxlen=recent)
+        self.subscribers: List[Subscription] = []
+        self.lock = threading.Lock()
+        self._ids = count(1)
+        self._sock: Optional[socket.socket] = None
+
+    def publish(self, topic: str, data: Dict[str, Any] = None, source: str = None) -> Dict[str, Any]:
+        with self.lock:
+            event = {"id": next(self._ids), "topic": topic, "ts": time.time(),
+                     "source": source or f"pid:{os.getpid()}", "data": data or {}}
+            self.recent.append(event)
+            subscribers = list(self.subscribers)
+        for sub in subscribers:
+            if sub.wants(event):
+                try:
+                    sub.queue.put_nowait(event)
+                except queue.Full:
+                    sub.dropped += 1
+        return event
+
+    def subscribe(self, topics: Optional[Iterable[str]] = None) -> Subscription:
+        sub = Subscription(self, topics)
+        with self.lock:
+            self.subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self.lock:
+            if sub in self.subscribers:
+                self.subscribers.remove(sub)
+
+    def since(self, last_id: int, topics: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Recent events after `last_id` (for an SSE client reconnecting with Last-Event-ID)."""
+        topics = set(topics) if topics else None
+        with self.lock:
+            return [e for e in self.recent if e["id"] > last_id and (topics is None or e["topic"] in topics)]
+
+    def listen(self, port: int = EVENT_BUS_PORT, host: str = EVENT_BUS_HOST) -> int:
+        """Receives events published by other processes; returns the bound port."""
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((host, port))
+
+        def receive():
+            while self._sock:
+                try:
+                    payload, _ = self._sock.recvfrom(MAX_DATAGRAM)
+                    message = json.loads(payload)
+                    self.publish(message["topic"], message.get("data"), message.get("source"))
+                except OSError:
+                    break  # Socket closed
+                except (ValueError, KeyError) as e:
+                    logger.debug(f"Ignoring malformed event: {e}")
+
+        threading.Thread(target=receive, name="event-bus", daemon=True).start()
+        return self._sock.getsockname()[1]
+
+    def close(self):
+        sock, self._sock = self._sock, None
+        if sock:
+            sock.close()
+
+
+_bus: Optional[EventBus] = None
+_bus_lock = threading.Lock()
+_sender: Optional[socket.socket] = None
+
+
+def get_event_bus() -> EventBus:
+    """The in-process bus; only the process hosting it (see `listen()`) receives remote events."""
+    global _bus
+    with _bus_lock:
+        if _bus is None:
+            _bus = EventBus()
+        return _bus
+
+
+def publish(topic: str, data: Dict[str, Any] = None):
+    """Publishes locally if this process hosts the bus, otherwise sends it to the host. Never raises."""
+    global _sender
+    try:
+        if _bus is not None and _bus._sock is not None:
+            _bus.publish(topic, data)
+            return
+        payload = json.dumps({"topic": topic, "data": data or {}, "source": f"pid:{os.getpid()}"},
+                             default=str).encode("utf-8")
+        if len(payload) > MAX_DATAGRAM:
+            return
+        if _sender is None:
+            _sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            _sender.setblocking(False)
+        _sender.sendto(payload, (EVENT_BUS_HOST, EVENT_BUS_PORT))
+    except Exception as e:
+        logger.debug(f"Event not published ({topic}): {e}")
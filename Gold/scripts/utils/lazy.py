@@ -0,0 +1,54 @@
+# scripts/utils/lazy.py
+"""
+Deferred imports for heavy optional libraries.
+
+`requests = lazy_module("requests")` binds a module object whose code only runs on
+first attribute access, so entry points that never touch the library (one-shot MCP
+CLIs that just write an approval file, `--help`) don't pay for importing it.
+"""
+import sys
+import importlib
+import importlib.util
+from types import ModuleType
+
+
+class _MissingModule(ModuleType):
+    """Stands in for a library that is not installed; fails where it is used, not at import."""
+
+    def __getattr__(self, attr):
+        if attr.startswith("__"):
+            raise AttributeError(attr)  # repr(), pickling and introspection probe dunders
+        raise ModuleNotFoundError(f"No module named '{self.__name__}'", name=self.__name__)
+
+
+def lazy_module(name: str) -> ModuleType:
+    """Returns `name` as a module that is executed on first attribute access."""
+    if name in sys.modules:
+        return sys.modules[name]
+    # Parents are imported for real; only the leaf is deferred
+    parent = name.rpartition(".")[0]
+    if parent:
+        importlib.import_module(parent)
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        return _MissingModule(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def lazy_attrs(package: str, attrs: dict):
+    """
+    PEP 562 `__getattr__` for a package `__init__`: `attrs` maps exported name to the
+    submodule defining it, imported on first access.
+    """
+    def __getattr__(name):
+        if name not in attrs:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(attrs[name], package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+    return __getattr__
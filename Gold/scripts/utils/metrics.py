@@ -0,0 +1,282 @@
+# scripts/utils/metrics.py
+"""
+Prometheus-style metrics: counters, gauges and histograms with labels.
+
+Metrics are declared at module level (`counter()`, `gauge()`, `histogram()` return
+the existing metric when the name is already registered) and updated in place.
+Each process snapshots its registry to `Logs/metrics/<pid>.json` at most every
+`METRICS_FLUSH_INTERVAL` seconds (and at exit). The process serving `/metrics`
+(the orchestrator's live dashboard) merges those files with its own live
+registry: counters and histograms are summed across processes, so restarted
+watchers keep counting, while gauges only count processes that are still
+writing.
+
+    python -m scripts.utils.metrics            # print the merged metrics
+"""
+import os
+import json
+import time
+import atexit
+import bisect
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+VAULT_PATH = Path("AI_Employee_Vault")
+METRICS_DIR = VAULT_PATH / "Logs" / "metrics"
+METRICS_FLUSH_INTERVAL = float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+logger = logging.getLogger("Metrics")
+
+
+class Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], Any] = {}
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            samples = [[list(key), value] for key, value in self.values.items()]
+        return {"type": self.type, "help": self.help, "labelnames": list(self.labelnames), "samples": samples}
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        _changed()
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+        _changed()
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        _changed()
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                # Per-bucket (not cumulative) counts plus a +Inf slot; cumulated when rendered
+                entry = self.values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            entry["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            entry["sum"] += value
+            entry["count"] += 1
+        _changed()
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = super().snapshot()
+        snapshot["buckets"] = list(self.buckets)
+        return snapshot
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        self.lock = threading.Lock()
+
+    def register(self, cls, name: str, help: str, labelnames: Sequence[str] = (), **kwargs) -> Metric:
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered as a different {metric.type}")
+            return metric
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return {m.name: m.snapshot() for m in metrics}
+
+
+REGISTRY = Registry()
+
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    return REGISTRY.register(Counter, name, help, labelnames)
+
+
+def gauge(name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return REGISTRY.register(Gauge, name, help, labelnames)
+
+
+def histogram(name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return REGISTRY.register(Histogram, name, help, labelnames, buckets=buckets)
+
+
+# --- multi-process collection ----------------------------------------
+
+_flush_lock = threading.Lock()
+_timer: Optional[threading.Timer] = None
+_atexit_registered = False
+_dirty = False
+
+
+def _changed():
+    """Schedules a snapshot of this process's registry (trailing, at most once per interval)."""
+    global _timer, _atexit_registered, _dirty
+    _dirty = True
+    if _timer is not None:
+        return
+    with _flush_lock:
+        if _timer is None:
+            _timer = threading.Timer(METRICS_FLUSH_INTERVAL, flush)
+            _timer.daemon = True
+            _timer.start()
+        if not _atexit_registered:
+            atexit.register(flush)
+            _atexit_registered = True
+
+
+def flush():
+    """Writes this process's metrics to Logs/metrics/<pid>.json, if they changed since the last write."""
+    global _timer, _dirty
+    with _flush_lock:
+        _timer = None
+        if not _dirty:
+            return
+        _dirty = False
+    snapshot = {"pid": os.getpid(), "updated": time.time(), "metrics": REGISTRY.snapshot()}
+    try:
+        METRICS_DIR.mkdir(parents=True, exist_ok=True)
+        path = METRICS_DIR / f"{os.getpid()}.json"
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(snapshot), encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError as e:
+        logger.debug(f"Could not write metrics: {e}")
+
+
+def clear_process_files():
+    """Drops snapshots left by earlier runs; the orchestrator calls this before starting its workers."""
+    if METRICS_DIR.exists():
+        for path in METRICS_DIR.glob("*.json"):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def collect() -> Dict[str, Dict[str, Any]]:
+    """Metrics of this process merged with every other process's latest snapshot."""
+    snapshots = [REGISTRY.snapshot()]
+    stale_before = time.time() - 3 * METRICS_FLUSH_INTERVAL
+    if METRICS_DIR.exists():
+        for path in METRICS_DIR.glob("*.json"):
+            if path.stem == str(os.getpid()):
+                continue  # Live values above are newer
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            live = data.get("updated", 0) >= stale_before
+            snapshots.append({name: m for name, m in data.get("metrics", {}).items()
+                              if live or m["type"] != "gauge"})
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "samples": {}})
+            if target["type"] != metric["type"]:
+                continue
+            for labels, value in metric["samples"]:
+                key = tuple(labels)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = json.loads(json.dumps(value)) if isinstance(value, dict) else value
+                elif isinstance(value, dict):
+                    if len(value["counts"]) == len(current["counts"]):
+                        current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+                        current["sum"] += value["sum"]
+                        current["count"] += value["count"]
+                else:
+                    target["samples"][key] = current + value
+    return merged
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple[str, str] = None) -> str:
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{n}="{v}"' for (n, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def render(metrics: Dict[str, Dict[str, Any]] = None) -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    metrics = collect() if metrics is None else metrics
+    lines: List[str] = []
+    for name in sorted(metrics):
+        metric = metrics[name]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        names = metric["labelnames"]
+        for key in sorted(metric["samples"]):
+            value = metric["samples"][key]
+            if metric["type"] == "histogram":
+                cumulative = 0
+                for bound, count in zip(list(metric["buckets"]) + [float("inf")], value["counts"]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(names, key, ('le', _format_value(bound)))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(names, key)} {_format_value(value['sum'])}")
+                lines.append(f"{name}_count{_format_labels(names, key)} {value['count']}")
+            else:
+                lines.append(f"{name}{_format_labels(names, key)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    print(render(), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+# scripts/utils/tracing.py
+"""
+Per-task latency tracing.
+
+A trace follows one task from the watcher that wrote it to the action that
+finishes it. `BaseWatcher.create_task_file` stamps a `trace_id` into the task's
+frontmatter, the planner copies it into the plan (`trace_ids`), approval files
+carry it on, and audit entries written while a trace is active record it too.
+Stages report spans (watch, classify, plan, approval_wait, execute, rpc) that are
+buffered in memory and appended to `Logs/traces.jsonl` in the background.
+
+Whether a trace is kept is derived from the trace id itself, so every process
+keeps or drops the same traces without coordinating: `TRACE_SAMPLE_RATE=0.1`
+keeps 10%, `0` turns tracing off. Untraced work costs one ContextVar lookup.
+
+    python -m scripts.utils.tracing slowest -n 10
+    python -m scripts.utils.tracing breakdown
+    python -m scripts.utils.tracing show <trace_id>
+"""
+import os
+import re
+import json
+import time
+import atexit
+import logging
+import secrets
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+VAULT_PATH = Path("AI_Employee_Vault")
+TRACE_FILE = VAULT_PATH / "Logs" / "traces.jsonl"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+TRACE_FLUSH_INTERVAL = float(os.getenv("TRACE_FLUSH_INTERVAL", "2"))
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(32 * 1024 * 1024)))
+TRACE_BUFFER = 200
+
+FRONTMATTER = re.compile(r"\A---\n(.*?)\n---", re.DOTALL)
+TRACE_FIELD = re.compile(r"^trace_ids?:(.*)$", re.MULTILINE)
+TRACE_ID = re.compile(r"\b[0-9a-f]{16}\b")
+
+logger = logging.getLogger("Tracing")
+
+_active: ContextVar[Tuple[str, ...]] = ContextVar("trace_ids", default=())
+_parent: ContextVar[Optional[str]] = ContextVar("trace_span", default=None)
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(8)
+
+
+def is_sampled(trace_id: str) -> bool:
+    if TRACE_SAMPLE_RATE <= 0 or not trace_id:
+        return False
+    try:
+        return int(trace_id[:8], 16) < TRACE_SAMPLE_RATE * 0x100000000
+    except ValueError:
+        return False
+
+
+def read_trace_ids(text: str) -> List[str]:
+    """Trace ids from a file's frontmatter (`trace_id: x` or `trace_ids: [x, y]`)."""
+    match = FRONTMATTER.match(text)
+    if not match:
+        return []
+    ids = []
+    for field in TRACE_FIELD.findall(match.group(1)):
+        ids.extend(t for t in TRACE_ID.findall(field) if t not in ids)
+    return ids
+
+
+def _sampled(trace_ids: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    if trace_ids is None:
+        return _active.get()
+    if isinstance(trace_ids, str):
+        trace_ids = (trace_ids,)
+    return tuple(t for t in trace_ids if is_sampled(t))
+
+
+class Tracer:
+    """Buffers finished spans and appends them to the trace file (one write per flush)."""
+
+    def __init__(self, path: Path = TRACE_FILE, max_bytes: int = TRACE_MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.buffer: List[str] = []
+        self.lock = threading.Lock()
+        self.timer: Optional[threading.Timer] = None
+
+    def record(self, name: str, trace_ids: Tuple[str, ...], start: float, end: float,
+               attrs: Dict[str, Any] = None, status: str = "ok", parent: str = None):
+        base = {"name": name, "start": round(start, 6), "end": round(end, 6), "ms": round((end - start) * 1000, 3),
+                "parent": parent, "status": status, "pid": os.getpid(), "attrs": attrs or {}}
+        lines = [json.dumps({"trace_id": t, **base}, default=str) for t in trace_ids]
+        with self.lock:
+            self.buffer.extend(lines)
+            full = len(self.buffer) >= TRACE_BUFFER
+            if not full and self.timer is None:
+                self.timer = threading.Timer(TRACE_FLUSH_INTERVAL, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            lines, self.buffer = self.buffer, []
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+        if not lines:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists() and self.path.stat().st_size > self.max_bytes:
+                os.replace(self.path, self.path.with_suffix(".jsonl.1"))
+            # O_APPEND keeps concurrent writers from interleaving within a flush
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, ("\n".join(lines) + "\n").encode("utf-8"))
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.debug(f"Dropped {len(lines)} spans: {e}")
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+            atexit.register(_tracer.flush)
+        return _tracer
+
+
+def current_trace_ids() -> Tuple[str, ...]:
+    return _active.get()
+
+
+@contextmanager
+def trace_context(trace_ids: Optional[Iterable[str]]) -> Iterator[Tuple[str, ...]]:
+    """Makes `trace_ids` the active traces, for spans and audit entries further down the call stack."""
+    token = _active.set(_sampled(trace_ids or ()))
+    try:
+        yield _active.get()
+    finally:
+        _active.reset(token)
+
+
+@contextmanager
+def span(name: str, trace_ids: Optional[Iterable[str]] = None, **attrs) -> Iterator[Dict[str, Any]]:
+    """
+    Times the block as a span of each sampled trace (the active ones if `trace_ids` is None).
+    Yields the span's attributes so the block can add to them.
+    """
+    ids = _sampled(trace_ids)
+    if not ids:
+        yield attrs
+        return
+    parent = _parent.get()
+    token = _parent.set(name)
+    start, status = time.time(), "ok"
+    try:
+        yield attrs
+    except BaseException as e:
+        status = "error"
+        attrs["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _parent.reset(token)
+        get_tracer().record(name, ids, start, time.time(), attrs, status, parent)
+
+
+def record_span(name: str, trace_ids: Optional[Iterable[str]], start: float, end: float = None, **attrs):
+    """Records a span whose timing is already known (e.g. how long a file sat in a queue)."""
+    ids = _sampled(trace_ids)
+    if ids:
+        get_tracer().record(name, ids, start, end or time.time(), attrs, parent=_parent.get())
+
+
+def record_wait(name: str, path: Path, trace_ids: Optional[Iterable[str]], **attrs):
+    """Span from when `path` was written (renames keep the mtime) until now."""
+    ids = _sampled(trace_ids)
+    if ids:
+        try:
+            written = os.stat(path).st_mtime
+        except OSError:
+            return
+        get_tracer().record(name, ids, written, time.time(), {"file": Path(path).name, **attrs}, parent=_parent.get())
+
+
+# --- analysis ---------------------------------------------------------
+
+def load_traces(path: Path = TRACE_FILE) -> Dict[str, List[Dict[str, Any]]]:
+    traces: Dict[str, List[Dict[str, Any]]] = {}
+    for file in (Path(path).with_suffix(".jsonl.1"), Path(path)):
+        if not file.exists():
+            continue
+        with open(file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    span_ = json.loads(line)
+                except ValueError:
+                    continue  # Torn line from a crashed writer
+                traces.setdefault(span_["trace_id"], []).append(span_)
+    for spans in traces.values():
+        spans.sort(key=lambda s: s["start"])
+    return traces
+
+
+def critical_path(spans: List[Dict[str, Any]]) -> List[Tuple[str, float]]:
+    """
+    Walks back from the end of the trace through the top-level span that finished
+    last at each point; time no span covers is reported as "(queued)".
+    Returns (stage, seconds) in chronological order.
+    """
+    top = [s for s in spans if not s.get("parent")] or spans
+    t = max(s["end"] for s in top)
+    path = []
+    while True:
+        candidates = [s for s in top if s["start"] < t]
+        if not candidates:
+            break
+        s = max(candidates, key=lambda c: (min(c["end"], t), -c["start"]))
+        end = min(s["end"], t)
+        if end < t:
+            path.append(("(queued)", t - end))
+        path.append((s["name"], end - s["start"]))
+        t = s["start"]
+    return path[::-1]
+
+
+def _pct(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def breakdown(traces: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Per stage: how much of the critical path it accounts for across traces."""
+    per_stage: Dict[str, List[float]] = {}
+    total = 0.0
+    for spans in traces.values():
+        per_trace: Dict[str, float] = {}
+        for stage, seconds in critical_path(spans):
+            per_trace[stage] = per_trace.get(stage, 0.0) + seconds
+            total += seconds
+        for stage, seconds in per_trace.items():
+            per_stage.setdefault(stage, []).append(seconds)
+    return {
+        stage: {
+            "traces": len(values),
+            "mean_ms": round(sum(values) / len(values) * 1000, 1),
+            "p50_ms": round(_pct(values, 0.5) * 1000, 1),
+            "p95_ms": round(_pct(values, 0.95) * 1000, 1),
+            "share": round(sum(values) / total, 3) if total else 0.0,
+        }
+        for stage, values in sorted(per_stage.items(), key=lambda kv: -sum(kv[1]))
+    }
+
+
+def slowest(traces: Dict[str, List[Dict[str, Any]]], n: int = 10) -> List[Dict[str, Any]]:
+    rows = []
+    for trace_id, spans in traces.items():
+        start, end = min(s["start"] for s in spans), max(s["end"] for s in spans)
+        rows.append({
+            "trace_id": trace_id,
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(start)),
+            "total_ms": round((end - start) * 1000, 1),
+            "critical_path": [(stage, round(seconds * 1000, 1)) for stage, seconds in critical_path(spans)],
+        })
+    return sorted(rows, key=lambda r: -r["total_ms"])[:n]
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Inspect pipeline traces.")
+    parser.add_argument("--file", default=str(TRACE_FILE))
+    parser.add_argument("--json", action="store_true")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("slowest", help="Slowest traces with their critical path")
+    p.add_argument("-n", type=int, default=10)
+    sub.add_parser("breakdown", help="Where critical-path time goes, per stage")
+    p = sub.add_parser("show", help="All spans of one trace")
+    p.add_argument("trace_id")
+    args = parser.parse_args()
+
+    traces = load_traces(Path(args.file))
+    if args.command == "slowest":
+        result = slowest(traces, args.n)
+        if not args.json:
+            for row in result:
+                path = " -> ".join(f"{stage} {ms:.0f}ms" for stage, ms in row["critical_path"])
+                print(f"{row['trace_id']}  {row['started']}  {row['total_ms']:>10.1f} ms  {path}")
+    elif args.command == "breakdown":
+        result = breakdown(traces)
+        if not args.json:
+            print(f"{len(traces)} traces")
+            print(f"{'stage':<16} {'traces':>7} {'mean ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'share':>7}")
+            for stage, row in result.items():
+                print(f"{stage:<16} {row['traces']:>7} {row['mean_ms']:>10.1f} {row['p50_ms']:>10.1f} "
+                      f"{row['p95_ms']:>10.1f} {row['share']:>7.1%}")
+    else:
+        result = traces.get(args.trace_id, [])
+        if not args.json:
+            if not result:
+                raise SystemExit(f"No spans for trace {args.trace_id}")
+            origin = result[0]["start"]
+            for s in result:
+                indent = "  " if s.get("parent") else ""
+                print(f"+{(s['start'] - origin) * 1000:>10.1f} ms {s['ms']:>10.1f} ms  {indent}{s['name']:<14} "
+                      f"{s['status']:<5} {json.dumps(s['attrs'], default=str)}")
+    if args.json:
+        print(json.dumps(result, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
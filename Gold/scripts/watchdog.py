@@ -1,37 +1,46 @@
 # scripts/watchdog.py
-import subprocess
 import time
 import os
 import signal
 import sys
-import psutil
 from .audit_logger import logger
-from datetime import datetime
+from .supervisor import ProcessSupervisor
+from .zygote import default_spawner
 
 class Watchdog:
     def __init__(self, check_interval=60):
         self.check_interval = check_interval
-        self.processes = {}
         self.process_info = {
             "orchestrator": {"cmd": ["python", "-m", "scripts.orchestrator"], "restart": True},
             "gmail_watcher": {"cmd": ["python", "-m", "scripts.gmail_watcher"], "restart": True},
             "whatsapp_watcher": {"cmd": ["python", "-m", "scripts.whatsapp_watcher"], "restart": True},
             "finance_watcher": {"cmd": ["python", "-m", "scripts.finance_watcher"], "restart": True},
             "odoo_approval": {"cmd": ["python", "-m", "scripts.odoo_approval_handler"], "restart": True},
-            "social_approval": {"cmd": ["python", "-m", "scripts.social_approval_handler"], "restart": True}
+            "social_approval": {"cmd": ["python", "-m", "scripts.social_approval_handler"], "restart": True},
+            "ledger_sync": {"cmd": ["python", "-m", "mcp.odoo.scripts.ledger_mirror"], "restart": True}
         }
+
+        # Children's output is drained into Logs/processes/<name>.log; limits come from
+        # SUPERVISOR_MAX_RSS_MB / SUPERVISOR_MAX_CPU_PERCENT unless set per process
+        self.supervisor = ProcessSupervisor(
+            self.process_info, on_event=self._on_event, spawn=default_spawner(self.process_info)
+        )
+        self.processes = self.supervisor.processes
     
     def start_process(self, name):
-        try:
-            cmd = self.process_info[name]["cmd"]
-            logger.info(f"Starting process: {name} (Command: {' '.join(cmd)})")
-            
-            # Use subprocess.Popen for non-blocking execution
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True)
-            self.processes[name] = proc
-            logger.info(f"Started {name} with PID: {proc.pid}")
-        except Exception as e:
-            logger.error(f"Failed to start process {name}: {e}")
+        cmd = self.process_info[name]["cmd"]
+        logger.info(f"Starting process: {name} (Command: {' '.join(cmd)})")
+        self.supervisor.start(name)
+
+    def _on_event(self, event, name, info):
+        if event == "exited":
+            logger.warning(f"Process {name} exited with code {info['code']} ({info['reason']})")
+            for line in info.get("stderr_tail", []):
+                logger.error(f"{name} stderr: {line}")
+        elif event == "limit_exceeded":
+            logger.warning(f"Process {name} exceeded its limits: {info['reason']}")
+        elif event == "start_failed":
+            logger.error(f"Failed to start process {name}: {info['error']}")
 
     def monitor(self):
         logger.info("Starting Watchdog Monitor...")
@@ -40,38 +49,14 @@ class Watchdog:
             self.start_process(name)
             
         while True:
-            for name, proc in list(self.processes.items()):
-                # Check if process is still running
-                if proc.poll() is not None:
-                    # Process has terminated
-                    exit_code = proc.returncode
-                    stdout, stderr = proc.communicate()
-                    
-                    logger.warning(f"Process {name} exited with code {exit_code}")
-                    if stdout: logger.info(f"{name} stdout: {stdout.decode()}")
-                    if stderr: logger.error(f"{name} stderr: {stderr.decode()}")
-                    
-                    del self.processes[name]
-                    
-                    if self.process_info[name]["restart"]:
-                        logger.info(f"Restarting {name}...")
-                        self.start_process(name)
-                    else:
-                        logger.info(f"Not restarting {name} based on configuration.")
-            
-            time.sleep(self.check_interval)
+            self.supervisor.poll()
+            # Wake early when a backed-off restart comes due
+            next_restart = self.supervisor.next_due()
+            time.sleep(self.check_interval if next_restart is None else min(self.check_interval, max(next_restart, 0.5)))
 
     def stop_all(self):
         logger.info("Stopping all managed processes...")
-        for name, proc in self.processes.items():
-            if proc.poll() is None:
-                logger.info(f"Terminating {name} (PID: {proc.pid})")
-                proc.terminate()
-                try:
-                    proc.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    logger.warning(f"Force killing {name} (PID: {proc.pid})")
-                    proc.kill()
+        self.supervisor.stop_all()
         sys.exit(0)
 
 if __name__ == "__main__":
@@ -1,7 +1,6 @@
 # scripts/whatsapp_watcher.py
 import time
 import logging
-from playwright.sync_api import sync_playwright
 from .base_watcher import BaseWatcher
 
 class WhatsAppWatcher(BaseWatcher):
@@ -13,6 +12,7 @@ class WhatsAppWatcher(BaseWatcher):
         self.processed_messages = set()
 
     def start_browser(self):
+        from playwright.sync_api import sync_playwright  # Heavy; only needed once a browser is launched
         self.playwright = sync_playwright().start()
         # Launch browser with user profile for session persistence
         self.browser = self.playwright.chromium.launch_persistent_context(
@@ -0,0 +1,374 @@
+# scripts/zygote.py
+"""
+Prefork worker launcher.
+
+`python -m scripts.zygote --preload scripts.gmail_watcher ...` imports the shared
+dependency set and the worker modules once, then forks a worker for every spawn
+request it reads on stdin (one JSON object per line). Forked workers share the
+warm parent's memory copy-on-write, so a restart skips the interpreter start and
+the dotenv/yaml/requests/playwright/googleapiclient imports.
+
+The supervisor side is `PreforkSpawner`, a drop-in for `subprocess.Popen` in
+`ProcessSupervisor`. POSIX only; elsewhere (or with PREFORK_WORKERS off) workers
+are started as plain subprocesses.
+"""
+import io
+import os
+import sys
+import json
+import time
+import signal
+import logging
+import atexit
+import argparse
+import importlib
+import threading
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+VAULT_PATH = Path("AI_Employee_Vault")
+PROCESS_LOG_DIR = VAULT_PATH / "Logs" / "processes"
+
+# Heavy third-party imports every worker pays for on a cold start
+COMMON_DEPS = [
+    "dotenv", "yaml", "requests", "schedule", "psutil",
+    "googleapiclient.discovery", "playwright.sync_api",
+]
+
+logger = logging.getLogger("Zygote")
+
+
+def prefork_enabled() -> bool:
+    return hasattr(os, "fork") and os.getenv("PREFORK_WORKERS", "false").lower() in ("1", "true", "yes")
+
+
+def module_from_cmd(cmd: List[str]) -> Optional[str]:
+    """`python -m pkg.mod` (any python executable) -> `pkg.mod`; None for anything else."""
+    if len(cmd) >= 3 and Path(cmd[0]).name.startswith("python") and cmd[1] == "-m":
+        return cmd[2]
+    return None
+
+
+# --- Zygote process ---
+
+class _LogStream(io.TextIOBase):
+    """sys.stdout/sys.stderr replacement in forked workers: lines go to the rotating process log."""
+
+    def __init__(self, out: logging.Logger, label: str):
+        self.out = out
+        self.label = label
+        self.buffer_ = ""
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self.buffer_ += text
+        while "\n" in self.buffer_:
+            line, self.buffer_ = self.buffer_.split("\n", 1)
+            self.out.info(f"[{self.label}] {line}")
+        return len(text)
+
+    def flush(self):
+        if self.buffer_:
+            self.out.info(f"[{self.label}] {self.buffer_}")
+            self.buffer_ = ""
+
+
+class Zygote:
+    def __init__(self, preload: List[str]):
+        self.preload = preload
+        self.exits: Dict[int, int] = {}
+        self.children: Dict[int, str] = {}
+
+    def warm(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        loaded, failed = [], {}
+        for name in COMMON_DEPS + self.preload:
+            try:
+                importlib.import_module(name)
+                loaded.append(name)
+            except Exception as e:
+                # Optional deps (e.g. playwright) may be missing; workers import what they need
+                failed[name] = f"{type(e).__name__}: {e}"
+        return {"op": "ready", "pid": os.getpid(), "preloaded": loaded, "failed": failed,
+                "preload_ms": round((time.perf_counter() - start) * 1000, 1)}
+
+    def serve(self, stdin, stdout):
+        self._send(stdout, self.warm())
+        for line in stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+                response = self.handle(request)
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+                request = request if isinstance(request, dict) else {}
+            response["id"] = request.get("id")
+            self._send(stdout, response)
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        self._reap()
+        op = request.get("op")
+        if op == "spawn":
+            return self.spawn(request)
+        if op == "poll":
+            pid = request["pid"]
+            return {"pid": pid, "returncode": self.exits.get(pid), "known": pid in self.children or pid in self.exits}
+        if op == "stats":
+            return {"children": {str(pid): name for pid, name in self.children.items()}, "exited": len(self.exits)}
+        if op == "ping":
+            return {"pong": True}
+        raise ValueError(f"Unknown op: {op}")
+
+    def spawn(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        requested_at = request.get("requested_at", time.time())
+        ready_r, ready_w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_r)
+            self._run_child(request, ready_w, requested_at)  # Never returns
+
+        os.close(ready_w)
+        with os.fdopen(ready_r, "rb") as ready:
+            payload = ready.read()
+        self.children[pid] = request["name"]
+        info = json.loads(payload) if payload else {}
+        return {"pid": pid, "startup_ms": info.get("startup_ms")}
+
+    def _run_child(self, request: Dict[str, Any], ready_w: int, requested_at: float):
+        code = 1
+        try:
+            os.setsid()
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            name, module = request["name"], request["module"]
+            if request.get("env"):
+                os.environ.clear()
+                os.environ.update(request["env"])
+
+            # Detach from the zygote's protocol pipes: C-level output goes to the raw log file,
+            # Python-level output through the rotating process log
+            from scripts.supervisor import process_output_logger
+            PROCESS_LOG_DIR.mkdir(parents=True, exist_ok=True)
+            devnull = os.open(os.devnull, os.O_RDONLY)
+            raw_log = os.open(PROCESS_LOG_DIR / f"{name}.log", os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.dup2(devnull, 0)
+            os.dup2(raw_log, 1)
+            os.dup2(raw_log, 2)
+            os.close(devnull)
+            os.close(raw_log)
+            out = process_output_logger(name)
+            sys.stdin = open(os.devnull)
+            sys.stdout = _LogStream(out, "stdout")
+            sys.stderr = _LogStream(out, "stderr")
+
+            # Preloaded modules may have configured root logging; let the worker set up its own
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+
+            sys.argv = [module] + list(request.get("argv", []))
+            startup_ms = round((time.time() - requested_at) * 1000, 1)
+            os.write(ready_w, json.dumps({"startup_ms": startup_ms}).encode("utf-8"))
+            os.close(ready_w)
+
+            # The preloaded copy only existed to warm its imports; run a fresh one as __main__
+            sys.modules.pop(module, None)
+            import runpy
+            runpy.run_module(module, run_name="__main__", alter_sys=True)
+            code = 0
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except BaseException:
+            import traceback
+            traceback.print_exc()
+            code = 1
+        finally:
+            # os._exit skips interpreter shutdown; run the worker's atexit hooks (metrics and
+            # dashboard flushes, logging.shutdown) the way a normal `python -m` exit would
+            try:
+                atexit._run_exitfuncs()
+            except Exception:
+                pass
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            except Exception:
+                pass
+            os._exit(code)
+
+    def _reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.children.pop(pid, None)
+            self.exits[pid] = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+
+    @staticmethod
+    def _send(stdout, message: Dict[str, Any]):
+        stdout.write(json.dumps(message) + "\n")
+        stdout.flush()
+
+
+# --- Supervisor side ---
+
+class ForkedProcess:
+    """The part of the `subprocess.Popen` API the supervisor uses, for a zygote-forked worker."""
+
+    def __init__(self, spawner: "PreforkSpawner", pid: int, cmd: List[str], startup_ms: Optional[float]):
+        self.spawner = spawner
+        self.pid = pid
+        self.args = cmd
+        self.startup_ms = startup_ms
+        self.returncode: Optional[int] = None
+        self.stdout = None
+        self.stderr = None
+
+    def poll(self) -> Optional[int]:
+        if self.returncode is None:
+            self.returncode = self.spawner.returncode(self.pid)
+        return self.returncode
+
+    def wait(self, timeout: float = None) -> int:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            time.sleep(0.05)
+        return self.returncode
+
+    def send_signal(self, sig):
+        if self.returncode is None:
+            try:
+                os.kill(self.pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
+class PreforkSpawner:
+    """
+    `subprocess.Popen`-compatible callable for `ProcessSupervisor(spawn=...)`.
+    `python -m <module>` commands are forked from a warm zygote (started on first use,
+    restarted if it dies); anything else falls back to a normal subprocess.
+    """
+
+    def __init__(self, preload: List[str] = None, names: Dict[tuple, str] = None):
+        self.preload = preload or []
+        # Command -> supervisor process name, so forked output lands in the same log as a subprocess's
+        self.names = names or {}
+        self.zygote: Optional[subprocess.Popen] = None
+        self.info: Dict[str, Any] = {}
+        self.lock = threading.Lock()
+        self.counter = 0
+
+    def __call__(self, cmd: List[str], **kwargs):
+        module = module_from_cmd(cmd)
+        if module is None:
+            return subprocess.Popen(cmd, **kwargs)
+        try:
+            response = self._request({
+                "op": "spawn", "name": self.names.get(tuple(cmd), module.rsplit(".", 1)[-1]), "module": module, "argv": cmd[3:],
+                "env": kwargs.get("env"), "requested_at": time.time(),
+            })
+        except Exception as e:
+            logger.warning(f"Zygote unavailable ({e}); starting {module} as a subprocess")
+            return subprocess.Popen(cmd, **kwargs)
+        logger.info(f"Forked {module} from zygote (PID: {response['pid']}, startup {response['startup_ms']}ms)")
+        return ForkedProcess(self, response["pid"], cmd, response.get("startup_ms"))
+
+    def returncode(self, pid: int) -> Optional[int]:
+        try:
+            response = self._request({"op": "poll", "pid": pid})
+            if response.get("known"):
+                return response.get("returncode")
+        except Exception:
+            pass
+        # The zygote that forked it is gone; fall back to asking the OS
+        try:
+            os.kill(pid, 0)
+            return None
+        except ProcessLookupError:
+            return -1
+        except PermissionError:
+            return None
+
+    def _ensure_zygote(self):
+        if self.zygote is not None and self.zygote.poll() is None:
+            return
+        PROCESS_LOG_DIR.mkdir(parents=True, exist_ok=True)
+        log = open(PROCESS_LOG_DIR / "zygote.log", "ab")
+        cmd = [sys.executable, "-m", "scripts.zygote"]
+        for module in self.preload:
+            cmd += ["--preload", module]
+        self.zygote = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=log, text=True)
+        log.close()
+        self.info = json.loads(self.zygote.stdout.readline() or "{}")
+        if self.info.get("op") != "ready":
+            raise RuntimeError("zygote did not start")
+        logger.info(f"Zygote ready (PID: {self.zygote.pid}, preload {self.info.get('preload_ms')}ms, "
+                    f"{len(self.info.get('preloaded', []))} modules)")
+
+    def _request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            self._ensure_zygote()
+            self.counter += 1
+            request["id"] = self.counter
+            self.zygote.stdin.write(json.dumps(request) + "\n")
+            self.zygote.stdin.flush()
+            line = self.zygote.stdout.readline()
+        if not line:
+            raise RuntimeError("zygote closed its pipe")
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    def close(self):
+        if self.zygote is not None and self.zygote.poll() is None:
+            self.zygote.stdin.close()
+            try:
+                self.zygote.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.zygote.kill()
+
+
+def default_spawner(specs: Dict[str, Any]):
+    """PreforkSpawner preloading every `python -m` worker in `specs` when PREFORK_WORKERS is on, else Popen."""
+    if not prefork_enabled():
+        return subprocess.Popen
+    modules, names = [], {}
+    for name, spec in specs.items():
+        cmd = spec["cmd"] if isinstance(spec, dict) else spec
+        module = module_from_cmd(cmd)
+        if module:
+            modules.append(module)
+            names[tuple(cmd)] = name
+    return PreforkSpawner(preload=modules, names=names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefork zygote (speaks JSON lines on stdin/stdout)")
+    parser.add_argument("--preload", action="append", default=[], help="Worker module to import up front")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+    # Keep the protocol pipe clean: anything printed while preloading goes to stderr
+    protocol = sys.stdout
+    sys.stdout = sys.stderr
+    Zygote(args.preload).serve(sys.stdin, protocol)
+
+
+if __name__ == "__main__":
+    main()
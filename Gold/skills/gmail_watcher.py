@@ -1,7 +1,3 @@
-from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
 import sys
 import os
 from dotenv import load_dotenv
@@ -49,6 +45,12 @@ class GmailWatcher(BaseWatcher):
         self.token_path = token_path
 
         try:
+            # The Google client stack is slow to import; only load it when a watcher is built
+            from google.oauth2.credentials import Credentials
+            from googleapiclient.discovery import build
+            from google_auth_oauthlib.flow import InstalledAppFlow
+            from google.auth.transport.requests import Request
+
             self.creds = None
 
             # Try to load saved user credentials (token.json)